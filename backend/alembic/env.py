@@ -10,6 +10,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from app.core.config import settings
 from app.db.base import Base
 import app.models.host  # noqa: F401, ensures Host model is registered
+import app.models.history  # noqa: F401
+import app.models.alerts  # noqa: F401
+import app.models.reports  # noqa: F401
+import app.models.checks  # noqa: F401
+import app.models.discovery  # noqa: F401
+import app.models.topology  # noqa: F401
 
 # point Alembic at our metadata and DB URL
 config = context.config
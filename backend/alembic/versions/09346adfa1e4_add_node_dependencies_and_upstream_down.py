@@ -0,0 +1,47 @@
+"""add node dependencies and upstream_down
+
+Revision ID: 09346adfa1e4
+Revises: b18d2e740669
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '09346adfa1e4'
+down_revision: Union[str, Sequence[str], None] = 'b18d2e740669'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('node_dependencies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('node_id', sa.Integer(), nullable=True),
+    sa.Column('cluster_id', sa.Integer(), nullable=True),
+    sa.Column('parent_node_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('(cluster_id IS NULL) != (node_id IS NULL)', name='ck_node_dependencies_scope'),
+    sa.ForeignKeyConstraint(['cluster_id'], ['clusters.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['parent_node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cluster_id', 'parent_node_id', name='uq_node_dependencies_cluster_id_parent_node_id'),
+    sa.UniqueConstraint('node_id', 'parent_node_id', name='uq_node_dependencies_node_id_parent_node_id')
+    )
+    op.create_index(op.f('ix_node_dependencies_id'), 'node_dependencies', ['id'], unique=False)
+    op.create_index('ix_node_dependencies_parent_node_id', 'node_dependencies', ['parent_node_id'], unique=False)
+    op.add_column('nodes', sa.Column('upstream_down', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('nodes', 'upstream_down')
+    op.drop_index('ix_node_dependencies_parent_node_id', table_name='node_dependencies')
+    op.drop_index(op.f('ix_node_dependencies_id'), table_name='node_dependencies')
+    op.drop_table('node_dependencies')
@@ -0,0 +1,80 @@
+"""add alert rules and alerts tables
+
+Revision ID: 49010a645ee1
+Revises: 683f5e23bcdd
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '49010a645ee1'
+down_revision: Union[str, Sequence[str], None] = '683f5e23bcdd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = "state != 'resolved'"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('alert_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('metric', sa.String(length=32), nullable=False),
+    sa.Column('cluster_id', sa.Integer(), nullable=True),
+    sa.Column('threshold', sa.Float(), nullable=False),
+    sa.Column('ratio', sa.Boolean(), nullable=False),
+    sa.Column('clear_threshold', sa.Float(), nullable=True),
+    sa.Column('for_seconds', sa.Float(), nullable=False),
+    sa.Column('clear_for_seconds', sa.Float(), nullable=False),
+    sa.Column('severity', sa.String(length=16), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cluster_id'], ['clusters.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_alert_rules_id'), 'alert_rules', ['id'], unique=False)
+    op.create_table('alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rule_id', sa.Integer(), nullable=False),
+    sa.Column('cluster_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.String(length=16), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('peak_value', sa.Float(), nullable=False),
+    sa.Column('pending_since', sa.DateTime(), nullable=False),
+    sa.Column('fired_at', sa.DateTime(), nullable=True),
+    sa.Column('clear_since', sa.DateTime(), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(), nullable=True),
+    sa.Column('flaps', sa.Integer(), nullable=False),
+    sa.Column('flapping', sa.Boolean(), nullable=False),
+    sa.Column('notified_state', sa.String(length=16), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cluster_id'], ['clusters.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['rule_id'], ['alert_rules.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_alerts_id'), 'alerts', ['id'], unique=False)
+    op.create_index('ix_alerts_rule_id_cluster_id', 'alerts', ['rule_id', 'cluster_id'], unique=False)
+    op.create_index('ix_alerts_cluster_id_id', 'alerts', ['cluster_id', 'id'], unique=False)
+    # At most one open alert per rule and cluster
+    op.create_index(
+        'uq_alerts_open_rule_id_cluster_id', 'alerts', ['rule_id', 'cluster_id'], unique=True,
+        postgresql_where=sa.text(OPEN),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_alerts_open_rule_id_cluster_id', table_name='alerts', postgresql_where=sa.text(OPEN))
+    op.drop_index('ix_alerts_cluster_id_id', table_name='alerts')
+    op.drop_index('ix_alerts_rule_id_cluster_id', table_name='alerts')
+    op.drop_index(op.f('ix_alerts_id'), table_name='alerts')
+    op.drop_table('alerts')
+    op.drop_index(op.f('ix_alert_rules_id'), table_name='alert_rules')
+    op.drop_table('alert_rules')
@@ -0,0 +1,30 @@
+"""add cluster probe_zone
+
+Revision ID: 5d2c8a7b41e3
+Revises: 09346adfa1e4
+Create Date: 2026-10-19 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8a7b41e3'
+down_revision: Union[str, Sequence[str], None] = '09346adfa1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('clusters', sa.Column('probe_zone', sa.String(), server_default='default', nullable=False))
+    op.create_index(op.f('ix_clusters_probe_zone'), 'clusters', ['probe_zone'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_clusters_probe_zone'), table_name='clusters')
+    op.drop_column('clusters', 'probe_zone')
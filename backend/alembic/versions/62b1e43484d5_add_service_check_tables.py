@@ -0,0 +1,70 @@
+"""add service check tables
+
+Revision ID: 62b1e43484d5
+Revises: 9aa6e76a312f
+Create Date: 2026-10-19 01:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62b1e43484d5'
+down_revision: Union[str, Sequence[str], None] = '9aa6e76a312f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('check_definitions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('cluster_id', sa.Integer(), nullable=True),
+    sa.Column('node_id', sa.Integer(), nullable=True),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('timeout', sa.Float(), nullable=False),
+    sa.Column('interval_seconds', sa.Float(), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('(cluster_id IS NULL) != (node_id IS NULL)', name='ck_check_definitions_scope'),
+    sa.ForeignKeyConstraint(['cluster_id'], ['clusters.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_check_definitions_id'), 'check_definitions', ['id'], unique=False)
+    op.create_index('ix_check_definitions_cluster_id', 'check_definitions', ['cluster_id'], unique=False)
+    op.create_index('ix_check_definitions_node_id', 'check_definitions', ['node_id'], unique=False)
+    op.create_table('check_results',
+    sa.Column('check_id', sa.Integer(), nullable=False),
+    sa.Column('node_id', sa.Integer(), nullable=False),
+    sa.Column('ok', sa.Boolean(), nullable=False),
+    sa.Column('latency_ms', sa.Float(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(length=32), nullable=True),
+    sa.Column('detail', sa.String(), nullable=True),
+    sa.Column('checked_at', sa.DateTime(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['check_id'], ['check_definitions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('check_id', 'node_id')
+    )
+    op.create_index('ix_check_results_node_id', 'check_results', ['node_id'], unique=False)
+    op.add_column('nodes', sa.Column('checks_passing', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('nodes', 'checks_passing')
+    op.drop_index('ix_check_results_node_id', table_name='check_results')
+    op.drop_table('check_results')
+    op.drop_index('ix_check_definitions_node_id', table_name='check_definitions')
+    op.drop_index('ix_check_definitions_cluster_id', table_name='check_definitions')
+    op.drop_index(op.f('ix_check_definitions_id'), table_name='check_definitions')
+    op.drop_table('check_definitions')
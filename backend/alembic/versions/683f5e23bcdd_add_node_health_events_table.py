@@ -0,0 +1,45 @@
+"""add node health events table
+
+Revision ID: 683f5e23bcdd
+Revises: 9f58a8605687
+Create Date: 2026-10-18 22:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '683f5e23bcdd'
+down_revision: Union[str, Sequence[str], None] = '9f58a8605687'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('node_health_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('node_id', sa.Integer(), nullable=False),
+    sa.Column('cluster_id', sa.Integer(), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('is_alive', sa.Boolean(), nullable=False),
+    sa.Column('ssh_reachable', sa.Boolean(), nullable=False),
+    sa.Column('was_alive', sa.Boolean(), nullable=True),
+    sa.Column('was_ssh_reachable', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_node_health_events_node_id_id', 'node_health_events', ['node_id', 'id'], unique=False)
+    op.create_index('ix_node_health_events_cluster_id_id', 'node_health_events', ['cluster_id', 'id'], unique=False)
+    op.create_index('ix_node_health_events_occurred_at', 'node_health_events', ['occurred_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_node_health_events_occurred_at', table_name='node_health_events')
+    op.drop_index('ix_node_health_events_cluster_id_id', table_name='node_health_events')
+    op.drop_index('ix_node_health_events_node_id_id', table_name='node_health_events')
+    op.drop_table('node_health_events')
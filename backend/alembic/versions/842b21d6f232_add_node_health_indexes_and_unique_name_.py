@@ -0,0 +1,46 @@
+"""add node health indexes and unique name per cluster
+
+Revision ID: 842b21d6f232
+Revises: f4e5ce25cee0
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '842b21d6f232'
+down_revision: Union[str, Sequence[str], None] = 'f4e5ce25cee0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNHEALTHY = "is_alive IS NOT true OR ssh_reachable IS NOT true OR passing_unit_tests IS NOT true"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_nodes_cluster_id_is_alive', 'nodes', ['cluster_id', 'is_alive'], unique=False)
+    op.create_index('ix_nodes_last_health_check', 'nodes', ['last_health_check'], unique=False)
+    # Partial index over unhealthy nodes only; stays small while the fleet is mostly healthy
+    op.create_index(
+        'ix_nodes_unhealthy', 'nodes', ['cluster_id', 'id'], unique=False,
+        postgresql_where=sa.text(UNHEALTHY),
+    )
+
+    # Keep the oldest node of any duplicated (cluster_id, name) and suffix the rest with their id
+    op.execute(
+        "UPDATE nodes SET name = name || '-' || id "
+        "WHERE id NOT IN (SELECT min(id) FROM nodes GROUP BY cluster_id, name)"
+    )
+    op.create_unique_constraint('uq_nodes_cluster_id_name', 'nodes', ['cluster_id', 'name'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_nodes_cluster_id_name', 'nodes', type_='unique')
+    op.drop_index('ix_nodes_unhealthy', table_name='nodes', postgresql_where=sa.text(UNHEALTHY))
+    op.drop_index('ix_nodes_last_health_check', table_name='nodes')
+    op.drop_index('ix_nodes_cluster_id_is_alive', table_name='nodes')
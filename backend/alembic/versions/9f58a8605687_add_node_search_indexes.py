@@ -0,0 +1,47 @@
+"""add node search indexes
+
+Revision ID: 9f58a8605687
+Revises: 842b21d6f232
+Create Date: 2026-10-18 22:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f58a8605687'
+down_revision: Union[str, Sequence[str], None] = '842b21d6f232'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PATTERN_COLUMNS = ('name', 'hostname', 'ip_address')
+TRIGRAM_COLUMNS = ('name', 'hostname', 'operating_system')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Prefix search: LIKE 'abc%' can only use a btree under non-C collations with text_pattern_ops
+    for column in PATTERN_COLUMNS:
+        op.create_index(
+            f'ix_nodes_{column}_pattern', 'nodes', [column], unique=False,
+            postgresql_ops={column: 'text_pattern_ops'},
+        )
+    # Substring search: ILIKE '%abc%'
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_nodes_{column}_trgm', 'nodes', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_nodes_{column}_trgm', table_name='nodes')
+    for column in PATTERN_COLUMNS:
+        op.drop_index(f'ix_nodes_{column}_pattern', table_name='nodes')
+    # pg_trgm is left installed; other databases on the server may use it
@@ -0,0 +1,44 @@
+"""add discovery targets table
+
+Revision ID: b18d2e740669
+Revises: 62b1e43484d5
+Create Date: 2026-10-19 02:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b18d2e740669'
+down_revision: Union[str, Sequence[str], None] = '62b1e43484d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('discovery_targets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cluster_id', sa.Integer(), nullable=False),
+    sa.Column('cidr', sa.String(length=64), nullable=False),
+    sa.Column('ports', sa.JSON(), nullable=False),
+    sa.Column('interval_seconds', sa.Float(), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_stats', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cluster_id'], ['clusters.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cluster_id', 'cidr', name='uq_discovery_targets_cluster_id_cidr')
+    )
+    op.create_index(op.f('ix_discovery_targets_id'), 'discovery_targets', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_discovery_targets_id'), table_name='discovery_targets')
+    op.drop_table('discovery_targets')
@@ -0,0 +1,58 @@
+"""add node health history tables
+
+Revision ID: f4e5ce25cee0
+Revises: 0fe7eefa304a
+Create Date: 2026-10-18 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4e5ce25cee0'
+down_revision: Union[str, Sequence[str], None] = '0fe7eefa304a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('node_health_samples',
+    sa.Column('node_id', sa.Integer(), nullable=False),
+    sa.Column('checked_at', sa.DateTime(), nullable=False),
+    sa.Column('up', sa.Boolean(), nullable=False),
+    sa.Column('latency_ms', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('node_id', 'checked_at')
+    )
+    op.create_index('ix_node_health_samples_checked_at', 'node_health_samples', ['checked_at'], unique=False)
+    op.create_table('node_health_rollups',
+    sa.Column('node_id', sa.Integer(), nullable=False),
+    sa.Column('resolution', sa.String(length=2), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('up_samples', sa.Integer(), nullable=False),
+    sa.Column('transitions', sa.Integer(), nullable=False),
+    sa.Column('latency_sum', sa.Float(), nullable=True),
+    sa.Column('latency_max', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('node_id', 'resolution', 'bucket')
+    )
+    op.create_index('ix_node_health_rollups_resolution_bucket', 'node_health_rollups', ['resolution', 'bucket'], unique=False)
+    op.create_table('health_rollup_watermarks',
+    sa.Column('resolution', sa.String(length=2), nullable=False),
+    sa.Column('rolled_until', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('resolution')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('health_rollup_watermarks')
+    op.drop_index('ix_node_health_rollups_resolution_bucket', table_name='node_health_rollups')
+    op.drop_table('node_health_rollups')
+    op.drop_index('ix_node_health_samples_checked_at', table_name='node_health_samples')
+    op.drop_table('node_health_samples')
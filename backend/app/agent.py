@@ -0,0 +1,129 @@
+# backend/app/agent.py
+"""
+Standalone probe agent: python -m app.agent [--zone ZONE]
+
+Run any number of these. Each heartbeats into its zone, builds the same
+consistent hash ring from the zone's live agents, probes the (cluster,
+slice) keys it owns among the clusters whose probe_zone is that zone every
+health_sweep_interval and writes the results back in batches. A cluster's
+nodes are probed only while its zone has a live agent.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.health import write_probe_results
+from app.services.sharding import AgentInfo, AgentRegistry, owned_targets
+from app.services.topology import probe_with_dependencies, write_upstream_state
+from app.tasks.topology import reprobe
+
+logger = logging.getLogger("app.agent")
+
+
+class ProbeAgent:
+    def __init__(self, zone: Optional[str] = None, agent_id: Optional[str] = None):
+        self.registry = AgentRegistry(zone)
+        host = socket.gethostname()
+        self.info = AgentInfo(
+            agent_id=agent_id or f"{host}-{os.getpid()}",
+            zone=self.registry.zone,
+            host=host,
+            started_at=time.time(),
+        )
+        self.stopping = threading.Event()
+
+    def _heartbeats(self) -> None:
+        """Heartbeat on its own thread so a long probe cycle never looks like a dead agent."""
+        while not self.stopping.is_set():
+            try:
+                self.registry.heartbeat(self.info)
+                self.registry.reap()
+            except Exception:
+                logger.exception("heartbeat failed")
+            self.stopping.wait(settings.probe_agent_heartbeat)
+
+    def cycle(self) -> dict:
+        """Probe every node this agent owns once, writing results a batch at a time."""
+        started = time.perf_counter()
+        ring = self.registry.ring()
+        if self.info.agent_id not in ring.members:
+            # Not visible to the others yet; probing now could double up with the current owners
+            return {"skipped": "not in ring"}
+
+        db = SessionLocal()
+        try:
+            targets = owned_targets(db, ring, self.info.agent_id, self.info.zone)
+            stats = {"agents": len(ring.members), "nodes": len(targets), "alive": 0, "blocked": 0, "transitions": 0}
+            for start in range(0, len(targets), settings.probe_report_batch):
+                if self.stopping.is_set():
+                    break
+                batch = targets[start:start + settings.probe_report_batch]
+                probe = probe_with_dependencies(
+                    db,
+                    [(node_id, address, port) for node_id, _, address, port in batch],
+                    concurrency=settings.probe_concurrency,
+                    timeout=settings.probe_timeout,
+                    deadline=settings.probe_deadline,
+                )
+                checked_at = datetime.utcnow()
+                written = write_probe_results(db, probe.results, checked_at=checked_at)
+                upstream = write_upstream_state(db, probe, checked_at)
+                reprobe(upstream.released)
+                stats["alive"] += sum(1 for _, result in probe.results if result.alive)
+                stats["blocked"] += upstream.blocked
+                stats["transitions"] += written.transitions
+        finally:
+            db.close()
+
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        self.info.nodes = stats["nodes"]
+        self.info.cycle_seconds = stats["seconds"]
+        return stats
+
+    def run(self) -> None:
+        heartbeats = threading.Thread(target=self._heartbeats, name="heartbeat", daemon=True)
+        heartbeats.start()
+        logger.info("probe agent %s joined zone %s", self.info.agent_id, self.info.zone)
+        # Let the first heartbeat land and peers notice us before claiming keys
+        self.stopping.wait(settings.probe_agent_heartbeat)
+        try:
+            while not self.stopping.is_set():
+                started = time.monotonic()
+                try:
+                    logger.info("probe cycle: %s", self.cycle())
+                except Exception:
+                    logger.exception("probe cycle failed")
+                self.stopping.wait(max(0.0, settings.health_sweep_interval - (time.monotonic() - started)))
+        finally:
+            self.stopping.set()
+            heartbeats.join(timeout=settings.probe_agent_heartbeat)
+            self.registry.leave(self.info.agent_id)
+            logger.info("probe agent %s left zone %s", self.info.agent_id, self.info.zone)
+
+    def stop(self, *_) -> None:
+        self.stopping.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe the nodes this agent owns on the hash ring")
+    parser.add_argument("--zone", default=None, help="defaults to PROBE_AGENT_ZONE")
+    parser.add_argument("--agent-id", default=None, help="defaults to <hostname>-<pid>")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    agent = ProbeAgent(zone=args.zone, agent_id=args.agent_id)
+    signal.signal(signal.SIGTERM, agent.stop)
+    signal.signal(signal.SIGINT, agent.stop)
+    agent.run()
+
+
+if __name__ == "__main__":
+    main()
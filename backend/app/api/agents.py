@@ -0,0 +1,17 @@
+# backend/app/api/agents.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+
+from app.schemas.agents import ProbeAgent
+from app.services.sharding import AgentRegistry
+
+router = APIRouter()
+
+
+@router.get("/probe-agents", response_model=List[ProbeAgent])
+async def list_probe_agents(zone: Optional[str] = Query(None, description="Defaults to PROBE_AGENT_ZONE")):
+    """Live probe agents in a zone and how many nodes each probed in its last cycle."""
+    agents = await run_in_threadpool(AgentRegistry(zone).agents)
+    return [agent.__dict__ for agent in sorted(agents, key=lambda agent: agent.agent_id)]
@@ -0,0 +1,99 @@
+# backend/app/api/alerts.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db, get_async_read_db
+from app.models.alerts import Alert as AlertModel, AlertRule as AlertRuleModel
+from app.models.host import Cluster as ClusterModel
+from app.schemas.alerts import Alert, AlertRule, AlertRuleCreate, AlertRuleUpdate
+
+router = APIRouter()
+
+ALERT_STATES = ("pending", "firing", "resolved")
+MAX_ALERT_PAGE = 1000
+
+
+def _check_thresholds(rule: AlertRuleModel) -> None:
+    if rule.ratio and not 0 <= rule.threshold < 1:
+        raise HTTPException(status_code=400, detail="A ratio threshold must be at least 0 and below 1")
+    if rule.clear_threshold is not None and rule.clear_threshold > rule.threshold:
+        raise HTTPException(status_code=400, detail="clear_threshold must not be above threshold")
+
+
+@router.get("/alert-rules", response_model=List[AlertRule])
+async def list_alert_rules(db: AsyncSession = Depends(get_async_read_db)):
+    """Every alert rule, ordered by id."""
+    return (await db.execute(select(AlertRuleModel).order_by(AlertRuleModel.id))).scalars().all()
+
+
+@router.post("/alert-rules", response_model=AlertRule, status_code=status.HTTP_201_CREATED)
+async def create_alert_rule(rule: AlertRuleCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create an alert rule; it is picked up by the next evaluation."""
+    if rule.cluster_id is not None and await db.get(ClusterModel, rule.cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    db_rule = AlertRuleModel(**rule.model_dump())
+    _check_thresholds(db_rule)
+    db.add(db_rule)
+    await db.commit()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.put("/alert-rules/{rule_id}", response_model=AlertRule)
+async def update_alert_rule(rule_id: int, rule_update: AlertRuleUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update an alert rule. Disabling it resolves its open alerts on the next evaluation."""
+    db_rule = await db.get(AlertRuleModel, rule_id)
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Alert rule not found")
+    for field, value in rule_update.model_dump(exclude_unset=True).items():
+        setattr(db_rule, field, value)
+    _check_thresholds(db_rule)
+    await db.commit()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.delete("/alert-rules/{rule_id}")
+async def delete_alert_rule(rule_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete an alert rule and its alerts."""
+    db_rule = await db.get(AlertRuleModel, rule_id)
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Alert rule not found")
+    await db.delete(db_rule)
+    await db.commit()
+    return {"message": "Alert rule deleted successfully"}
+
+
+@router.get("/alerts", response_model=List[Alert])
+async def list_alerts(
+    response: Response,
+    state: Optional[List[str]] = Query(None, description="pending, firing or resolved; defaults to open alerts"),
+    cluster_id: Optional[int] = Query(None),
+    rule_id: Optional[int] = Query(None),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: return alerts with id greater than this"),
+    limit: int = Query(100, ge=1, le=MAX_ALERT_PAGE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Alerts ordered by id. When a page is full the X-Next-After-Id header
+    carries the cursor for the next page.
+    """
+    states = state or ["pending", "firing"]
+    unknown = sorted(set(states) - set(ALERT_STATES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown alert states: {', '.join(unknown)}")
+
+    query = select(AlertModel).where(AlertModel.state.in_(states)).order_by(AlertModel.id).limit(limit)
+    if cluster_id is not None:
+        query = query.where(AlertModel.cluster_id == cluster_id)
+    if rule_id is not None:
+        query = query.where(AlertModel.rule_id == rule_id)
+    if after_id is not None:
+        query = query.where(AlertModel.id > after_id)
+    alerts = (await db.execute(query)).scalars().all()
+    if len(alerts) == limit:
+        response.headers["X-Next-After-Id"] = str(alerts[-1].id)
+    return alerts
@@ -0,0 +1,211 @@
+# backend/app/api/bulk.py
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Tuple, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache, node_namespaces
+from app.db.session import get_async_db
+from app.schemas.host import BulkResult, BulkRowError, NodeBulkDelete, NodeBulkUpdate, NodeCreate
+from app.services.alerts import cluster_counters
+from app.services.bulk import delete_nodes, existing_cluster_ids, update_nodes, upsert_nodes
+
+router = APIRouter()
+
+BATCH_SIZE = 1000
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """Yield decoded lines from the request body as chunks arrive."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+class _LineFeed:
+    """
+    Lines for a csv.reader, pushed as they stream in, so a quoted field that
+    spans several lines is joined into one record.
+    """
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+        self.quoted = False      # the queued lines end inside a quoted field
+
+    def push(self, line: str) -> bool:
+        """Queue a line; True once the queued lines hold a complete record."""
+        self.lines.append(line + "\n")
+        # Escaped quotes are doubled, so only an odd count opens or closes a field
+        if line.count('"') % 2:
+            self.quoted = not self.quoted
+        return not self.quoted
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_records(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Yield (row_number, record) pairs from a JSON array, NDJSON or CSV body.
+
+    NDJSON and CSV are parsed incrementally; a JSON array is read in one go.
+    Rows that cannot be decoded are yielded as exceptions so they can be
+    reported without aborting the import.
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/json-seq"):
+        row = 0
+        async for line in _iter_lines(request):
+            if not line.strip():
+                continue
+            try:
+                yield row, json.loads(line)
+            except ValueError as exc:
+                yield row, exc
+            row += 1
+
+    elif content_type == "text/csv":
+        feed = _LineFeed()
+        reader = csv.reader(feed)
+        header = None
+        row = 0
+        async for line in _iter_lines(request):
+            if not feed.quoted and not line.strip():
+                continue
+            if not feed.push(line):
+                continue
+            values = next(reader)
+            if header is None:
+                header = values
+                continue
+            if len(values) != len(header):
+                yield row, ValueError(f"expected {len(header)} columns, got {len(values)}")
+            else:
+                yield row, {key: value for key, value in zip(header, values) if value != ""}
+            row += 1
+        if feed.quoted:
+            yield row, ValueError("unterminated quoted field")
+
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of records")
+        for row, record in enumerate(body):
+            yield row, record
+
+
+async def _iter_batches(
+    request: Request, schema: Type[BaseModel], result: BulkResult
+) -> AsyncIterator[List[Tuple[int, BaseModel]]]:
+    """Validate records against schema and group them into batches; errors go into result."""
+    batch: List[Tuple[int, BaseModel]] = []
+    async for row, record in _iter_records(request):
+        if isinstance(record, Exception):
+            result.errors.append(BulkRowError(row=row, error=str(record)))
+            continue
+        try:
+            batch.append((row, schema.model_validate(record)))
+        except ValidationError as exc:
+            result.errors.append(BulkRowError(row=row, error=_format_validation_error(exc)))
+            continue
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+async def _fail_batch(
+    db: AsyncSession, result: BulkResult, batch: List[Tuple[int, BaseModel]], exc: Exception
+):
+    await db.rollback()
+    message = f"batch write failed: {exc.__class__.__name__}"
+    result.errors.extend(BulkRowError(row=row, error=message) for row, _ in batch)
+
+
+@router.post("/nodes/bulk", response_model=BulkResult)
+async def bulk_upsert_nodes(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create or update many nodes keyed on (cluster_id, name).
+
+    Accepts a JSON array, NDJSON (application/x-ndjson) or CSV (text/csv) of
+    NodeCreate records. Bad rows are reported individually and skipped.
+    """
+    result = BulkResult()
+    async for batch in _iter_batches(request, NodeCreate, result):
+        known = await db.run_sync(existing_cluster_ids, {record.cluster_id for _, record in batch})
+        valid = []
+        for row, record in batch:
+            if record.cluster_id in known:
+                valid.append((row, record))
+            else:
+                result.errors.append(BulkRowError(row=row, error="Cluster not found"))
+        if not valid:
+            continue
+        try:
+            created, updated = await db.run_sync(upsert_nodes, [record for _, record in valid])
+        except Exception as exc:
+            await _fail_batch(db, result, valid, exc)
+            continue
+        result.created += created
+        result.updated += updated
+    if result.updated:
+        await cache.ainvalidate("clusters", "nodes")
+    elif result.created:
+        await cache.ainvalidate("clusters")
+    if result.created:
+        await cluster_counters.amark_dirty()
+    return result
+
+
+@router.patch("/nodes/bulk", response_model=BulkResult)
+async def bulk_update_nodes(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Apply partial updates to many nodes; each record carries the node id."""
+    result = BulkResult()
+    async for batch in _iter_batches(request, NodeBulkUpdate, result):
+        try:
+            updated, missing = await db.run_sync(update_nodes, [record for _, record in batch])
+        except Exception as exc:
+            await _fail_batch(db, result, batch, exc)
+            continue
+        result.updated += updated
+        rows_by_id: Dict[int, int] = {record.id: row for row, record in batch}
+        result.errors.extend(BulkRowError(row=rows_by_id[node_id], error="Node not found") for node_id in missing)
+        await cache.ainvalidate("clusters", *node_namespaces(rows_by_id))
+    return result
+
+
+@router.delete("/nodes/bulk", response_model=BulkResult)
+async def bulk_delete_nodes(payload: NodeBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Delete many nodes by id in one statement."""
+    deleted = 0
+    for start in range(0, len(payload.ids), BATCH_SIZE):
+        deleted += await db.run_sync(delete_nodes, payload.ids[start:start + BATCH_SIZE])
+    await cache.ainvalidate("clusters", *node_namespaces(set(payload.ids)))
+    if deleted:
+        await cluster_counters.amark_dirty()
+    return BulkResult(deleted=deleted)
@@ -0,0 +1,160 @@
+# backend/app/api/checks.py
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache
+from app.db.session import get_async_db, get_async_read_db
+from app.models.checks import CheckDefinition as CheckDefinitionModel, CheckResult as CheckResultModel
+from app.models.host import Cluster as ClusterModel, Node as NodeModel
+from app.schemas.checks import CheckDefinition, CheckDefinitionCreate, CheckDefinitionUpdate, CheckResult
+from app.services.checks import checks_passing_deltas, checks_passing_update, validate_check
+from app.services.events import publish_node_deltas
+
+router = APIRouter()
+
+MAX_RESULT_PAGE = 1000
+
+_RESULT_COLUMNS = (
+    CheckResultModel.check_id, CheckResultModel.node_id, CheckDefinitionModel.name, CheckDefinitionModel.kind,
+    CheckResultModel.ok, CheckResultModel.latency_ms, CheckResultModel.status_code, CheckResultModel.error,
+    CheckResultModel.detail, CheckResultModel.checked_at, CheckResultModel.changed_at,
+)
+
+
+def _validate(definition: CheckDefinitionModel) -> None:
+    if definition.timeout <= 0 or definition.interval_seconds <= 0:
+        raise HTTPException(status_code=400, detail="timeout and interval_seconds must be positive")
+    try:
+        definition.params = validate_check(definition.kind, definition.params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _refresh_checks_passing(db: AsyncSession, check_id: int) -> None:
+    """Recompute checks_passing for the nodes a check has results for, after it was disabled or deleted."""
+    node_ids = (await db.execute(select(CheckResultModel.node_id).where(CheckResultModel.check_id == check_id))).scalars().all()
+    if not node_ids:
+        return
+    flipped = (await db.execute(checks_passing_update(node_ids))).all()
+    await db.commit()
+    if flipped:
+        await cache.ainvalidate("nodes")
+        await run_in_threadpool(publish_node_deltas, checks_passing_deltas(flipped, datetime.utcnow()))
+
+
+@router.get("/checks", response_model=List[CheckDefinition])
+async def list_checks(
+    cluster_id: Optional[int] = Query(None),
+    node_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Check definitions ordered by id, optionally for one cluster or node."""
+    query = select(CheckDefinitionModel).order_by(CheckDefinitionModel.id)
+    if cluster_id is not None:
+        query = query.where(CheckDefinitionModel.cluster_id == cluster_id)
+    if node_id is not None:
+        query = query.where(CheckDefinitionModel.node_id == node_id)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.post("/checks", response_model=CheckDefinition, status_code=status.HTTP_201_CREATED)
+async def create_check(check: CheckDefinitionCreate, db: AsyncSession = Depends(get_async_db)):
+    """Define a check for every node of a cluster or for one node; it runs on the next tick."""
+    if (check.cluster_id is None) == (check.node_id is None):
+        raise HTTPException(status_code=400, detail="Set exactly one of cluster_id and node_id")
+    if check.cluster_id is not None and await db.get(ClusterModel, check.cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    if check.node_id is not None and await db.get(NodeModel, check.node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    db_check = CheckDefinitionModel(**check.model_dump())
+    _validate(db_check)
+    db.add(db_check)
+    await db.commit()
+    await db.refresh(db_check)
+    return db_check
+
+
+@router.put("/checks/{check_id}", response_model=CheckDefinition)
+async def update_check(check_id: int, check_update: CheckDefinitionUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a check. Changed params or timings apply from its next run."""
+    db_check = await db.get(CheckDefinitionModel, check_id)
+    if not db_check:
+        raise HTTPException(status_code=404, detail="Check not found")
+    was_enabled = db_check.enabled
+    for field, value in check_update.model_dump(exclude_unset=True).items():
+        setattr(db_check, field, value)
+    _validate(db_check)
+    await db.commit()
+    await db.refresh(db_check)
+    if db_check.enabled != was_enabled:
+        await _refresh_checks_passing(db, check_id)
+        await db.refresh(db_check)
+    return db_check
+
+
+@router.delete("/checks/{check_id}")
+async def delete_check(check_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a check and its results."""
+    db_check = await db.get(CheckDefinitionModel, check_id)
+    if not db_check:
+        raise HTTPException(status_code=404, detail="Check not found")
+    # Disable first so the recount no longer counts its results, then drop it
+    db_check.enabled = False
+    await db.commit()
+    await _refresh_checks_passing(db, check_id)
+    await db.delete(db_check)
+    await db.commit()
+    return {"message": "Check deleted successfully"}
+
+
+@router.get("/checks/{check_id}/results", response_model=List[CheckResult])
+async def list_check_results(
+    check_id: int,
+    response: Response,
+    ok: Optional[bool] = Query(None, description="false lists only failing nodes"),
+    after_node_id: Optional[int] = Query(None, description="Keyset cursor: X-Next-After-Id from the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_RESULT_PAGE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    A check's latest result on every node it covers, ordered by node id.
+    When a page is full the X-Next-After-Id header carries the cursor.
+    """
+    if await db.get(CheckDefinitionModel, check_id) is None:
+        raise HTTPException(status_code=404, detail="Check not found")
+    query = (
+        select(*_RESULT_COLUMNS)
+        .join(CheckDefinitionModel, CheckDefinitionModel.id == CheckResultModel.check_id)
+        .where(CheckResultModel.check_id == check_id)
+        .order_by(CheckResultModel.node_id)
+        .limit(limit)
+    )
+    if ok is not None:
+        query = query.where(CheckResultModel.ok.is_(ok))
+    if after_node_id is not None:
+        query = query.where(CheckResultModel.node_id > after_node_id)
+    rows = (await db.execute(query)).all()
+    if len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1].node_id)
+    return [row._mapping for row in rows]
+
+
+@router.get("/nodes/{node_id}/checks", response_model=List[CheckResult])
+async def list_node_check_results(node_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """The latest result of every check on a node."""
+    if await db.get(NodeModel, node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    rows = (
+        await db.execute(
+            select(*_RESULT_COLUMNS)
+            .join(CheckDefinitionModel, CheckDefinitionModel.id == CheckResultModel.check_id)
+            .where(CheckResultModel.node_id == node_id)
+            .order_by(CheckResultModel.check_id)
+        )
+    ).all()
+    return [row._mapping for row in rows]
@@ -0,0 +1,90 @@
+# backend/app/api/discovery.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db, get_async_read_db
+from app.models.discovery import DiscoveryTarget as DiscoveryTargetModel
+from app.models.host import Cluster as ClusterModel
+from app.schemas.discovery import DiscoveryTarget, DiscoveryTargetCreate, DiscoveryTargetUpdate
+from app.services.discovery import validate_target
+
+router = APIRouter()
+
+
+def _validate(target: DiscoveryTargetModel) -> None:
+    if target.interval_seconds <= 0:
+        raise HTTPException(status_code=400, detail="interval_seconds must be positive")
+    try:
+        target.cidr, target.ports = validate_target(target.cidr, target.ports)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _get_target(db: AsyncSession, target_id: int) -> DiscoveryTargetModel:
+    target = await db.get(DiscoveryTargetModel, target_id)
+    if not target:
+        raise HTTPException(status_code=404, detail="Discovery target not found")
+    return target
+
+
+@router.get("/discovery-targets", response_model=List[DiscoveryTarget])
+async def list_discovery_targets(cluster_id: Optional[int] = Query(None), db: AsyncSession = Depends(get_async_read_db)):
+    """Discovery targets ordered by id, with the counts from each one's last sweep."""
+    query = select(DiscoveryTargetModel).order_by(DiscoveryTargetModel.id)
+    if cluster_id is not None:
+        query = query.where(DiscoveryTargetModel.cluster_id == cluster_id)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.post("/discovery-targets", response_model=DiscoveryTarget, status_code=status.HTTP_201_CREATED)
+async def create_discovery_target(target: DiscoveryTargetCreate, db: AsyncSession = Depends(get_async_db)):
+    """Sweep a CIDR range for a cluster; the first sweep starts on the next discovery tick."""
+    if await db.get(ClusterModel, target.cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    db_target = DiscoveryTargetModel(**target.model_dump())
+    _validate(db_target)
+    db.add(db_target)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="This range is already a discovery target of the cluster")
+    await db.refresh(db_target)
+    return db_target
+
+
+@router.put("/discovery-targets/{target_id}", response_model=DiscoveryTarget)
+async def update_discovery_target(
+    target_id: int, target_update: DiscoveryTargetUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """Update a discovery target's ports, interval or enabled flag."""
+    db_target = await _get_target(db, target_id)
+    for field, value in target_update.model_dump(exclude_unset=True).items():
+        setattr(db_target, field, value)
+    _validate(db_target)
+    await db.commit()
+    await db.refresh(db_target)
+    return db_target
+
+
+@router.delete("/discovery-targets/{target_id}")
+async def delete_discovery_target(target_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Stop sweeping a range. Nodes it discovered are kept."""
+    await db.delete(await _get_target(db, target_id))
+    await db.commit()
+    return {"message": "Discovery target deleted successfully"}
+
+
+@router.post("/discovery-targets/{target_id}/run", status_code=status.HTTP_202_ACCEPTED)
+async def run_discovery_target(target_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Queue a sweep of the range on the next discovery tick."""
+    db_target = await _get_target(db, target_id)
+    if not db_target.enabled:
+        raise HTTPException(status_code=409, detail="Discovery target is disabled")
+    db_target.last_run_at = None
+    await db.commit()
+    return {"queued": True}
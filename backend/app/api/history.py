@@ -0,0 +1,93 @@
+# backend/app/api/history.py
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_read_db
+from app.models.history import NodeHealthEvent as NodeHealthEventModel
+from app.models.host import Node as NodeModel
+from app.schemas.history import HealthPoint, NodeHealthEvent, NodeHealthHistory
+from app.services.history import RAW, RESOLUTIONS, encode_event_cursor, event_page, pick_resolution, query_history
+
+router = APIRouter()
+
+MAX_EVENT_PAGE = 1000
+
+
+@router.get("/nodes/{node_id}/history", response_model=NodeHealthHistory)
+async def get_node_history(
+    node_id: int,
+    start: Optional[datetime] = Query(None, description="Defaults to 24 hours before end"),
+    end: Optional[datetime] = Query(None, description="Defaults to now (UTC)"),
+    resolution: str = Query("auto", description="auto, raw, 1m, 1h or 1d"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Health history for one node with uptime and flap (transition) counts.
+
+    With resolution=auto the finest resolution that keeps the response small
+    is picked from the requested range.
+    """
+    if resolution != "auto" and resolution != RAW and resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail="resolution must be auto, raw, 1m, 1h or 1d")
+    if await db.get(NodeModel, node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if resolution == "auto":
+        resolution = pick_resolution(start, end)
+
+    history = await db.run_sync(query_history, node_id, start, end, resolution)
+    points = [HealthPoint(**point) for point in history]
+    samples = sum(point.samples for point in points)
+    return NodeHealthHistory(
+        node_id=node_id,
+        resolution=resolution,
+        start=start,
+        end=end,
+        samples=samples,
+        uptime_ratio=sum(point.up_samples for point in points) / samples if samples else None,
+        transitions=sum(point.transitions for point in points),
+        points=points,
+    )
+
+
+@router.get("/events", response_model=List[NodeHealthEvent])
+async def list_health_events(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    cluster_id: Optional[List[int]] = Query(None),
+    node_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=MAX_EVENT_PAGE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Health transitions in (occurred_at, id) order.
+
+    Consumers poll with the X-Next-Cursor header of the last non-empty page
+    to receive each transition exactly once. Events appear
+    health_event_settle_seconds after they occur, once every concurrent
+    writer that could still add an earlier one has committed.
+    """
+    query = select(NodeHealthEventModel)
+    if cluster_id:
+        query = query.where(NodeHealthEventModel.cluster_id.in_(cluster_id))
+    if node_id is not None:
+        query = query.where(NodeHealthEventModel.node_id == node_id)
+    if since is not None:
+        query = query.where(NodeHealthEventModel.occurred_at >= since)
+    try:
+        query = event_page(query, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    events = (await db.execute(query)).scalars().all()
+    if events:
+        response.headers["X-Next-Cursor"] = encode_event_cursor(events[-1])
+    return events
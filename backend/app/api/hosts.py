@@ -1,78 +1,392 @@
 # backend/app/api/hosts.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-from app.schemas.host import Cluster, ClusterCreate, Node, NodeCreate, NodeUpdate
+from app.schemas.host import (
+    Cluster, ClusterCreate, ClusterHealthSummary, ClusterSummary, Node, NodeCreate, NodeUpdate,
+)
 from app.models.host import Cluster as ClusterModel, Node as NodeModel
-from app.db.session import get_db
-from app.utils.health import is_alive
+from app.core.cache import cache, cached_response
+from app.core.config import settings
+from app.core.serialization import ResponseFormat, columns, json_response, tables_response
+from app.db.session import get_async_db, get_async_read_db
+from app.services.alerts import cluster_counters
+from app.services.nodes import NodeSort, NodeStatus, SortOrder, filter_nodes, keyset_page, next_cursor, stale_clause
+from app.tasks.topology import reprobe
 
 router = APIRouter()
 
+# Response model field order, which the fast renderers reproduce
+CLUSTER_COLUMNS = list(ClusterSummary.model_fields)
+NODE_COLUMNS = list(Node.model_fields)
+NODE_FIELDS = set(NODE_COLUMNS)
+MAX_PAGE_SIZE = 1000
+DEFAULT_NODE_PAGE = 100
+
+# Cache namespaces: cluster-level reads depend on every node, single-node reads on that node
+CLUSTER_READS = ["clusters", "nodes"]
+
+
+def _parse_node_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated ?fields= list against the Node schema."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - NODE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown node fields: {', '.join(unknown)}")
+    return ["id"] + [field for field in requested if field != "id"]
+
+
 # Cluster endpoints
 @router.get("/clusters", response_model=List[Cluster])
-def list_clusters(db: Session = Depends(get_db)):
-    """Fetch all clusters with their nodes."""
-    return db.query(ClusterModel).all()
+async def list_clusters(
+    request: Request,
+    after_id: Optional[int] = Query(None, description="Keyset cursor: return clusters with id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_nodes: bool = Query(True, description="Set false for a cluster-only summary"),
+    fields: Optional[str] = Query(None, description="Comma-separated node fields to return"),
+    response_format: ResponseFormat = Query(
+        ResponseFormat.json, alias="format", description="columnar or msgpack return one table per entity"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Fetch clusters with their nodes, ordered by id.
+
+    Nodes are read in one extra query. When a page is full the
+    X-Next-After-Id header carries the cursor for the next page.
+    Responses are cached and carry an ETag.
+    """
+    node_fields = _parse_node_fields(fields)
+    return await cached_response(
+        request,
+        CLUSTER_READS,
+        lambda: _render_clusters(db, after_id, limit, include_nodes, node_fields, response_format),
+    )
+
+
+async def _render_clusters(
+    db: AsyncSession,
+    after_id: Optional[int],
+    limit: Optional[int],
+    include_nodes: bool,
+    node_fields: Optional[List[str]],
+    response_format: ResponseFormat,
+) -> Response:
+    """
+    Select plain column rows and encode them straight to orjson or msgpack,
+    skipping ORM objects and response models; on large fleets building those
+    cost far more than the queries.
+    """
+    query = select(*(getattr(ClusterModel, name) for name in CLUSTER_COLUMNS)).order_by(ClusterModel.id)
+    if after_id is not None:
+        query = query.where(ClusterModel.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    clusters = (await db.execute(query)).all()
+
+    headers = {}
+    if limit is not None and len(clusters) == limit:
+        headers["X-Next-After-Id"] = str(clusters[-1].id)
+
+    node_columns = node_fields or NODE_COLUMNS
+    # cluster_id goes last when not requested, so rows still zip with node_columns
+    selected = node_columns if "cluster_id" in node_columns else [*node_columns, "cluster_id"]
+    nodes = []
+    if include_nodes and clusters:
+        node_query = select(*(getattr(NodeModel, name) for name in selected)).order_by(
+            NodeModel.cluster_id, NodeModel.id
+        )
+        if limit is not None:
+            node_query = node_query.where(NodeModel.cluster_id.in_([row.id for row in clusters]))
+        elif after_id is not None:
+            node_query = node_query.where(NodeModel.cluster_id > after_id)
+        cluster_ids = {row.id for row in clusters}
+        # Drops nodes of clusters created after the first query
+        nodes = [row for row in (await db.execute(node_query)).all() if row.cluster_id in cluster_ids]
+
+    if response_format is not ResponseFormat.json:
+        tables = {"clusters": columns(clusters, CLUSTER_COLUMNS)}
+        if include_nodes:
+            tables["nodes"] = columns(nodes, selected)
+        return tables_response(tables, response_format, headers)
+
+    payload = [dict(zip(CLUSTER_COLUMNS, row)) for row in clusters]
+    if include_nodes:
+        by_cluster = {cluster["id"]: cluster.setdefault("nodes", []) for cluster in payload}
+        for row in nodes:
+            by_cluster[row.cluster_id].append(dict(zip(node_columns, row)))
+    return json_response(payload, headers)
+
+def _count_true(column):
+    return func.coalesce(func.sum(case((column.is_(True), 1), else_=0)), 0)
+
+
+@router.get("/clusters/summary", response_model=List[ClusterHealthSummary])
+async def cluster_health_summary(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """Per-cluster health counts, computed with a single GROUP BY over nodes."""
+    return await cached_response(request, CLUSTER_READS, lambda: _render_summary(db))
+
+
+async def _render_summary(db: AsyncSession) -> JSONResponse:
+    rows = (
+        await db.execute(
+            select(
+                ClusterModel.id.label("cluster_id"),
+                ClusterModel.name,
+                func.count(NodeModel.id).label("total_nodes"),
+                _count_true(NodeModel.is_alive).label("alive_nodes"),
+                _count_true(NodeModel.ssh_reachable).label("ssh_reachable_nodes"),
+                _count_true(NodeModel.passing_unit_tests).label("passing_unit_tests_nodes"),
+                func.min(NodeModel.last_health_check).label("oldest_health_check"),
+            )
+            .outerjoin(NodeModel, NodeModel.cluster_id == ClusterModel.id)
+            .group_by(ClusterModel.id, ClusterModel.name)
+            .order_by(ClusterModel.id)
+        )
+    ).all()
+    return JSONResponse(jsonable_encoder([ClusterHealthSummary.model_validate(row._mapping) for row in rows]))
 
 @router.post("/clusters", response_model=Cluster, status_code=status.HTTP_201_CREATED)
-def create_cluster(cluster: ClusterCreate, db: Session = Depends(get_db)):
+async def create_cluster(cluster: ClusterCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new cluster."""
     db_cluster = ClusterModel(**cluster.dict())
     db.add(db_cluster)
-    db.commit()
-    db.refresh(db_cluster)
+    await db.commit()
+    await cache.ainvalidate("clusters")
+    await db.refresh(db_cluster, ["nodes"])
     return db_cluster
 
+async def _commit_unique_name(db: AsyncSession) -> None:
+    """Commit, turning a (cluster_id, name) clash into a 409."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A node with this name already exists in the cluster")
+
 @router.post("/nodes", response_model=Node, status_code=status.HTTP_201_CREATED)
-def create_node(node: NodeCreate, db: Session = Depends(get_db)):
+async def create_node(node: NodeCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new node."""
     # Verify cluster exists
-    cluster = db.query(ClusterModel).filter(ClusterModel.id == node.cluster_id).first()
+    cluster = await db.get(ClusterModel, node.cluster_id)
     if not cluster:
         raise HTTPException(status_code=404, detail="Cluster not found")
-    
+
     db_node = NodeModel(**node.dict())
     db.add(db_node)
-    db.commit()
-    db.refresh(db_node)
+    await _commit_unique_name(db)
+    await cache.ainvalidate("clusters")
+    await cluster_counters.amark_dirty([db_node.cluster_id])
+    await db.refresh(db_node)
     return db_node
 
+def _select_nodes(sort: NodeSort, node_fields: Optional[List[str]] = None):
+    """Plain column rows: the requested node fields, then whatever the cursor needs."""
+    node_columns = node_fields or NODE_COLUMNS
+    cursor_columns = [name for name in (sort.value, "id") if name not in node_columns]
+    return select(*(getattr(NodeModel, name) for name in [*node_columns, *cursor_columns]))
+
+def _node_page(
+    nodes,
+    sort: NodeSort,
+    limit: int,
+    node_fields: Optional[List[str]] = None,
+    response_format: ResponseFormat = ResponseFormat.json,
+) -> Response:
+    headers = {}
+    cursor = next_cursor(sort, nodes, limit)
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    node_columns = node_fields or NODE_COLUMNS
+    # Rows from _select_nodes lead with node_columns
+    rows = [tuple(node)[:len(node_columns)] for node in nodes]
+    if response_format is not ResponseFormat.json:
+        return tables_response({"nodes": columns(rows, node_columns)}, response_format, headers)
+    return json_response([dict(zip(node_columns, row)) for row in rows], headers)
+
+
+@router.get("/nodes", response_model=List[Node])
+async def list_nodes(
+    request: Request,
+    cluster_id: Optional[List[int]] = Query(None, description="Repeat to match several clusters"),
+    status_filter: Optional[NodeStatus] = Query(None, alias="status"),
+    is_alive: Optional[bool] = Query(None),
+    ssh_reachable: Optional[bool] = Query(None),
+    passing_unit_tests: Optional[bool] = Query(None),
+    os: Optional[str] = Query(None, description="Case-insensitive substring of operating_system"),
+    name_prefix: Optional[str] = Query(None),
+    hostname_prefix: Optional[str] = Query(None),
+    ip_prefix: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, description="Substring of name or hostname; 3+ characters use the trigram index"),
+    stale_since: Optional[datetime] = Query(None, description="Only nodes not checked since this time"),
+    sort: NodeSort = Query(NodeSort.id),
+    order: SortOrder = Query(SortOrder.asc),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_NODE_PAGE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated node fields to return"),
+    response_format: ResponseFormat = Query(ResponseFormat.json, alias="format"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Search nodes across the fleet with every filter applied in SQL.
+
+    Sorts are limited to indexed columns and pages are keyset cursors
+    (X-Next-Cursor), so deep pages cost the same as the first. Prefix filters
+    use the text_pattern_ops indexes and q the pg_trgm indexes; with a short
+    fields= list this is cheap enough for type-ahead.
+    """
+    node_fields = _parse_node_fields(fields)
+
+    async def render():
+        query = filter_nodes(
+            _select_nodes(sort, node_fields),
+            cluster_ids=cluster_id,
+            status=status_filter,
+            is_alive=is_alive,
+            ssh_reachable=ssh_reachable,
+            passing_unit_tests=passing_unit_tests,
+            operating_system=os,
+            name_prefix=name_prefix,
+            hostname_prefix=hostname_prefix,
+            ip_prefix=ip_prefix,
+            search=q,
+            stale_since=stale_since,
+        )
+        nodes = (await db.execute(keyset_page(query, sort, order, cursor, limit))).all()
+        return _node_page(nodes, sort, limit, node_fields, response_format)
+
+    return await cached_response(request, CLUSTER_READS, render)
+
+
+@router.get("/clusters/{cluster_id}/nodes", response_model=List[Node])
+async def list_cluster_nodes(
+    cluster_id: int,
+    request: Request,
+    status_filter: Optional[NodeStatus] = Query(None, alias="status"),
+    is_alive: Optional[bool] = Query(None),
+    sort: NodeSort = Query(NodeSort.name),
+    order: SortOrder = Query(SortOrder.asc),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_NODE_PAGE, ge=1, le=MAX_PAGE_SIZE),
+    response_format: ResponseFormat = Query(ResponseFormat.json, alias="format"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    One cluster's nodes, filtered and sorted in SQL.
+
+    Status filters are served by the (cluster_id, is_alive) and partial
+    unhealthy-node indexes. When a page is full the X-Next-Cursor header
+    carries the cursor for the next one.
+    """
+    async def render():
+        if await db.get(ClusterModel, cluster_id) is None:
+            raise HTTPException(status_code=404, detail="Cluster not found")
+        query = filter_nodes(
+            _select_nodes(sort).where(NodeModel.cluster_id == cluster_id), status=status_filter, is_alive=is_alive
+        )
+        nodes = (await db.execute(keyset_page(query, sort, order, cursor, limit))).all()
+        return _node_page(nodes, sort, limit, response_format=response_format)
+
+    return await cached_response(request, CLUSTER_READS, render)
+
+
+def _default_stale_age() -> float:
+    """A node is stale once it has missed a few probes at the slowest expected rate."""
+    interval = settings.probe_max_interval if settings.probe_scheduler_enabled else settings.health_sweep_interval
+    # last_health_check is only written once per resolution window
+    return 3 * interval + settings.health_check_resolution
+
+
+@router.get("/nodes/stale", response_model=List[Node])
+async def list_stale_nodes(
+    request: Request,
+    max_age_seconds: Optional[float] = Query(None, gt=0, description="Defaults to three probe intervals"),
+    include_unchecked: bool = Query(True, description="Include nodes that were never checked"),
+    cluster_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(DEFAULT_NODE_PAGE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Nodes whose last health check is older than max_age_seconds, oldest
+    first, then never-checked nodes. Walks the last_health_check index.
+    """
+    older_than = datetime.utcnow() - timedelta(seconds=max_age_seconds or _default_stale_age())
+
+    async def render():
+        query = _select_nodes(NodeSort.last_health_check).where(stale_clause(older_than, include_unchecked))
+        if cluster_id is not None:
+            query = query.where(NodeModel.cluster_id == cluster_id)
+        page = keyset_page(query, NodeSort.last_health_check, SortOrder.asc, cursor, limit)
+        nodes = (await db.execute(page)).all()
+        return _node_page(nodes, NodeSort.last_health_check, limit)
+
+    return await cached_response(request, CLUSTER_READS, render)
+
 @router.get("/nodes/{node_id}", response_model=Node)
-def get_node(node_id: int, db: Session = Depends(get_db)):
+async def get_node(node_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific node by ID."""
-    node = db.query(NodeModel).filter(NodeModel.id == node_id).first()
-    if not node:
-        raise HTTPException(status_code=404, detail="Node not found")
-    return node
+    async def render():
+        node = await db.get(NodeModel, node_id)
+        if not node:
+            raise HTTPException(status_code=404, detail="Node not found")
+        return JSONResponse(jsonable_encoder(Node.model_validate(node)))
+
+    return await cached_response(request, ["nodes", f"node:{node_id}"], render)
 
 @router.put("/nodes/{node_id}", response_model=Node)
-def update_node(node_id: int, node_update: NodeUpdate, db: Session = Depends(get_db)):
+async def update_node(node_id: int, node_update: NodeUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a node."""
-    db_node = db.query(NodeModel).filter(NodeModel.id == node_id).first()
+    db_node = await db.get(NodeModel, node_id)
     if not db_node:
         raise HTTPException(status_code=404, detail="Node not found")
-    
+
     update_data = node_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_node, field, value)
-    
+
     db_node.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_node)
+    await _commit_unique_name(db)
+    await cache.ainvalidate("clusters", f"node:{node_id}")
+    await db.refresh(db_node)
     return db_node
 
 @router.delete("/nodes/{node_id}")
-def delete_node(node_id: int, db: Session = Depends(get_db)):
+async def delete_node(node_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a node."""
-    db_node = db.query(NodeModel).filter(NodeModel.id == node_id).first()
+    db_node = await db.get(NodeModel, node_id)
     if not db_node:
         raise HTTPException(status_code=404, detail="Node not found")
-    
-    db.delete(db_node)
-    db.commit()
+
+    cluster_id = db_node.cluster_id
+    await db.delete(db_node)
+    await db.commit()
+    await cache.ainvalidate("clusters", f"node:{node_id}")
+    await cluster_counters.amark_dirty([cluster_id])
     return {"message": "Node deleted successfully"}
 
+# Probe-now overrides: the scheduler's next tick when it drives probing, else re-probe tasks
+@router.post("/nodes/{node_id}/probe", status_code=status.HTTP_202_ACCEPTED)
+async def probe_node_now(node_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Queue a node for probing right away."""
+    if await db.get(NodeModel, node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return {"queued": await run_in_threadpool(reprobe, [node_id])}
+
+@router.post("/clusters/{cluster_id}/probe", status_code=status.HTTP_202_ACCEPTED)
+async def probe_cluster_now(cluster_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Queue every node in a cluster for probing right away."""
+    if await db.get(ClusterModel, cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    node_ids = (await db.execute(select(NodeModel.id).where(NodeModel.cluster_id == cluster_id))).scalars().all()
+    return {"queued": await run_in_threadpool(reprobe, node_ids)}
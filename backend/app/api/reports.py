@@ -0,0 +1,72 @@
+# backend/app/api/reports.py
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import get_async_db, get_async_read_db
+from app.models.host import Node as NodeModel
+from app.models.reports import NodeTestSummary as NodeTestSummaryModel
+from app.schemas.reports import NodeTestSummary
+from app.services.reports import JSON_LINES_TYPES, JUNIT_TYPES, ReportParseError, ReportParser, ReportQueue, report_parser
+
+router = APIRouter()
+
+
+async def _parse_upload(request: Request, parser: ReportParser):
+    """
+    Stream the body into the parser. Chunks are gathered up to
+    test_report_feed_bytes and parsed on the thread pool, so many concurrent
+    uploads never hold the event loop and the body is never fully buffered.
+    """
+    received = 0
+    pending = bytearray()
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.test_report_max_bytes:
+            raise HTTPException(status_code=413, detail="Test report too large")
+        pending += chunk
+        if len(pending) >= settings.test_report_feed_bytes:
+            await run_in_threadpool(parser.feed, bytes(pending))
+            pending.clear()
+    if pending:
+        await run_in_threadpool(parser.feed, bytes(pending))
+    return await run_in_threadpool(parser.finish)
+
+
+@router.post("/nodes/{node_id}/test-reports", response_model=NodeTestSummary, status_code=status.HTTP_202_ACCEPTED)
+async def upload_test_report(node_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Accept a unit-test report from a node as JUnit XML or JSON lines.
+
+    The report is summarized while it streams in and queued; the batch
+    writer stores it and updates passing_unit_tests within a few seconds.
+    """
+    parser = report_parser(request.headers.get("content-type", ""))
+    if parser is None:
+        raise HTTPException(
+            status_code=415, detail=f"Send JUnit XML ({', '.join(JUNIT_TYPES)}) or JSON lines ({', '.join(JSON_LINES_TYPES)})"
+        )
+    if await db.get(NodeModel, node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    # Hand the pooled connection back before a possibly slow upload
+    await db.close()
+
+    try:
+        summary = await _parse_upload(request, parser)
+    except ReportParseError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    reported_at = datetime.utcnow()
+    await run_in_threadpool(ReportQueue().push, node_id, summary, reported_at)
+    return NodeTestSummary(node_id=node_id, reported_at=reported_at, passed=summary.passed, **summary.__dict__)
+
+
+@router.get("/nodes/{node_id}/test-summary", response_model=NodeTestSummary)
+async def get_test_summary(node_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """The latest stored test-report summary for a node."""
+    summary = await db.get(NodeTestSummaryModel, node_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No test report for this node")
+    return summary
@@ -0,0 +1,86 @@
+# backend/app/api/stream.py
+import json
+from typing import AsyncIterator, List, Optional, Set
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.events import parse_stream_id
+
+router = APIRouter()
+
+BLOCK_MS = 15_000   # how long one XREAD waits before we send a keep-alive
+READ_COUNT = 500
+
+
+def _sse(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _node_events(
+    request: Request, cursor: str, clusters: Optional[Set[int]]
+) -> AsyncIterator[str]:
+    client = aioredis.from_url(settings.redis_url, decode_responses=True)
+    key = settings.event_stream_key
+    try:
+        if cursor == "$":
+            # Resolve "$" once so events between reads are not skipped
+            newest = await client.xrevrange(key, count=1)
+            cursor = newest[0][0] if newest else "0-0"
+        elif parse_stream_id(cursor) > (0, 0):
+            # The cursor fell out of the trimmed stream: tell the client to re-fetch a snapshot
+            oldest = await client.xrange(key, count=1)
+            if oldest and parse_stream_id(oldest[0][0]) > parse_stream_id(cursor):
+                yield _sse(json.dumps({"cursor": cursor}), event="reset")
+
+        while not await request.is_disconnected():
+            entries = await client.xread({key: cursor}, count=READ_COUNT, block=BLOCK_MS)
+            if not entries:
+                yield ": keep-alive\n\n"
+                continue
+            for _, messages in entries:
+                for message_id, fields in messages:
+                    cursor = message_id
+                    data = fields["data"]
+                    if clusters and json.loads(data)["cluster_id"] not in clusters:
+                        continue
+                    yield _sse(data, event="node", event_id=message_id)
+    finally:
+        await client.aclose()
+
+
+@router.get("/stream/nodes")
+async def stream_node_changes(
+    request: Request,
+    cluster_id: Optional[List[int]] = Query(None, description="Only send changes for these clusters"),
+    cursor: Optional[str] = Query(None, description="Resume after this event id"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events stream of node health changes.
+
+    Each event carries node_id, cluster_id, the changed fields and a timestamp;
+    its SSE id is the resume cursor. Reconnecting clients resume from the
+    Last-Event-ID header or ?cursor=, and get a "reset" event if that cursor
+    is older than the retained history.
+    """
+    start = cursor or last_event_id or "$"
+    if start != "$":
+        try:
+            parse_stream_id(start)
+        except ValueError:
+            start = "$"
+    clusters = set(cluster_id) if cluster_id else None
+    return StreamingResponse(
+        _node_events(request, start, clusters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,82 @@
+# backend/app/api/topology.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db, get_async_read_db
+from app.models.host import Cluster as ClusterModel, Node as NodeModel
+from app.models.topology import NodeDependency as NodeDependencyModel
+from app.schemas.topology import NodeDependency, NodeDependencyCreate
+from app.services.topology import creates_cycle
+from app.tasks.topology import reprobe
+
+router = APIRouter()
+
+
+@router.get("/dependencies", response_model=List[NodeDependency])
+async def list_dependencies(
+    node_id: Optional[int] = Query(None),
+    cluster_id: Optional[int] = Query(None),
+    parent_node_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Dependency edges ordered by id, optionally for one dependent node, cluster or parent."""
+    query = select(NodeDependencyModel).order_by(NodeDependencyModel.id)
+    if node_id is not None:
+        query = query.where(NodeDependencyModel.node_id == node_id)
+    if cluster_id is not None:
+        query = query.where(NodeDependencyModel.cluster_id == cluster_id)
+    if parent_node_id is not None:
+        query = query.where(NodeDependencyModel.parent_node_id == parent_node_id)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.post("/dependencies", response_model=NodeDependency, status_code=status.HTTP_201_CREATED)
+async def create_dependency(dependency: NodeDependencyCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Put a node, or every node of a cluster, behind a parent node. From the
+    next probe on, the parent is probed first and its dependents are only
+    probed while it is up.
+    """
+    if (dependency.cluster_id is None) == (dependency.node_id is None):
+        raise HTTPException(status_code=400, detail="Set exactly one of cluster_id and node_id")
+    if dependency.node_id == dependency.parent_node_id:
+        raise HTTPException(status_code=400, detail="A node cannot depend on itself")
+    if await db.get(NodeModel, dependency.parent_node_id) is None:
+        raise HTTPException(status_code=404, detail="Parent node not found")
+    if dependency.node_id is not None and await db.get(NodeModel, dependency.node_id) is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    if dependency.cluster_id is not None and await db.get(ClusterModel, dependency.cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    if await db.run_sync(creates_cycle, dependency.parent_node_id, dependency.node_id, dependency.cluster_id):
+        raise HTTPException(status_code=400, detail="The parent already depends on this node or cluster")
+
+    db_dependency = NodeDependencyModel(**dependency.model_dump())
+    db.add(db_dependency)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="This dependency already exists")
+    await db.refresh(db_dependency)
+    return db_dependency
+
+
+@router.delete("/dependencies/{dependency_id}")
+async def delete_dependency(dependency_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Remove an edge. Dependents flagged upstream_down are re-probed straight away."""
+    db_dependency = await db.get(NodeDependencyModel, dependency_id)
+    if not db_dependency:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    scope = (
+        NodeModel.id == db_dependency.node_id if db_dependency.node_id is not None
+        else NodeModel.cluster_id == db_dependency.cluster_id
+    )
+    await db.delete(db_dependency)
+    await db.commit()
+    marked = (await db.execute(select(NodeModel.id).where(scope, NodeModel.upstream_down.is_(True)))).scalars().all()
+    return {"message": "Dependency deleted successfully", "reprobed": await run_in_threadpool(reprobe, marked)}
@@ -0,0 +1,220 @@
+# backend/app/core/cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.routing import pin_primary
+
+logger = logging.getLogger(__name__)
+
+_GEN_PREFIX = "watchdog:cache:gen:"
+_ENTRY_PREFIX = "watchdog:cache:entry:"
+_FRESH_PREFIX = "watchdog:cache:fresh:"   # set for fresh_window after a namespace is invalidated
+
+# Response headers worth replaying from a cached entry
+_CACHED_HEADERS = ("x-next-after-id", "x-next-cursor")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class ReadCache:
+    """
+    Read-through cache for serialized API responses.
+
+    Entries live in an in-process LRU with a TTL and, when Redis is enabled,
+    in Redis as well so every API process shares them. Invalidation is by
+    namespace ("clusters", "nodes", "node:42"): each namespace has a
+    generation counter baked into the keys of the entries that depend on it,
+    so bumping the counter orphans exactly those entries. Counters live in
+    Redis, which lets Celery workers invalidate entries held by API processes.
+
+    With read replicas, a namespace stays "fresh" for fresh_window seconds
+    after it is invalidated: replicas may not have replayed the write yet,
+    so its entries are rendered from the primary until then.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl: float = 30.0,
+        redis_url: Optional[str] = None,
+        fresh_window: float = 0.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.fresh_window = fresh_window
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+
+    def _generation_tokens(self, namespaces: List[str]) -> Tuple[str, bool]:
+        """Generation tokens ("" to bypass the cache) and whether any namespace is fresh."""
+        if self._redis is not None:
+            keys = [_GEN_PREFIX + namespace for namespace in namespaces]
+            if self.fresh_window:
+                keys += [_FRESH_PREFIX + namespace for namespace in namespaces]
+            try:
+                values = self._redis.mget(keys)
+            except redis.RedisError as exc:
+                logger.warning("cache generation lookup failed, bypassing cache: %s", exc)
+                return "", bool(self.fresh_window)
+            tokens = ".".join((value or b"0").decode() for value in values[:len(namespaces)])
+            return tokens, any(values[len(namespaces):])
+        now = time.monotonic()
+        with self._lock:
+            tokens = ".".join(str(self._generations.get(namespace, 0)) for namespace in namespaces)
+            fresh = any(
+                now - self._invalidated_at[namespace] < self.fresh_window
+                for namespace in namespaces if namespace in self._invalidated_at
+            )
+        return tokens, fresh
+
+    def full_key(self, namespaces: List[str], key: str) -> Tuple[Optional[str], bool]:
+        """
+        Cache key for `key` under the namespaces' current generations (None
+        when the cache is bypassed), and whether the render must read from
+        the primary. Take it once, before rendering, and use it for both
+        get() and set(): a write landing mid-render then orphans the entry
+        instead of having it stored under the new generation.
+        """
+        tokens, fresh = self._generation_tokens(namespaces)
+        if not tokens:
+            return None, fresh
+        return f"{','.join(namespaces)}|{tokens}|{key}", fresh
+
+    def get(self, full_key: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                expires, cached = entry
+                if expires > now:
+                    self._entries.move_to_end(full_key)
+                    return cached
+                del self._entries[full_key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(_ENTRY_PREFIX + full_key)
+        except redis.RedisError:
+            return None
+        if raw is None:
+            return None
+        meta, _, body = raw.partition(b"\n")
+        cached = CachedResponse(body=body, **json.loads(meta))
+        self._store_local(full_key, cached)
+        return cached
+
+    def set(self, full_key: str, cached: CachedResponse) -> None:
+        self._store_local(full_key, cached)
+        if self._redis is not None:
+            meta = json.dumps({"etag": cached.etag, "media_type": cached.media_type, "headers": cached.headers})
+            try:
+                self._redis.set(_ENTRY_PREFIX + full_key, meta.encode() + b"\n" + cached.body, ex=int(self.ttl) or 1)
+            except redis.RedisError as exc:
+                logger.warning("cache write failed: %s", exc)
+
+    def _store_local(self, full_key: str, cached: CachedResponse) -> None:
+        with self._lock:
+            self._entries[full_key] = (time.monotonic() + self.ttl, cached)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Orphan every entry that depends on any of the given namespaces."""
+        if not namespaces:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+                self._invalidated_at[namespace] = now
+        if self._redis is None:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for namespace in namespaces:
+                pipe.incr(_GEN_PREFIX + namespace)
+                # Counters only need to outlive the entries keyed on them
+                pipe.expire(_GEN_PREFIX + namespace, int(self.ttl * 4) + 60)
+                if self.fresh_window:
+                    pipe.set(_FRESH_PREFIX + namespace, 1, px=max(1, int(self.fresh_window * 1000)))
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("cache invalidation failed for %s: %s", namespaces, exc)
+
+    async def ainvalidate(self, *namespaces: str) -> None:
+        """invalidate() for async routes, kept off the event loop."""
+        await run_in_threadpool(self.invalidate, *namespaces)
+
+
+cache = ReadCache(
+    max_entries=settings.cache_max_entries,
+    ttl=settings.cache_ttl,
+    redis_url=settings.redis_url if settings.cache_use_redis else None,
+    # A replica serves reads until it is more than db_replica_max_lag behind, noticed within a check interval
+    fresh_window=settings.db_replica_max_lag + settings.db_replica_check_interval if settings.database_replica_urls else 0.0,
+)
+
+
+def node_namespaces(node_ids: Iterable[int]) -> List[str]:
+    return [f"node:{node_id}" for node_id in node_ids]
+
+
+async def cached_response(
+    request: Request, namespaces: List[str], render: Callable[[], Awaitable[Response]]
+) -> Response:
+    """
+    Serve request from the cache, or await render() and cache what it returns.
+
+    Adds an ETag to every response and answers If-None-Match with 304.
+    The cached body is whatever render() produced (JSON or msgpack). Right
+    after one of the namespaces is invalidated, render() reads from the
+    primary so a lagging replica's rows are never cached.
+    """
+    if not settings.cache_enabled:
+        return await render()
+
+    key = f"{request.url.path}?{'&'.join(sorted(str(request.query_params).split('&')))}"
+    full_key, fresh = await run_in_threadpool(cache.full_key, namespaces, key)
+    if fresh:
+        # Replicas may still lag behind the write that invalidated these namespaces
+        pin_primary()
+    cached = await run_in_threadpool(cache.get, full_key) if full_key else None
+    if cached is None:
+        response = await render()
+        cached = CachedResponse(
+            body=response.body,
+            etag='"' + hashlib.sha1(response.body).hexdigest() + '"',
+            media_type=response.media_type or "application/json",
+            headers={name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers},
+        )
+        if full_key:
+            await run_in_threadpool(cache.set, full_key, cached)
+
+    headers = {**cached.headers, "ETag": cached.etag}
+    if_none_match = request.headers.get("if-none-match")
+    # Weak comparison: compressed responses carry the same tag as W/"..."
+    if if_none_match and cached.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
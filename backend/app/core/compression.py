@@ -0,0 +1,171 @@
+# backend/app/core/compression.py
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import brotli
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+# Preferred first
+ENCODINGS = ("br", "gzip")
+
+# Streams that must reach the client unbuffered, and bodies that are already compressed
+_SKIP_TYPES = ("text/event-stream", "image/", "application/gzip", "application/zip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The preferred encoding the client accepts with q > 0, or None."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    for coding in ENCODINGS:
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class _Encoder:
+    """Incremental gzip or brotli encoder; flush() makes everything sent so far decodable."""
+
+    def __init__(self, coding: str):
+        if coding == "br":
+            compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self.compress, self.flush, self.finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+            self.compress, self.finish = compressor.compress, compressor.flush
+            self.flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    encoder = _Encoder(coding)
+    return encoder.compress(body) + encoder.finish()
+
+
+class CompressedBodies:
+    """
+    Small LRU of compressed bodies keyed by (ETag, encoding). Cached API
+    responses repeat the same body and ETag until invalidated, so each one
+    is compressed once per encoding rather than once per request.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, coding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((etag, coding))
+            if body is not None:
+                self._entries.move_to_end((etag, coding))
+            return body
+
+    def set(self, etag: str, coding: str, body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(etag, coding)] = body
+            self._entries.move_to_end((etag, coding))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating br or gzip from Accept-Encoding.
+
+    Single-body responses are compressed on the thread pool, since zlib and
+    brotli release the GIL, and their ETags become weak (W/) as the bytes
+    differ per encoding; the read cache compares If-None-Match weakly.
+    Streamed bodies are compressed chunk by chunk and flushed after each so
+    clients still see progress. Bodies under compression_min_bytes, server-
+    sent events and already-encoded responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.bodies = CompressedBodies(settings.compression_cache_entries)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether it is worth compressing
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                chunk = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._compressible(start["status"], headers, body, more_body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = coding
+            if more_body:
+                del headers["Content-Length"]
+                encoder = _Encoder(coding)
+                await send(start)
+                await send({"type": "http.response.body", "body": encoder.compress(body) + encoder.flush(), "more_body": True})
+                return
+
+            etag = headers.get("etag")
+            compressed = self.bodies.get(etag, coding) if etag else None
+            if compressed is None:
+                compressed = await run_in_threadpool(compress, body, coding)
+                if etag:
+                    self.bodies.set(etag, coding, compressed)
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressible(status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if status in (204, 304) or "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").startswith(_SKIP_TYPES):
+            return False
+        if more_body:
+            length = headers.get("content-length")
+            return length is None or int(length) >= settings.compression_min_bytes
+        return len(body) >= settings.compression_min_bytes
@@ -1,13 +1,142 @@
 # backend/app/core/config.py
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/0"
+    redis_url: str = "redis://redis:6379/0"
+
+    # Database engines and connection pooling
+    async_database_url: Optional[str] = None  # derived from database_url when unset
+    db_echo: bool = False                     # log every SQL statement
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800               # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+
+    # Read replicas for GET routes; writes and everything after a write in a request use the primary
+    database_replica_urls: Optional[str] = None        # comma-separated
+    async_database_replica_urls: Optional[str] = None  # derived from database_replica_urls when unset
+    db_replica_max_lag: float = 5.0          # seconds behind the primary before a replica is skipped
+    db_replica_check_interval: float = 5.0   # how often replica reachability and lag are checked
+
+    # Read cache for cluster/node GET routes
+    cache_enabled: bool = True
+    cache_use_redis: bool = True             # share entries and invalidations across processes
+    cache_ttl: float = 30.0
+    cache_max_entries: int = 2048
+
+    # Response encoding (gzip/brotli negotiated from Accept-Encoding)
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024        # smaller bodies are sent as-is
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4      # 0-11; past ~5 JSON shrinks little for much more CPU
+    compression_cache_entries: int = 256     # compressed copies of ETag'd responses kept per process
+
+    # Health sweep
+    health_sweep_interval: float = 60.0      # seconds between fleet sweeps
+    health_sweep_shard_size: int = 500       # nodes per shard task
+    probe_concurrency: int = 1000            # in-flight connects per shard
+    probe_timeout: float = 0.5               # per-probe connect timeout
+    probe_deadline: float = 30.0             # upper bound for one shard's probes
+
+    # Adaptive probe scheduler (replaces the fixed-rate sweep when enabled)
+    probe_scheduler_enabled: bool = False
+    probe_scheduler_tick: float = 5.0        # seconds between due-node checks
+    probe_min_interval: float = 15.0         # new, down and flapping nodes
+    probe_max_interval: float = 300.0        # long-stable healthy nodes
+    probe_backoff_factor: float = 1.5
+    probe_stable_after: int = 3              # unchanged results before backing off
+    probe_jitter: float = 0.2                # +/- fraction applied to every interval
+    probe_cluster_rate_limit: int = 500      # max probes per cluster per tick
+    probe_batch_size: int = 5000             # max due nodes taken per tick
+
+    # Probe agents: standalone processes that split the fleet by consistent hashing
+    # (replaces both of the above when enabled)
+    probe_agents_enabled: bool = False
+    probe_agent_zone: str = "default"        # agents probe the clusters whose probe_zone matches, sharing them with the zone's other agents
+    probe_agent_heartbeat: float = 5.0       # seconds between heartbeats
+    probe_agent_ttl: float = 15.0            # an agent is dead once its heartbeat is this old
+    probe_ring_vnodes: int = 128             # points per agent on the hash ring
+    probe_cluster_slices: int = 4            # ring keys per cluster, so big clusters spread out
+    probe_report_batch: int = 2000           # results probed and written per batch
+
+    # Live node status stream (Redis stream of health deltas)
+    event_stream_key: str = "watchdog:node-events"
+    event_stream_maxlen: int = 100_000
+
+    # Health history: how long each resolution is kept, in days
+    history_raw_retention_days: float = 2
+    history_1m_retention_days: float = 14
+    history_1h_retention_days: float = 180
+    history_1d_retention_days: float = 730
+    history_rollup_grace_seconds: float = 120  # wait for late samples before closing a minute
+    history_transition_lookback_seconds: float = 900  # how far back a rollup looks for each node's previous sample
+    history_rollup_interval: float = 60.0
+
+    # Change-detection health writes
+    health_check_resolution: float = 120.0   # last_health_check is rewritten at most once per window
+    health_state_ttl: float = 86400.0        # lifetime of the Redis copy of last-known node health
+    health_event_retention_days: float = 30
+    health_event_settle_seconds: float = 30.0  # /api/events holds back events younger than this; must exceed a write's commit time
+
+    # Alerting: per-cluster rules evaluated from health transitions
+    alert_eval_interval: float = 10.0
+    alert_reconcile_interval: float = 300.0  # full recount of the per-cluster counters
+    alert_flap_window: float = 900.0         # an alert that fires again within this is reopened
+    alert_flap_threshold: int = 3            # reopenings before notifications are held back
+    alert_node_sample: int = 20              # affected nodes listed in a notification
+    alert_dispatch_interval: float = 5.0
+    alert_dispatch_batch: int = 100          # notifications per sink call
+    alert_dispatch_max_attempts: int = 5
+    alert_webhook_url: Optional[str] = None
+    alert_webhook_timeout: float = 10.0
+    alert_file_path: Optional[str] = None    # JSON lines file sink
+
+    # Unit-test report ingestion (JUnit XML / JSON lines uploaded by nodes)
+    test_report_max_bytes: int = 100 * 1024 * 1024
+    test_report_feed_bytes: int = 256 * 1024  # upload bytes handed to the parser thread at a time
+    test_report_failed_names: int = 20       # failing test names kept per summary
+    test_report_batch: int = 1000            # summaries applied per transaction
+    test_report_apply_interval: float = 5.0
+
+    # Service checks (TCP port sets, HTTP, TLS, SSH banner) defined per cluster or node
+    check_tick_interval: float = 15.0        # how often due check definitions are looked for
+    check_concurrency: int = 500             # open connections across every check of a run
+    check_per_host: int = 4                  # open connections to any one node
+    check_deadline: float = 120.0            # upper bound for one run's checks
+
+    # Subnet discovery: per-cluster CIDR sweeps that register answering hosts as nodes
+    discovery_tick_interval: float = 60.0    # how often due discovery targets are looked for
+    discovery_concurrency: int = 1000        # hosts being swept at once
+    discovery_rate: float = 2000.0           # connects started per second across a sweep
+    discovery_timeout: float = 0.5           # per-connect timeout
+    discovery_max_addresses: int = 65536     # largest range accepted, a /16
+    discovery_dns_concurrency: int = 64      # reverse lookups in flight
+    discovery_dns_timeout: float = 2.0
+
+    # Remote fact collection over pooled SSH sessions
+    fact_collection_interval: float = 900.0
+    fact_collection_concurrency: int = 100
+    ssh_pool_size: int = 200                 # persistent sessions per worker; keep well under the open-file limit
+    ssh_idle_timeout: float = 1800.0         # close sessions unused for this long
+    ssh_connect_timeout: float = 10.0
+    ssh_command_timeout: float = 20.0
+    ssh_default_username: str = "root"
+    ssh_password: Optional[str] = None       # only for password-auth test machines
+    ssh_known_hosts: Optional[str] = None    # known_hosts path; unset uses ~/.ssh/known_hosts
+    ssh_disable_host_key_check: bool = False  # accept any host key; only for throwaway test machines
+
+    # Prometheus metrics and request profiling
+    metrics_enabled: bool = True
+    worker_metrics_port: int = 9808          # per-worker exporter; 0 disables it
+    slow_request_seconds: float = 1.0        # requests slower than this are counted and logged
+    profile_sample_rate: float = 0.0         # fraction of requests run under cProfile; 0 disables
 
     class Config:
         env_file = ".env"  # reads DATABASE_URL from backend/.env
 
 settings = Settings()
-
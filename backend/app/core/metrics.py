@@ -0,0 +1,270 @@
+# backend/app/core/metrics.py
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cached read up to a slow bulk import
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "watchdog_http_request_duration_seconds", "API request latency", ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "watchdog_http_requests_in_flight", "API requests being handled", ["method"], multiprocess_mode="livesum",
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "watchdog_http_response_size_bytes", "API response body size", ["method", "route"], buckets=_SIZE_BUCKETS,
+)
+HTTP_SLOW_REQUESTS = Counter(
+    "watchdog_http_slow_requests_total", "Requests slower than slow_request_seconds", ["method", "route"],
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "watchdog_db_query_duration_seconds", "Duration of single SQL statements", ["statement"],
+    buckets=_QUERY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "watchdog_db_queries_per_request", "SQL statements issued while handling one request", ["method", "route"],
+    buckets=_COUNT_BUCKETS,
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "watchdog_db_seconds_per_request", "Time spent in SQL while handling one request", ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "watchdog_db_replica_healthy", "1 while a read replica takes queries", ["replica"], multiprocess_mode="liveall",
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "watchdog_db_replica_lag_seconds", "Replication lag at the last replica check", ["replica"],
+    multiprocess_mode="liveall",
+)
+
+TASK_SECONDS = Histogram(
+    "watchdog_celery_task_duration_seconds", "Celery task runtime", ["task", "state"], buckets=_LATENCY_BUCKETS,
+)
+TASK_QUEUE_WAIT_SECONDS = Histogram(
+    "watchdog_celery_task_queue_wait_seconds", "Time between publishing a task and a worker starting it", ["task"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+_SENT_AT_HEADER = "watchdog_sent_at"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    query_seconds: float = 0.0
+
+
+# Set for the duration of each API request; engine hooks add to whatever is current
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("watchdog_request_stats", default=None)
+
+
+def _registry() -> CollectorRegistry:
+    """The default registry, or one aggregating every process under PROMETHEUS_MULTIPROC_DIR."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def metrics_endpoint() -> Response:
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+def _route_label(scope) -> str:
+    """The matched route template, so /nodes/1 and /nodes/2 share one series."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    # Routes of included routers only know their own path; recover the prefix from the request path
+    path = scope.get("path", "")
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if concrete and path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return template
+
+
+class _Profiler:
+    """Samples requests under cProfile, one at a time since a thread can run only one profiler."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[cProfile.Profile]:
+        if settings.profile_sample_rate <= 0 or random.random() >= settings.profile_sample_rate:
+            return None
+        if not self._lock.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            self._lock.release()
+            return None
+        return profile
+
+    def stop(self, profile: cProfile.Profile) -> str:
+        profile.disable()
+        self._lock.release()
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(25)
+        return out.getvalue()
+
+
+_profiler = _Profiler()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight count, response size and SQL
+    usage per route. Written against raw ASGI rather than BaseHTTPMiddleware so
+    streamed responses (SSE, bulk results) are measured without buffering.
+
+    A sampled fraction of requests runs under cProfile; the profile is logged
+    only when the request turns out to be slow. The event loop serves other
+    requests meanwhile, so a profile can include their frames too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        profile = _profiler.start()
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            _request_stats.reset(token)
+            route = _route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(method, route, str(status_code)).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(size)
+            DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.queries)
+            DB_SECONDS_PER_REQUEST.labels(method, route).observe(stats.query_seconds)
+
+            report = _profiler.stop(profile) if profile is not None else None
+            if elapsed >= settings.slow_request_seconds:
+                HTTP_SLOW_REQUESTS.labels(method, route).inc()
+                logger.warning(
+                    "slow request %s %s: %.3fs, %d queries in %.3fs",
+                    method, scope.get("path"), elapsed, stats.queries, stats.query_seconds,
+                )
+                if report:
+                    logger.warning("profile for %s %s:\n%s", method, scope.get("path"), report)
+
+
+def _statement_kind(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on engine and charge it to the current request, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("watchdog_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["watchdog_query_start"].pop()
+        DB_QUERY_SECONDS.labels(_statement_kind(statement)).observe(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("watchdog_query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+def instrument_celery(app) -> None:
+    """Record task runtime and queue wait, and serve worker metrics on worker_metrics_port."""
+    from celery.signals import (
+        before_task_publish, task_postrun, task_prerun, worker_init, worker_process_shutdown,
+    )
+
+    started = {}
+
+    @before_task_publish.connect(weak=False)
+    def _stamp(headers=None, **kwargs):
+        if headers is not None:
+            headers[_SENT_AT_HEADER] = time.time()
+
+    @task_prerun.connect(weak=False)
+    def _prerun(task_id=None, task=None, **kwargs):
+        started[task_id] = time.perf_counter()
+        sent_at = getattr(task.request, _SENT_AT_HEADER, None)
+        if sent_at:
+            TASK_QUEUE_WAIT_SECONDS.labels(task.name).observe(max(0.0, time.time() - sent_at))
+
+    @task_postrun.connect(weak=False)
+    def _postrun(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None:
+            TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+    @worker_init.connect(weak=False)
+    def _serve(**kwargs):
+        # Prefork children only show up here when PROMETHEUS_MULTIPROC_DIR is set
+        if settings.worker_metrics_port:
+            start_http_server(settings.worker_metrics_port, registry=_registry())
+
+    @worker_process_shutdown.connect(weak=False)
+    def _cleanup(pid=None, **kwargs):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,51 @@
+# backend/app/core/serialization.py
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import msgpack
+import orjson
+from fastapi import Response
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# {table: {column: [values]}}
+Tables = Dict[str, Dict[str, List[Any]]]
+
+
+class ResponseFormat(str, Enum):
+    json = "json"            # one object per row, the shape of the response model
+    columnar = "columnar"    # {"clusters": {column: [values]}, "nodes": {column: [values]}}
+    msgpack = "msgpack"      # the columnar tables, MessagePack-encoded
+
+
+def columns(rows: Sequence[Sequence[Any]], names: Sequence[str]) -> Dict[str, List[Any]]:
+    """Transpose result rows into one list per column; values past len(names) are dropped."""
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(column) for name, column in zip(names, values)}
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    JSON encoded with orjson. Takes plain dicts and lists rather than response
+    models; naive datetimes come out as the same ISO strings jsonable_encoder
+    produces.
+    """
+    return Response(content=orjson.dumps(content), media_type="application/json", headers=dict(headers or {}))
+
+
+def _msgpack_default(value: Any) -> Any:
+    # Datetimes go out as the same ISO strings the JSON formats use
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def tables_response(
+    tables: Tables, response_format: ResponseFormat, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Encode columnar tables as JSON or MessagePack."""
+    if response_format is ResponseFormat.msgpack:
+        body = msgpack.packb(tables, default=_msgpack_default, use_bin_type=True, datetime=False)
+        return Response(content=body, media_type=MSGPACK_MEDIA_TYPE, headers=dict(headers or {}))
+    return json_response(tables, headers)
@@ -0,0 +1,186 @@
+# backend/app/db/routing.py
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# A Postgres standby's replication state. Reading pg_stat_wal_receiver.status
+# needs pg_read_all_stats (or pg_monitor) on the checking role; without it
+# the standby always reads as not streaming.
+_POSTGRES_STANDBY = text("""
+    SELECT
+        pg_is_in_recovery() AS standby,
+        EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') AS streaming,
+        pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AS replayed,
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS lag
+""")
+
+
+def standby_lag(row) -> float:
+    """
+    Seconds a standby is behind, from a _POSTGRES_STANDBY row.
+
+    An idle primary writes no WAL, so a standby that is still streaming and
+    has replayed everything it received counts as current. Otherwise the lag
+    is the age of the last replayed transaction. A standby whose WAL receiver
+    is gone gets nothing new however little it has left to replay, so it
+    raises instead of reporting a lag.
+    """
+    if not row.standby:
+        return 0.0
+    if not row.streaming:
+        raise RuntimeError("WAL receiver is not streaming")
+    if row.replayed:
+        return 0.0
+    if row.lag is None:
+        raise RuntimeError("no transaction replayed yet")
+    return max(0.0, float(row.lag))
+
+
+# Set once anything in the current request writes; its reads stay on the primary from then on
+_primary_pinned: ContextVar[bool] = ContextVar("watchdog_primary_pinned", default=False)
+
+
+def pin_primary() -> None:
+    """Send the rest of the current request's reads to the primary."""
+    _primary_pinned.set(True)
+
+
+@dataclass
+class Replica:
+    name: str                       # host/database, safe to log
+    engine: Engine
+    async_engine: AsyncEngine
+    healthy: bool = False           # unknown until the first check
+    lag: Optional[float] = None
+
+
+class ReplicaPool:
+    """
+    Read replicas with their health, shared by the sync and async sessions.
+
+    A background thread checks every replica each db_replica_check_interval:
+    one that cannot be reached, has lost its WAL stream, or is more than
+    db_replica_max_lag seconds behind, is skipped until a later check passes. A disconnect seen by a
+    query takes the replica out straight away. Reads fall back to the
+    primary when no replica is healthy.
+    """
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._turn = itertools.count()
+        self._started = False
+        self._lock = threading.Lock()
+        for replica in replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+            event.listen(replica.async_engine.sync_engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: Replica):
+        def handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(replica, str(context.original_exception))
+        return handle_error
+
+    def mark_down(self, replica: Replica, reason: str) -> None:
+        if replica.healthy:
+            logger.warning("replica %s marked unhealthy: %s", replica.name, reason)
+        replica.healthy = False
+        DB_REPLICA_HEALTHY.labels(replica.name).set(0)
+
+    def check(self) -> None:
+        """Measure every replica's lag and update its health."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    lag = standby_lag(conn.execute(_POSTGRES_STANDBY).one()) \
+                        if replica.engine.dialect.name == "postgresql" else float(conn.execute(text("SELECT 0")).scalar())
+            except Exception as exc:
+                replica.lag = None
+                self.mark_down(replica, f"check failed: {exc}")
+                continue
+            replica.lag = lag
+            DB_REPLICA_LAG_SECONDS.labels(replica.name).set(lag)
+            if lag > settings.db_replica_max_lag:
+                self.mark_down(replica, f"{lag:.1f}s behind the primary")
+            else:
+                if not replica.healthy:
+                    logger.info("replica %s healthy, %.1fs behind the primary", replica.name, lag)
+                replica.healthy = True
+                DB_REPLICA_HEALTHY.labels(replica.name).set(1)
+
+    def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                self.check()
+            except Exception:
+                logger.exception("replica check failed")
+            time.sleep(max(0.0, settings.db_replica_check_interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start the checks on a daemon thread; reads stay on the primary until the first one passes."""
+        with self._lock:
+            if self._started or not self.replicas:
+                return
+            self._started = True
+            threading.Thread(target=self._run, name="replica-checks", daemon=True).start()
+
+    def _pick(self) -> Optional[Replica]:
+        if not self._started:
+            self.start()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        return healthy[next(self._turn) % len(healthy)] if healthy else None
+
+    def pick_sync(self) -> Optional[Engine]:
+        replica = self._pick()
+        return replica.engine if replica else None
+
+    def pick_async(self) -> Optional[Engine]:
+        replica = self._pick()
+        # AsyncSession binds through the sync engine underneath
+        return replica.async_engine.sync_engine if replica else None
+
+
+def replica_name(url: str) -> str:
+    parsed = make_url(url)
+    return f"{parsed.host or 'local'}/{parsed.database}"
+
+
+class RoutingSession(Session):
+    """
+    Session that can send its reads to a replica. Flushes and DML always go
+    to the primary and pin the session, and the rest of the request, to it,
+    so a handler reads its own writes. Sessions built without a replica
+    picker behave like a plain Session apart from pinning the request.
+    """
+
+    def __init__(self, *args, replicas: Optional[Callable[[], Optional[Engine]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.replica: Optional[Engine] = None
+        self.pinned = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.pinned = True
+            pin_primary()
+        if self.replicas is None or self.pinned or _primary_pinned.get():
+            return primary
+        # One replica for the whole session, so its reads see a single snapshot
+        if self.replica is None:
+            self.replica = self.replicas() or primary
+        return self.replica
@@ -1,9 +1,81 @@
+from typing import List, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.routing import Replica, ReplicaPool, RoutingSession, replica_name
 
-engine = create_engine(settings.database_url, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers to use for each sync dialect when ASYNC_DATABASE_URL is not set
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings from Settings; SQLite's single-file pools take none of them."""
+    options = {"echo": settings.db_echo, "pool_pre_ping": settings.db_pool_pre_ping}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+def _split(urls: Optional[str]) -> List[str]:
+    return [url.strip() for url in (urls or "").split(",") if url.strip()]
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+
+_async_database_url = settings.async_database_url or async_url(settings.database_url)
+async_engine = create_async_engine(_async_database_url, **engine_options(_async_database_url))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replicas: sessions from the Read* factories send their queries to a
+# healthy replica until they write; without replicas they use the primary
+_replica_urls = _split(settings.database_replica_urls)
+_async_replica_urls = _split(settings.async_database_replica_urls) or [async_url(url) for url in _replica_urls]
+if len(_async_replica_urls) != len(_replica_urls):
+    raise ValueError("async_database_replica_urls must list one URL per database_replica_urls entry")
+replicas = ReplicaPool([
+    Replica(
+        name=replica_name(url),
+        engine=create_engine(url, **engine_options(url)),
+        async_engine=create_async_engine(async_replica_url, **engine_options(async_replica_url)),
+    )
+    for url, async_replica_url in zip(_replica_urls, _async_replica_urls)
+])
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession, replicas=replicas.pick_sync
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, replicas=replicas.pick_async,
+    autoflush=False, expire_on_commit=False,
+)
+
+if settings.metrics_enabled:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    for replica in replicas.replicas:
+        instrument_engine(replica.engine)
+        instrument_engine(replica.async_engine.sync_engine)
 
 # Dependency for FastAPI
 def get_db():
@@ -13,3 +85,19 @@ def get_db():
     finally:
         db.close()
 
+# Async dependency for FastAPI
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependencies for GET handlers: reads may be served by a replica
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
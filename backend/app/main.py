@@ -1,7 +1,19 @@
 # backend/app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.agents import router as agents_router
+from app.api.alerts import router as alerts_router
+from app.api.bulk import router as bulk_router
+from app.api.checks import router as checks_router
+from app.api.discovery import router as discovery_router
+from app.api.history import router as history_router
 from app.api.hosts import router as hosts_router
+from app.api.reports import router as reports_router
+from app.api.stream import router as stream_router
+from app.api.topology import router as topology_router
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
 
 app = FastAPI(
     title="Watchdog Monitoring API",
@@ -19,7 +31,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Id", "X-Next-Cursor", "ETag"],
 )
 
-# Include routers
+# Between CORS and metrics, so response size metrics count the bytes actually sent
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Include routers (bulk first so /nodes/bulk is not captured by /nodes/{node_id})
+app.include_router(bulk_router, prefix="/api", tags=["nodes"])
 app.include_router(hosts_router, prefix="/api", tags=["clusters", "nodes"])
+app.include_router(history_router, prefix="/api", tags=["history"])
+app.include_router(reports_router, prefix="/api", tags=["test reports"])
+app.include_router(stream_router, prefix="/api", tags=["stream"])
+app.include_router(alerts_router, prefix="/api", tags=["alerts"])
+app.include_router(agents_router, prefix="/api", tags=["probe agents"])
+app.include_router(checks_router, prefix="/api", tags=["service checks"])
+app.include_router(discovery_router, prefix="/api", tags=["discovery"])
+app.include_router(topology_router, prefix="/api", tags=["topology"])
+
+# Prometheus scrape endpoint; the middleware sits outside CORS so it times the whole request
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
@@ -0,0 +1,62 @@
+# backend/app/models/alerts.py
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, text
+
+from app.db.base import Base
+
+
+class AlertRule(Base):
+    """
+    A per-cluster threshold on one node health metric, e.g. more than 10% of
+    a cluster down for two minutes. Rules without a cluster apply to every
+    cluster.
+    """
+    __tablename__ = "alert_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    metric = Column(String(32), nullable=False)          # down, unreachable or failing_tests
+    cluster_id = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=True)
+    threshold = Column(Float, nullable=False)            # fires while the value is above this
+    ratio = Column(Boolean, nullable=False, default=True)  # value is a fraction of the cluster, else a count
+    clear_threshold = Column(Float, nullable=True)       # resolves at or below this; defaults to threshold
+    for_seconds = Column(Float, nullable=False, default=0)
+    clear_for_seconds = Column(Float, nullable=False, default=0)
+    severity = Column(String(16), nullable=False, default="warning")
+    enabled = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# At most one open alert per rule and cluster
+OPEN = text("state != 'resolved'")
+
+
+class Alert(Base):
+    """One incident of a rule in a cluster, from pending through resolved."""
+    __tablename__ = "alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    rule_id = Column(Integer, ForeignKey("alert_rules.id", ondelete="CASCADE"), nullable=False)
+    cluster_id = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=False)
+    state = Column(String(16), nullable=False, default="pending")   # pending, firing or resolved
+    value = Column(Float, nullable=False)
+    peak_value = Column(Float, nullable=False)
+    pending_since = Column(DateTime, nullable=False)
+    fired_at = Column(DateTime, nullable=True)
+    clear_since = Column(DateTime, nullable=True)
+    resolved_at = Column(DateTime, nullable=True)
+    flaps = Column(Integer, nullable=False, default=0)                # times reopened within the flap window
+    flapping = Column(Boolean, nullable=False, default=False)        # notifications held back
+    notified_state = Column(String(16), nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_alerts_rule_id_cluster_id", "rule_id", "cluster_id"),
+        Index("ix_alerts_cluster_id_id", "cluster_id", "id"),
+        Index(
+            "uq_alerts_open_rule_id_cluster_id", "rule_id", "cluster_id", unique=True,
+            postgresql_where=OPEN, sqlite_where=OPEN,
+        ),
+    )
@@ -0,0 +1,57 @@
+# backend/app/models/checks.py
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, CheckConstraint, Column, DateTime, Float, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class CheckDefinition(Base):
+    """
+    A service check run against every node of a cluster or against a single
+    node. params are validated by the kind's plugin in app.utils.checks.
+    """
+    __tablename__ = "check_definitions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    kind = Column(String(32), nullable=False)                 # tcp, http, tls or ssh_banner
+    cluster_id = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=True)
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=True)
+    params = Column(JSON, nullable=False, default=dict)
+    timeout = Column(Float, nullable=False, default=5.0)      # seconds per check, not counting queueing
+    interval_seconds = Column(Float, nullable=False, default=60.0)
+    enabled = Column(Boolean, nullable=False, default=True)
+    last_run_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Exactly one scope
+        CheckConstraint("(cluster_id IS NULL) != (node_id IS NULL)", name="ck_check_definitions_scope"),
+        Index("ix_check_definitions_cluster_id", "cluster_id"),
+        Index("ix_check_definitions_node_id", "node_id"),
+    )
+
+
+class CheckResult(Base):
+    """
+    The latest outcome of one check on one node. Like the node health
+    columns, rows are rewritten when the outcome changes and otherwise at
+    most once per health_check_resolution window.
+    """
+    __tablename__ = "check_results"
+
+    check_id = Column(Integer, ForeignKey("check_definitions.id", ondelete="CASCADE"), primary_key=True)
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True)
+    ok = Column(Boolean, nullable=False)
+    latency_ms = Column(Float, nullable=True)
+    status_code = Column(Integer, nullable=True)              # HTTP checks
+    error = Column(String(32), nullable=True)
+    detail = Column(String, nullable=True)                    # closed ports, banner, TLS version and expiry
+    checked_at = Column(DateTime, nullable=False)
+    changed_at = Column(DateTime, nullable=False)             # when ok last flipped
+
+    __table_args__ = (
+        Index("ix_check_results_node_id", "node_id"),
+    )
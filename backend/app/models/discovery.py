@@ -0,0 +1,26 @@
+# backend/app/models/discovery.py
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint
+
+from app.db.base import Base
+
+
+class DiscoveryTarget(Base):
+    """A CIDR range swept for hosts, which are registered as nodes of the cluster."""
+    __tablename__ = "discovery_targets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cluster_id = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=False)
+    cidr = Column(String(64), nullable=False)
+    ports = Column(JSON, nullable=False)                     # a host is discovered when any of these accepts
+    interval_seconds = Column(Float, nullable=False, default=3600.0)
+    enabled = Column(Boolean, nullable=False, default=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_stats = Column(JSON, nullable=True)                 # counts from the last sweep
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("cluster_id", "cidr", name="uq_discovery_targets_cluster_id_cidr"),
+    )
@@ -0,0 +1,63 @@
+# backend/app/models/history.py
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String
+from app.db.base import Base
+
+
+class NodeHealthSample(Base):
+    """One raw probe outcome. Append-only, pruned after the raw retention window."""
+    __tablename__ = "node_health_samples"
+
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True)
+    checked_at = Column(DateTime, primary_key=True)
+    up = Column(Boolean, nullable=False)
+    latency_ms = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_node_health_samples_checked_at", "checked_at"),
+    )
+
+
+class NodeHealthRollup(Base):
+    """Downsampled health per node and time bucket at 1m, 1h or 1d resolution."""
+    __tablename__ = "node_health_rollups"
+
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(String(2), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    samples = Column(Integer, nullable=False)
+    up_samples = Column(Integer, nullable=False)
+    transitions = Column(Integer, nullable=False, default=0)
+    latency_sum = Column(Float, nullable=True)
+    latency_max = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_node_health_rollups_resolution_bucket", "resolution", "bucket"),
+    )
+
+
+class HealthRollupWatermark(Base):
+    """How far each resolution has been rolled up, so every source row is counted once."""
+    __tablename__ = "health_rollup_watermarks"
+
+    resolution = Column(String(2), primary_key=True)
+    rolled_until = Column(DateTime, nullable=False)
+
+
+class NodeHealthEvent(Base):
+    """One is_alive / ssh_reachable transition, written by the health writer as it happens."""
+    __tablename__ = "node_health_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False)
+    cluster_id = Column(Integer, nullable=False)
+    occurred_at = Column(DateTime, nullable=False)
+    is_alive = Column(Boolean, nullable=False)
+    ssh_reachable = Column(Boolean, nullable=False)
+    was_alive = Column(Boolean, nullable=True)
+    was_ssh_reachable = Column(Boolean, nullable=True)
+
+    __table_args__ = (
+        Index("ix_node_health_events_node_id_id", "node_id", "id"),
+        Index("ix_node_health_events_cluster_id_id", "cluster_id", "id"),
+        Index("ix_node_health_events_occurred_at", "occurred_at"),
+    )
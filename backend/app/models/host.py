@@ -1,5 +1,5 @@
 # backend/app/models/host.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Index, UniqueConstraint, or_
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -10,6 +10,7 @@ class Cluster(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
+    probe_zone = Column(String, nullable=False, default="default", server_default="default", index=True)   # probe agents of this zone probe it
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -18,6 +19,11 @@ class Cluster(Base):
 
 class Node(Base):
     __tablename__ = "nodes"
+    __table_args__ = (
+        UniqueConstraint("cluster_id", "name", name="uq_nodes_cluster_id_name"),
+        Index("ix_nodes_cluster_id_is_alive", "cluster_id", "is_alive"),
+        Index("ix_nodes_last_health_check", "last_health_check"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -33,6 +39,8 @@ class Node(Base):
     # Health status
     is_alive = Column(Boolean, default=False)
     passing_unit_tests = Column(Boolean, default=True)
+    checks_passing = Column(Boolean, nullable=True)   # every enabled service check passes; None without checks
+    upstream_down = Column(Boolean, nullable=False, default=False)   # not probed: a node it depends on is down
     last_health_check = Column(DateTime, nullable=True)
     
     # Additional attributes
@@ -50,3 +58,38 @@ class Node(Base):
     cluster_id = Column(Integer, ForeignKey("clusters.id"), nullable=False)
     cluster = relationship("Cluster", back_populates="nodes")
 
+# Any health check failing. Queries must use this exact predicate for the
+# partial index below to apply.
+UNHEALTHY = or_(
+    Node.is_alive.isnot(True),
+    Node.ssh_reachable.isnot(True),
+    Node.passing_unit_tests.isnot(True),
+)
+
+Index(
+    "ix_nodes_unhealthy",
+    Node.cluster_id,
+    Node.id,
+    postgresql_where=UNHEALTHY,
+    sqlite_where=UNHEALTHY,
+)
+
+# Fast fleet search, Postgres only: text_pattern_ops serves LIKE 'prefix%' under
+# any collation, pg_trgm GIN indexes serve ILIKE '%substring%'
+Index("ix_nodes_name_pattern", Node.name, postgresql_ops={"name": "text_pattern_ops"}).ddl_if(dialect="postgresql")
+Index("ix_nodes_hostname_pattern", Node.hostname, postgresql_ops={"hostname": "text_pattern_ops"}).ddl_if(
+    dialect="postgresql"
+)
+Index("ix_nodes_ip_address_pattern", Node.ip_address, postgresql_ops={"ip_address": "text_pattern_ops"}).ddl_if(
+    dialect="postgresql"
+)
+Index(
+    "ix_nodes_name_trgm", Node.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_nodes_hostname_trgm", Node.hostname, postgresql_using="gin", postgresql_ops={"hostname": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_nodes_operating_system_trgm", Node.operating_system,
+    postgresql_using="gin", postgresql_ops={"operating_system": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
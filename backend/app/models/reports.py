@@ -0,0 +1,18 @@
+# backend/app/models/reports.py
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer
+from app.db.base import Base
+
+
+class NodeTestSummary(Base):
+    """The latest unit-test report of a node, reduced to counts and total duration."""
+    __tablename__ = "node_test_summaries"
+
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True)
+    reported_at = Column(DateTime, nullable=False)
+    tests = Column(Integer, nullable=False)
+    failures = Column(Integer, nullable=False)
+    errors = Column(Integer, nullable=False)
+    skipped = Column(Integer, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    passed = Column(Boolean, nullable=False)
+    failed_tests = Column(JSON, nullable=True)   # names of the first few failing tests
@@ -0,0 +1,29 @@
+# backend/app/models/topology.py
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, UniqueConstraint
+
+from app.db.base import Base
+
+
+class NodeDependency(Base):
+    """
+    A node, or every node of a cluster, sits behind a parent node such as a
+    load balancer or top-of-rack gateway. While the parent is down its
+    dependents are marked upstream_down instead of being probed.
+    """
+    __tablename__ = "node_dependencies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=True)
+    cluster_id = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=True)
+    parent_node_id = Column(Integer, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Exactly one scope
+        CheckConstraint("(cluster_id IS NULL) != (node_id IS NULL)", name="ck_node_dependencies_scope"),
+        UniqueConstraint("node_id", "parent_node_id", name="uq_node_dependencies_node_id_parent_node_id"),
+        UniqueConstraint("cluster_id", "parent_node_id", name="uq_node_dependencies_cluster_id_parent_node_id"),
+        Index("ix_node_dependencies_parent_node_id", "parent_node_id"),
+    )
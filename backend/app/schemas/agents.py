@@ -0,0 +1,11 @@
+# backend/app/schemas/agents.py
+from pydantic import BaseModel
+
+class ProbeAgent(BaseModel):
+    agent_id: str
+    zone: str
+    host: str
+    started_at: float
+    heartbeat_at: float
+    nodes: int              # nodes probed in the agent's last cycle
+    cycle_seconds: float
@@ -0,0 +1,55 @@
+# backend/app/schemas/alerts.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+from app.services.alerts import AlertMetric
+
+class AlertRuleBase(BaseModel):
+    name: str
+    metric: AlertMetric
+    cluster_id: Optional[int] = None        # None applies the rule to every cluster
+    threshold: float
+    ratio: bool = True                      # threshold is a fraction of the cluster's nodes
+    clear_threshold: Optional[float] = None
+    for_seconds: float = 0
+    clear_for_seconds: float = 0
+    severity: str = "warning"
+    enabled: bool = True
+
+class AlertRuleCreate(AlertRuleBase):
+    pass
+
+class AlertRuleUpdate(BaseModel):
+    name: Optional[str] = None
+    threshold: Optional[float] = None
+    ratio: Optional[bool] = None
+    clear_threshold: Optional[float] = None
+    for_seconds: Optional[float] = None
+    clear_for_seconds: Optional[float] = None
+    severity: Optional[str] = None
+    enabled: Optional[bool] = None
+
+class AlertRule(AlertRuleBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class Alert(BaseModel):
+    id: int
+    rule_id: int
+    cluster_id: int
+    state: str
+    value: float
+    peak_value: float
+    pending_since: datetime
+    fired_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+    flaps: int
+    flapping: bool
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,50 @@
+# backend/app/schemas/checks.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class CheckDefinitionBase(BaseModel):
+    name: str
+    kind: str                                # tcp, http, tls or ssh_banner
+    params: Dict[str, Any] = {}
+    timeout: float = 5.0
+    interval_seconds: float = 60.0
+    enabled: bool = True
+
+class CheckDefinitionCreate(CheckDefinitionBase):
+    cluster_id: Optional[int] = None         # exactly one of cluster_id and node_id
+    node_id: Optional[int] = None
+
+class CheckDefinitionUpdate(BaseModel):
+    name: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    timeout: Optional[float] = None
+    interval_seconds: Optional[float] = None
+    enabled: Optional[bool] = None
+
+class CheckDefinition(CheckDefinitionBase):
+    id: int
+    cluster_id: Optional[int] = None
+    node_id: Optional[int] = None
+    last_run_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CheckResult(BaseModel):
+    check_id: int
+    node_id: int
+    name: str
+    kind: str
+    ok: bool
+    latency_ms: Optional[float] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    detail: Optional[str] = None
+    checked_at: datetime
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
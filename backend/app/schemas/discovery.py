@@ -0,0 +1,29 @@
+# backend/app/schemas/discovery.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class DiscoveryTargetBase(BaseModel):
+    cidr: str                                # e.g. 10.20.0.0/16
+    ports: List[int] = [22]                  # a host is discovered when any of these accepts
+    interval_seconds: float = 3600.0
+    enabled: bool = True
+
+class DiscoveryTargetCreate(DiscoveryTargetBase):
+    cluster_id: int
+
+class DiscoveryTargetUpdate(BaseModel):
+    ports: Optional[List[int]] = None
+    interval_seconds: Optional[float] = None
+    enabled: Optional[bool] = None
+
+class DiscoveryTarget(DiscoveryTargetBase):
+    id: int
+    cluster_id: int
+    last_run_at: Optional[datetime] = None
+    last_stats: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,35 @@
+# backend/app/schemas/history.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class HealthPoint(BaseModel):
+    ts: datetime
+    samples: int
+    up_samples: int
+    transitions: int
+    avg_latency_ms: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+
+class NodeHealthHistory(BaseModel):
+    node_id: int
+    resolution: str
+    start: datetime
+    end: datetime
+    samples: int
+    uptime_ratio: Optional[float] = None
+    transitions: int
+    points: List[HealthPoint] = []
+
+class NodeHealthEvent(BaseModel):
+    id: int
+    node_id: int
+    cluster_id: int
+    occurred_at: datetime
+    is_alive: bool
+    ssh_reachable: bool
+    was_alive: Optional[bool] = None
+    was_ssh_reachable: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
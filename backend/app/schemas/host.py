@@ -33,12 +33,30 @@ class NodeUpdate(BaseModel):
     disk_info: Optional[str] = None
     notes: Optional[str] = None
 
+class NodeBulkUpdate(NodeUpdate):
+    id: int
+
+class NodeBulkDelete(BaseModel):
+    ids: List[int]
+
+class BulkRowError(BaseModel):
+    row: int
+    error: str
+
+class BulkResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    errors: List[BulkRowError] = []
+
 class Node(NodeBase):
     id: int
     cluster_id: int
     ssh_reachable: bool
     is_alive: bool
     passing_unit_tests: bool
+    checks_passing: Optional[bool] = None
+    upstream_down: bool = False
     last_health_check: Optional[datetime]
     created_at: datetime
     updated_at: datetime
@@ -50,17 +68,30 @@ class Node(NodeBase):
 class ClusterBase(BaseModel):
     name: str
     description: Optional[str] = None
+    probe_zone: str = "default"
 
 class ClusterCreate(ClusterBase):
     pass
 
-class Cluster(ClusterBase):
+class ClusterSummary(ClusterBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    nodes: List[Node] = []
 
     class Config:
         from_attributes = True
 
+class Cluster(ClusterSummary):
+    nodes: List[Node] = []
+
+    class Config:
+        from_attributes = True
 
+class ClusterHealthSummary(BaseModel):
+    cluster_id: int
+    name: str
+    total_nodes: int
+    alive_nodes: int
+    ssh_reachable_nodes: int
+    passing_unit_tests_nodes: int
+    oldest_health_check: Optional[datetime] = None
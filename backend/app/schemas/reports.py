@@ -0,0 +1,18 @@
+# backend/app/schemas/reports.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class NodeTestSummary(BaseModel):
+    node_id: int
+    reported_at: datetime
+    tests: int
+    failures: int
+    errors: int
+    skipped: int
+    duration_seconds: float
+    passed: bool
+    failed_tests: Optional[List[str]] = None
+
+    class Config:
+        from_attributes = True
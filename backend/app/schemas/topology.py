@@ -0,0 +1,16 @@
+# backend/app/schemas/topology.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class NodeDependencyCreate(BaseModel):
+    parent_node_id: int                      # e.g. the load balancer or top-of-rack gateway
+    node_id: Optional[int] = None            # exactly one of node_id and cluster_id
+    cluster_id: Optional[int] = None
+
+class NodeDependency(NodeDependencyCreate):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
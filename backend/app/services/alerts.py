@@ -0,0 +1,367 @@
+# backend/app/services/alerts.py
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.alerts import Alert, AlertRule
+from app.models.host import Cluster, Node
+from app.services.nodes import NodeStatus, status_clause
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_KEY = "watchdog:cluster-counters"        # hash: "<cluster_id>:<field>" -> node count, plus synced_at
+DIRTY_KEY = "watchdog:cluster-counters:dirty"     # set: cluster ids to recount, "*" for all of them
+EVAL_LOCK_KEY = "watchdog:alert-eval"
+_ALL = "*"
+_SYNCED_AT = "synced_at"
+
+
+class AlertMetric(str, Enum):
+    down = "down"
+    unreachable = "unreachable"
+    failing_tests = "failing_tests"
+
+
+COUNTER_FIELDS = ("total",) + tuple(metric.value for metric in AlertMetric)
+
+# (cluster_id, was_alive, was_ssh_reachable, is_alive, ssh_reachable)
+HealthMove = Tuple[int, Optional[bool], Optional[bool], Optional[bool], Optional[bool]]
+
+
+def _counts_as(metric: AlertMetric, is_alive: Optional[bool], ssh_reachable: Optional[bool]) -> bool:
+    """Python mirror of status_clause for the fields the health writer changes."""
+    if metric is AlertMetric.down:
+        return is_alive is not True
+    if metric is AlertMetric.unreachable:
+        return is_alive is True and ssh_reachable is not True
+    return False
+
+
+def counter_changes(moves: Iterable[HealthMove]) -> Dict[str, int]:
+    """Per-cluster counter increments for a batch of is_alive / ssh_reachable transitions."""
+    changes: Counter = Counter()
+    for cluster_id, was_alive, was_ssh, alive, ssh in moves:
+        for metric in (AlertMetric.down, AlertMetric.unreachable):
+            change = int(_counts_as(metric, alive, ssh)) - int(_counts_as(metric, was_alive, was_ssh))
+            if change:
+                changes[f"{cluster_id}:{metric.value}"] += change
+    return {key: change for key, change in changes.items() if change}
+
+
+class ClusterCounters:
+    """
+    Per-cluster node counts for each alert metric, kept in Redis.
+
+    The health writer moves them incrementally from transitions, so alert
+    evaluation never scans the nodes table. Other writers (the API, imports)
+    mark the clusters they touched dirty and those are recounted with one
+    grouped query on the next evaluation. Everything is recounted every
+    alert_reconcile_interval to correct drift from races between the two.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def apply(self, moves: Iterable[HealthMove]) -> None:
+        changes = counter_changes(moves)
+        if not changes:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, change in changes.items():
+                pipe.hincrby(COUNTERS_KEY, key, change)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("cluster counter update failed, counts are off until the next reconcile: %s", exc)
+
+    def mark_dirty(self, cluster_ids: Optional[Iterable[int]] = None) -> None:
+        """Recount these clusters, or every cluster when none are given, on the next evaluation."""
+        members = [_ALL] if cluster_ids is None else [str(cluster_id) for cluster_id in cluster_ids]
+        if not members:
+            return
+        try:
+            self.redis.sadd(DIRTY_KEY, *members)
+        except redis.RedisError as exc:
+            logger.warning("could not mark cluster counters dirty: %s", exc)
+
+    async def amark_dirty(self, cluster_ids: Optional[Iterable[int]] = None) -> None:
+        """mark_dirty() for async routes, kept off the event loop."""
+        await run_in_threadpool(self.mark_dirty, None if cluster_ids is None else list(cluster_ids))
+
+    def _recount(self, db: Session, cluster_ids: Optional[Sequence[int]] = None) -> Dict[str, int]:
+        query = select(
+            Node.cluster_id,
+            func.count(Node.id).label("total"),
+            *(
+                func.coalesce(func.sum(case((status_clause(NodeStatus(metric.value)), 1), else_=0)), 0).label(metric.value)
+                for metric in AlertMetric
+            ),
+        ).group_by(Node.cluster_id)
+        if cluster_ids is not None:
+            query = query.where(Node.cluster_id.in_(cluster_ids))
+        # Clusters that lost their last node are written as zeros
+        mapping = {f"{cluster_id}:{field}": 0 for cluster_id in cluster_ids or [] for field in COUNTER_FIELDS}
+        for row in db.execute(query):
+            for field in COUNTER_FIELDS:
+                mapping[f"{row.cluster_id}:{field}"] = int(getattr(row, field))
+        return mapping
+
+    def refresh(self, db: Session, now: Optional[float] = None) -> str:
+        """Recount dirty clusters, or all of them when due; returns "full", "partial" or "none"."""
+        now = now or time.time()
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.smembers(DIRTY_KEY)
+        pipe.delete(DIRTY_KEY)
+        pipe.hget(COUNTERS_KEY, _SYNCED_AT)
+        dirty, _, synced_at = pipe.execute()
+
+        if _ALL in dirty or synced_at is None or now - float(synced_at) >= settings.alert_reconcile_interval:
+            mapping = self._recount(db)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.delete(COUNTERS_KEY)
+            pipe.hset(COUNTERS_KEY, mapping={**mapping, _SYNCED_AT: now})
+            pipe.execute()
+            return "full"
+        if dirty:
+            self.redis.hset(COUNTERS_KEY, mapping=self._recount(db, sorted(int(cluster_id) for cluster_id in dirty)))
+            return "partial"
+        return "none"
+
+    def snapshot(self) -> Dict[int, Dict[str, int]]:
+        counts: Dict[int, Dict[str, int]] = {}
+        for key, value in self.redis.hgetall(COUNTERS_KEY).items():
+            if key == _SYNCED_AT:
+                continue
+            cluster_id, _, field = key.partition(":")
+            counts.setdefault(int(cluster_id), {})[field] = max(0, int(value))
+        return counts
+
+    def eval_lock(self):
+        """Non-blocking lock so overlapping evaluations never open the same alert twice."""
+        return self.redis.lock(EVAL_LOCK_KEY, timeout=max(60, settings.alert_eval_interval * 6), blocking=False)
+
+
+cluster_counters = ClusterCounters()
+
+
+def rule_value(rule: AlertRule, counts: Optional[Dict[str, int]]) -> float:
+    counts = counts or {}
+    affected = counts.get(rule.metric, 0)
+    if not rule.ratio:
+        return float(affected)
+    total = counts.get("total", 0)
+    return affected / total if total else 0.0
+
+
+def _breaching(rule: AlertRule, value: float) -> bool:
+    return value > rule.threshold
+
+
+def _cleared(rule: AlertRule, value: float) -> bool:
+    """Below the clear threshold; the gap up to threshold is the hysteresis band."""
+    return value <= (rule.threshold if rule.clear_threshold is None else rule.clear_threshold)
+
+
+def _open(db: Session, rule: AlertRule, cluster_id: int, value: float, now: datetime, recent: Optional[Alert]) -> Alert:
+    """Start a pending alert, reopening the last one if it resolved within the flap window."""
+    if recent is not None:
+        recent.state = "pending"
+        recent.pending_since = now
+        recent.flaps += 1
+        return recent
+    alert = Alert(
+        rule_id=rule.id, cluster_id=cluster_id, state="pending", value=value, peak_value=value,
+        pending_since=now, flaps=0, flapping=False,
+    )
+    db.add(alert)
+    return alert
+
+
+def _notify(alert: Alert, status: str) -> str:
+    alert.notified_state = status
+    return status
+
+
+def _resolve(db: Session, alert: Alert, now: datetime) -> Optional[str]:
+    if alert.state == "pending":
+        # Never confirmed: a new alert is dropped, a reopened one goes back to resolved
+        if alert.resolved_at is None:
+            db.delete(alert)
+        else:
+            alert.state = "resolved"
+            alert.flaps -= 1
+        return None
+    alert.state = "resolved"
+    alert.resolved_at = now
+    alert.clear_since = None
+    # A flapping alert is announced as resolved once it has stayed resolved
+    return None if alert.flapping else _notify(alert, "resolved")
+
+
+def _step(db: Session, alert: Alert, rule: AlertRule, value: float, now: datetime) -> Optional[str]:
+    """Advance one open alert; returns the status to notify, if any."""
+    alert.value = value
+    alert.peak_value = max(alert.peak_value, value)
+    if alert.state == "pending":
+        if not _breaching(rule, value):
+            return _resolve(db, alert, now)
+        if (now - alert.pending_since).total_seconds() < rule.for_seconds:
+            return None
+        alert.state = "firing"
+        alert.fired_at = now
+        alert.resolved_at = None
+        if alert.flaps < settings.alert_flap_threshold:
+            return _notify(alert, "firing")
+        if alert.flapping:
+            return None
+        alert.flapping = True
+        return _notify(alert, "flapping")
+
+    if not _cleared(rule, value):
+        alert.clear_since = None
+        return None
+    alert.clear_since = alert.clear_since or now
+    if (now - alert.clear_since).total_seconds() < rule.clear_for_seconds:
+        return None
+    return _resolve(db, alert, now)
+
+
+AlertEvent = Tuple[Alert, AlertRule, str]
+
+
+def evaluate(
+    db: Session, counts: Dict[int, Dict[str, int]], now: Optional[datetime] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Run every enabled rule against the per-cluster counters and advance the
+    alert state machine: pending -> firing -> resolved.
+
+    A rule fires once its value has stayed above threshold for for_seconds
+    and resolves once it has stayed at or below clear_threshold for
+    clear_for_seconds. An alert that fires again within alert_flap_window of
+    resolving is reopened rather than duplicated; after alert_flap_threshold
+    reopenings it is marked flapping and only announced again once it has
+    stayed resolved for the window. Returns one grouped notification per
+    cluster with changes, and counts of what happened.
+    """
+    now = now or datetime.utcnow()
+    flap_cutoff = now - timedelta(seconds=settings.alert_flap_window)
+    rules = db.execute(select(AlertRule).where(AlertRule.enabled.is_(True))).scalars().all()
+    open_alerts = {
+        (alert.rule_id, alert.cluster_id): alert
+        for alert in db.execute(select(Alert).where(Alert.state != "resolved")).scalars()
+    }
+    recent = {
+        (alert.rule_id, alert.cluster_id): alert
+        for alert in db.execute(
+            select(Alert).where(Alert.state == "resolved", Alert.resolved_at >= flap_cutoff).order_by(Alert.id)
+        ).scalars()
+    }
+
+    events: List[AlertEvent] = []
+    for rule in rules:
+        if rule.cluster_id is not None:
+            cluster_ids = {rule.cluster_id}
+        else:
+            cluster_ids = set(counts) | {cluster_id for rule_id, cluster_id in open_alerts if rule_id == rule.id}
+        for cluster_id in sorted(cluster_ids):
+            value = rule_value(rule, counts.get(cluster_id))
+            alert = open_alerts.get((rule.id, cluster_id))
+            if alert is None:
+                if not _breaching(rule, value):
+                    continue
+                alert = _open(db, rule, cluster_id, value, now, recent.get((rule.id, cluster_id)))
+            status = _step(db, alert, rule, value, now)
+            if status:
+                events.append((alert, rule, status))
+
+    # Alerts of rules that were disabled since they opened
+    enabled = {rule.id for rule in rules}
+    for alert in open_alerts.values():
+        if alert.rule_id not in enabled:
+            rule = db.get(AlertRule, alert.rule_id)
+            status = _resolve(db, alert, now)
+            if status:
+                events.append((alert, rule, status))
+
+    # Flapping alerts that have finally stayed resolved
+    for alert in db.execute(
+        select(Alert).where(Alert.flapping.is_(True), Alert.state == "resolved", Alert.resolved_at < flap_cutoff)
+    ).scalars():
+        alert.flapping = False
+        events.append((alert, db.get(AlertRule, alert.rule_id), _notify(alert, "resolved")))
+
+    db.flush()
+    notifications = build_notifications(db, events, counts, now)
+    db.commit()
+    stats = Counter(status for _, _, status in events)
+    return notifications, {
+        "rules": len(rules),
+        "firing": stats["firing"],
+        "flapping": stats["flapping"],
+        "resolved": stats["resolved"],
+        "notifications": len(notifications),
+    }
+
+
+def build_notifications(
+    db: Session, events: Sequence[AlertEvent], counts: Dict[int, Dict[str, int]], now: datetime
+) -> List[Dict[str, Any]]:
+    """Group alert events into one notification per cluster, with a sample of affected nodes."""
+    by_cluster: Dict[int, List[AlertEvent]] = {}
+    for event in events:
+        by_cluster.setdefault(event[0].cluster_id, []).append(event)
+    if not by_cluster:
+        return []
+    names = dict(db.execute(select(Cluster.id, Cluster.name).where(Cluster.id.in_(list(by_cluster)))).all())
+
+    samples: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+    notifications = []
+    for cluster_id, cluster_events in sorted(by_cluster.items()):
+        alerts = []
+        for alert, rule, status in cluster_events:
+            entry = {
+                "alert_id": alert.id,
+                "rule_id": rule.id,
+                "rule": rule.name,
+                "metric": rule.metric,
+                "severity": rule.severity,
+                "status": status,
+                "value": alert.value,
+                "peak_value": alert.peak_value,
+                "threshold": rule.threshold,
+                "ratio": rule.ratio,
+                "since": alert.pending_since.isoformat(),
+                "flaps": alert.flaps,
+            }
+            if status != "resolved":
+                key = (cluster_id, rule.metric)
+                if key not in samples:
+                    samples[key] = [
+                        {"id": row.id, "name": row.name}
+                        for row in db.execute(
+                            select(Node.id, Node.name)
+                            .where(Node.cluster_id == cluster_id, status_clause(NodeStatus(rule.metric)))
+                            .order_by(Node.id)
+                            .limit(settings.alert_node_sample)
+                        )
+                    ]
+                entry["nodes"] = samples[key]
+            alerts.append(entry)
+        notifications.append({
+            "cluster_id": cluster_id,
+            "cluster": names.get(cluster_id),
+            "ts": now.isoformat(),
+            "total_nodes": counts.get(cluster_id, {}).get("total", 0),
+            "alerts": alerts,
+        })
+    return notifications
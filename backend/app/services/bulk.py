@@ -0,0 +1,86 @@
+# backend/app/services/bulk.py
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.host import Cluster, Node
+from app.schemas.host import NodeBulkUpdate, NodeCreate
+
+
+def existing_cluster_ids(db: Session, cluster_ids: Iterable[int]) -> Set[int]:
+    """Return the subset of cluster_ids that exist, in one query."""
+    cluster_ids = set(cluster_ids)
+    if not cluster_ids:
+        return set()
+    return set(db.execute(select(Cluster.id).where(Cluster.id.in_(cluster_ids))).scalars())
+
+
+def upsert_nodes(db: Session, records: List[NodeCreate]) -> Tuple[int, int]:
+    """
+    Insert or update nodes keyed on (cluster_id, name).
+
+    One SELECT finds the rows that already exist, then new rows go out as a
+    multi-row INSERT and existing ones as an executemany UPDATE. Within a
+    batch the last record for a key wins. Returns (created, updated).
+    """
+    by_key: Dict[Tuple[int, str], NodeCreate] = {
+        (record.cluster_id, record.name): record for record in records
+    }
+    if not by_key:
+        return 0, 0
+
+    existing = {
+        (row.cluster_id, row.name): row.id
+        for row in db.execute(
+            select(Node.cluster_id, Node.name, Node.id)
+            .where(tuple_(Node.cluster_id, Node.name).in_(list(by_key)))
+        )
+    }
+
+    to_insert = [record.model_dump() for key, record in by_key.items() if key not in existing]
+    # Existing rows only get the fields the record actually set
+    to_update = [
+        {"id": existing[key], **record.model_dump(exclude_unset=True)}
+        for key, record in by_key.items()
+        if key in existing
+    ]
+
+    if to_insert:
+        db.execute(insert(Node), to_insert)
+    update_grouped(db, to_update)
+    db.commit()
+    return len(to_insert), len(to_update)
+
+
+def update_grouped(db: Session, rows: List[dict]) -> None:
+    """Run executemany UPDATEs by primary key, grouping rows that set the same columns."""
+    groups: Dict[Tuple[str, ...], List[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for group in groups.values():
+        db.execute(update(Node), group)
+
+
+def update_nodes(db: Session, records: List[NodeBulkUpdate]) -> Tuple[int, List[int]]:
+    """
+    Apply partial updates by node id with executemany UPDATEs.
+
+    Returns the number of nodes updated and the ids that do not exist.
+    """
+    ids = {record.id for record in records}
+    found = set(db.execute(select(Node.id).where(Node.id.in_(ids))).scalars()) if ids else set()
+
+    rows = [record.model_dump(exclude_unset=True) for record in records if record.id in found]
+    update_grouped(db, rows)
+    db.commit()
+    return len(rows), sorted(ids - found)
+
+
+def delete_nodes(db: Session, ids: List[int]) -> int:
+    """Delete nodes by id in a single statement."""
+    if not ids:
+        return 0
+    result = db.execute(delete(Node).where(Node.id.in_(set(ids))))
+    db.commit()
+    return result.rowcount
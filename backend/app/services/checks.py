@@ -0,0 +1,214 @@
+# backend/app/services/checks.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import and_, case, exists, false, null, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.checks import CheckDefinition, CheckResult
+from app.models.host import Node
+from app.services.events import NodeDelta, make_delta, publish_node_deltas
+from app.services.health import coarsen
+from app.utils.checks import PLUGINS, CheckJob, CheckOutcome
+
+logger = logging.getLogger(__name__)
+
+RUN_LOCK_KEY = "watchdog:checks:run-lock"
+
+_CHUNK_SIZE = 1000
+
+_results = CheckResult.__table__
+_definitions = CheckDefinition.__table__
+_nodes = Node.__table__
+_RESULT_FIELDS = ("ok", "latency_ms", "status_code", "error", "detail", "checked_at", "changed_at")
+
+
+def validate_check(kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized params for a definition; raises ValueError for an unknown kind or bad params."""
+    plugin = PLUGINS.get(kind)
+    if plugin is None:
+        raise ValueError(f"Unknown check kind {kind!r}; expected one of {', '.join(sorted(PLUGINS))}")
+    return plugin.validate(params or {})
+
+
+def run_lock(client: Optional[redis.Redis] = None):
+    """Non-blocking lock so a slow run is never overlapped by the next tick."""
+    client = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return client.lock(RUN_LOCK_KEY, timeout=max(60, int(settings.check_deadline * 2)), blocking=False)
+
+
+def load_due_jobs(db: Session, now: datetime) -> List[CheckJob]:
+    """
+    Expand every enabled definition whose interval has elapsed into one job
+    per node in its scope, and mark those definitions as run.
+    """
+    due = [
+        definition
+        for definition in db.execute(select(CheckDefinition).where(CheckDefinition.enabled.is_(True))).scalars()
+        if definition.last_run_at is None
+        or (now - definition.last_run_at).total_seconds() >= definition.interval_seconds
+    ]
+    if not due:
+        return []
+
+    by_cluster: Dict[int, List[CheckDefinition]] = {}
+    by_node: Dict[int, List[CheckDefinition]] = {}
+    for definition in due:
+        if definition.node_id is not None:
+            by_node.setdefault(definition.node_id, []).append(definition)
+        else:
+            by_cluster.setdefault(definition.cluster_id, []).append(definition)
+
+    columns = (Node.id, Node.cluster_id, Node.ip_address, Node.ssh_port)
+    jobs = []
+    for scope, column, key in ((by_cluster, Node.cluster_id, "cluster_id"), (by_node, Node.id, "id")):
+        keys = sorted(scope)
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            rows = db.execute(
+                select(*columns)
+                .where(column.in_(keys[start:start + _CHUNK_SIZE]), Node.ip_address.isnot(None))
+                .order_by(Node.id)
+            )
+            for row in rows:
+                for definition in scope[getattr(row, key)]:
+                    jobs.append(CheckJob(
+                        check_id=definition.id,
+                        kind=definition.kind,
+                        params=definition.params or {},
+                        timeout=definition.timeout,
+                        node_id=row.id,
+                        cluster_id=row.cluster_id,
+                        address=row.ip_address,
+                        ssh_port=row.ssh_port or 22,
+                    ))
+
+    for definition in due:
+        definition.last_run_at = now
+    db.commit()
+    return jobs
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]]):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(_results).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[_results.c.check_id, _results.c.node_id],
+        set_={name: statement.excluded[name] for name in _RESULT_FIELDS},
+    )
+
+
+def checks_passing_update(node_ids: Sequence[int]):
+    """
+    UPDATE setting nodes.checks_passing from the nodes' results of enabled
+    checks, only where it changes and leaving updated_at alone. RETURNING
+    gives the flipped rows. Works on sync and async sessions alike.
+    """
+    enabled = and_(
+        _results.c.node_id == _nodes.c.id,
+        _definitions.c.id == _results.c.check_id,
+        _definitions.c.enabled.is_(True),
+    )
+    passing = case(
+        (~exists().where(enabled), null()),
+        (exists().where(enabled, _results.c.ok.is_(False)), false()),
+        else_=true(),
+    )
+    return (
+        update(_nodes)
+        .where(_nodes.c.id.in_(node_ids), _nodes.c.checks_passing.is_distinct_from(passing))
+        .values(checks_passing=passing, updated_at=_nodes.c.updated_at)
+        .returning(_nodes.c.id, _nodes.c.cluster_id, _nodes.c.checks_passing)
+    )
+
+
+def checks_passing_deltas(rows, now: datetime) -> List[NodeDelta]:
+    return [make_delta(row.id, row.cluster_id, {"checks_passing": row.checks_passing}, now) for row in rows]
+
+
+@dataclass
+class CheckWriteStats:
+    checked: int = 0
+    passed: int = 0
+    changed: int = 0          # results whose ok flipped, including first results
+    written: int = 0          # result rows upserted
+    nodes_flipped: int = 0    # nodes whose checks_passing changed
+
+
+def write_check_results(
+    db: Session, jobs: Sequence[CheckJob], outcomes: Sequence[CheckOutcome], checked_at: datetime
+) -> CheckWriteStats:
+    """
+    Store check outcomes, writing only what changed.
+
+    A result row is rewritten when ok, the error class or the HTTP status
+    differs from the stored one, and otherwise once per
+    health_check_resolution window. Nodes with a flipped result get
+    checks_passing recomputed; the flips are published to the live stream.
+    """
+    stats = CheckWriteStats(checked=len(jobs), passed=sum(1 for outcome in outcomes if outcome.ok))
+    if not jobs:
+        return stats
+    window = coarsen(checked_at)
+
+    check_ids = sorted({job.check_id for job in jobs})
+    stored: Dict[Tuple[int, int], Any] = {}
+    for start in range(0, len(check_ids), _CHUNK_SIZE):
+        for row in db.execute(
+            select(
+                CheckResult.check_id, CheckResult.node_id, CheckResult.ok, CheckResult.error,
+                CheckResult.status_code, CheckResult.checked_at, CheckResult.changed_at,
+            ).where(CheckResult.check_id.in_(check_ids[start:start + _CHUNK_SIZE]))
+        ):
+            stored[(row.check_id, row.node_id)] = row
+
+    rows, flipped_nodes = [], set()
+    changed = 0
+    for job, outcome in zip(jobs, outcomes):
+        previous = stored.get((job.check_id, job.node_id))
+        flipped = previous is None or previous.ok != outcome.ok
+        if not flipped and (previous.error, previous.status_code) == (outcome.error, outcome.status_code) \
+                and previous.checked_at >= window:
+            continue
+        if flipped:
+            changed += 1
+            flipped_nodes.add(job.node_id)
+        rows.append({
+            "check_id": job.check_id,
+            "node_id": job.node_id,
+            "ok": outcome.ok,
+            "latency_ms": outcome.latency_ms,
+            "status_code": outcome.status_code,
+            "error": outcome.error,
+            "detail": outcome.detail,
+            "checked_at": checked_at,
+            "changed_at": checked_at if flipped else previous.changed_at,
+        })
+
+    # Nodes deleted since the jobs were loaded would fail the foreign key
+    node_ids = sorted({row["node_id"] for row in rows})
+    existing = set()
+    for start in range(0, len(node_ids), _CHUNK_SIZE):
+        existing.update(db.execute(select(Node.id).where(Node.id.in_(node_ids[start:start + _CHUNK_SIZE]))).scalars())
+    rows = [row for row in rows if row["node_id"] in existing]
+    for start in range(0, len(rows), _CHUNK_SIZE):
+        db.execute(_upsert(db, rows[start:start + _CHUNK_SIZE]))
+
+    nodes = sorted(flipped_nodes & existing)
+    flipped_rows = []
+    for start in range(0, len(nodes), _CHUNK_SIZE):
+        flipped_rows.extend(db.execute(checks_passing_update(nodes[start:start + _CHUNK_SIZE])).all())
+    db.commit()
+
+    if flipped_rows:
+        cache.invalidate("nodes")
+        publish_node_deltas(checks_passing_deltas(flipped_rows, checked_at))
+    stats.changed = changed
+    stats.written = len(rows)
+    stats.nodes_flipped = len(flipped_rows)
+    return stats
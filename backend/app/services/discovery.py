@@ -0,0 +1,166 @@
+# backend/app/services/discovery.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache, node_namespaces
+from app.core.config import settings
+from app.models.discovery import DiscoveryTarget
+from app.models.host import Node
+from app.services.alerts import cluster_counters
+from app.services.bulk import update_grouped
+from app.utils.discovery import DiscoveredHost, parse_network
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "watchdog:discovery:lock"
+_LOCK_TIMEOUT = 3600   # a /16 at the default rate takes a few minutes; this only guards a crashed worker
+
+_CHUNK_SIZE = 1000
+MAX_PORTS = 16
+
+
+def validate_target(cidr: str, ports: Sequence[int]) -> Tuple[str, List[int]]:
+    """Normalized (cidr, ports); raises ValueError."""
+    network = parse_network(cidr, settings.discovery_max_addresses)
+    if not ports or len(ports) > MAX_PORTS:
+        raise ValueError(f"ports must list 1 to {MAX_PORTS} port numbers")
+    if any(isinstance(port, bool) or not isinstance(port, int) or not 0 < port < 65536 for port in ports):
+        raise ValueError("ports must be TCP port numbers")
+    return str(network), list(dict.fromkeys(ports))
+
+
+def discovery_lock(client: Optional[redis.Redis] = None):
+    """Non-blocking lock so only one worker sweeps at a time."""
+    client = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return client.lock(LOCK_KEY, timeout=_LOCK_TIMEOUT, blocking=False)
+
+
+@dataclass
+class DueTarget:
+    """A claimed target as plain values, so no session has to stay open through its sweep."""
+    id: int
+    cluster_id: int
+    cidr: str
+    ports: List[int]
+
+
+def claim_due_targets(db: Session, now: datetime) -> List[DueTarget]:
+    """Enabled targets whose interval has elapsed, marked as run."""
+    due = [
+        target
+        for target in db.execute(
+            select(DiscoveryTarget).where(DiscoveryTarget.enabled.is_(True)).order_by(DiscoveryTarget.id)
+        ).scalars()
+        if target.last_run_at is None or (now - target.last_run_at).total_seconds() >= target.interval_seconds
+    ]
+    claimed = [DueTarget(target.id, target.cluster_id, target.cidr, list(target.ports)) for target in due]
+    for target in due:
+        target.last_run_at = now
+    db.commit()
+    return claimed
+
+
+def record_stats(db: Session, target_id: int, stats: dict) -> None:
+    db.execute(update(DiscoveryTarget).where(DiscoveryTarget.id == target_id).values(last_stats=stats))
+    db.commit()
+
+
+@dataclass
+class DiscoveryStats:
+    found: int = 0
+    created: int = 0
+    updated: int = 0       # existing nodes whose hostname changed
+    unchanged: int = 0
+    elsewhere: int = 0     # addresses already registered in another cluster
+    skipped: int = 0       # no free node name
+
+
+def _short_name(hostname: Optional[str]) -> Optional[str]:
+    return hostname.split(".", 1)[0] if hostname else None
+
+
+def apply_discovered(db: Session, cluster_id: int, hosts: Sequence[DiscoveredHost]) -> DiscoveryStats:
+    """
+    Register discovered hosts as nodes of the cluster, writing only what changed.
+
+    Addresses are looked up on the ip_address index in chunks. Known nodes
+    of this cluster only get their hostname updated when reverse DNS found a
+    different one; addresses registered in another cluster are left alone.
+    New hosts go out as multi-row INSERTs, named after their short hostname,
+    or their address when that name is taken in the cluster.
+    """
+    stats = DiscoveryStats(found=len(hosts))
+    if not hosts:
+        return stats
+
+    by_address = {host.address: host for host in hosts}
+    known: Dict[str, Tuple[int, int, Optional[str]]] = {}
+    ips = list(by_address)
+    for start in range(0, len(ips), _CHUNK_SIZE):
+        rows = db.execute(
+            select(Node.id, Node.cluster_id, Node.ip_address, Node.hostname)
+            .where(Node.ip_address.in_(ips[start:start + _CHUNK_SIZE]))
+        )
+        for row in rows:
+            # A node in this cluster wins over one elsewhere with the same address
+            if row.ip_address not in known or row.cluster_id == cluster_id:
+                known[row.ip_address] = (row.id, row.cluster_id, row.hostname)
+
+    updates, new_hosts = [], []
+    for address, host in by_address.items():
+        if address not in known:
+            new_hosts.append(host)
+            continue
+        node_id, node_cluster_id, hostname = known[address]
+        if node_cluster_id != cluster_id:
+            stats.elsewhere += 1
+        elif host.hostname and host.hostname != hostname:
+            updates.append({"id": node_id, "hostname": host.hostname})
+        else:
+            stats.unchanged += 1
+
+    candidates = sorted({name for host in new_hosts for name in (_short_name(host.hostname), host.address) if name})
+    taken = set()
+    for start in range(0, len(candidates), _CHUNK_SIZE):
+        taken.update(db.execute(
+            select(Node.name).where(Node.cluster_id == cluster_id, Node.name.in_(candidates[start:start + _CHUNK_SIZE]))
+        ).scalars())
+
+    now = datetime.utcnow()
+    inserts = []
+    for host in new_hosts:
+        name = next((name for name in (_short_name(host.hostname), host.address) if name and name not in taken), None)
+        if name is None:
+            stats.skipped += 1
+            continue
+        taken.add(name)
+        inserts.append({
+            "cluster_id": cluster_id,
+            "name": name,
+            "ip_address": host.address,
+            "hostname": host.hostname,
+            # It just answered, so it starts out alive rather than waiting for the next probe
+            "is_alive": True,
+            "ssh_reachable": 22 in host.open_ports,
+            "last_health_check": now,
+            "notes": f"Discovered with open ports {', '.join(map(str, host.open_ports))}",
+        })
+
+    for start in range(0, len(inserts), _CHUNK_SIZE):
+        db.execute(insert(Node), inserts[start:start + _CHUNK_SIZE])
+    update_grouped(db, updates)
+    db.commit()
+
+    stats.created = len(inserts)
+    stats.updated = len(updates)
+    if inserts or updates:
+        cache.invalidate("clusters", "nodes", *node_namespaces(row["id"] for row in updates))
+    if inserts:
+        cluster_counters.mark_dirty([cluster_id])
+    return stats
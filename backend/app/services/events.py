@@ -0,0 +1,63 @@
+# backend/app/services/events.py
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+
+@dataclass
+class NodeDelta:
+    """A change to one node's health fields, as pushed to stream subscribers."""
+    node_id: int
+    cluster_id: int
+    changes: Dict[str, Any]
+    ts: str
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _client
+
+
+def make_delta(node_id: int, cluster_id: int, changes: Dict[str, Any], ts: datetime) -> NodeDelta:
+    return NodeDelta(node_id=node_id, cluster_id=cluster_id, changes=changes, ts=ts.isoformat())
+
+
+def publish_node_deltas(deltas: Sequence[NodeDelta]) -> None:
+    """
+    Append deltas to the Redis event stream in one pipeline.
+
+    Publishing is best effort: a Redis outage is logged and never fails the
+    health write that produced the deltas.
+    """
+    if not deltas:
+        return
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        for delta in deltas:
+            pipe.xadd(
+                settings.event_stream_key,
+                {"data": json.dumps(asdict(delta))},
+                maxlen=settings.event_stream_maxlen,
+                approximate=True,
+            )
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("could not publish %d node deltas: %s", len(deltas), exc)
+
+
+def parse_stream_id(stream_id: str) -> Tuple[int, int]:
+    """Split a Redis stream id ("<ms>-<seq>") into a comparable tuple."""
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
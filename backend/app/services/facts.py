@@ -0,0 +1,193 @@
+# backend/app/services/facts.py
+import asyncio
+import json
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache, node_namespaces
+from app.core.config import settings
+from app.models.host import Node
+from app.services.bulk import update_grouped
+from app.utils.ssh import SSHPool, SSHTarget
+
+FACT_COLUMNS = ("operating_system", "cpu_info", "memory_info", "disk_info")
+
+_MARKER = "__watchdog__"
+
+# All facts come from one exec per node, split into sections by a marker line
+FACT_COMMAND = f"; echo {_MARKER}; ".join([
+    "grep -m1 '^PRETTY_NAME=' /etc/os-release 2>/dev/null",
+    "uname -srm",
+    "grep -m1 'model name' /proc/cpuinfo; grep -c '^processor' /proc/cpuinfo",
+    "grep -m1 MemTotal /proc/meminfo",
+    "df -hP / | tail -1",
+])
+
+
+def parse_facts(output: str) -> Dict[str, Optional[str]]:
+    """Turn FACT_COMMAND output into values for the Node fact columns."""
+    sections = [section.strip() for section in output.split(_MARKER)]
+    sections += [""] * (5 - len(sections))
+    os_release, uname, cpu, mem, disk = sections[:5]
+
+    operating_system = None
+    if os_release.startswith("PRETTY_NAME="):
+        operating_system = os_release.split("=", 1)[1].strip().strip('"')
+    if uname:
+        operating_system = f"{operating_system} ({uname})" if operating_system else uname
+
+    cpu_info = None
+    cpu_lines = cpu.splitlines()
+    if cpu_lines:
+        count = cpu_lines[-1].strip()
+        model = cpu_lines[0].split(":", 1)[1].strip() if len(cpu_lines) > 1 and ":" in cpu_lines[0] else None
+        cpu_info = f"{count} x {model}" if model else f"{count} cores"
+
+    memory_info = None
+    if mem:
+        kilobytes = int(mem.split()[1])
+        memory_info = f"{kilobytes / 1024 / 1024:.1f} GiB"
+
+    disk_info = None
+    disk_fields = disk.split()
+    if len(disk_fields) >= 6:
+        disk_info = f"{disk_fields[5]}: {disk_fields[2]} used of {disk_fields[1]} ({disk_fields[4]})"
+
+    return {
+        "operating_system": operating_system,
+        "cpu_info": cpu_info,
+        "memory_info": memory_info,
+        "disk_info": disk_info,
+    }
+
+
+def build_pool() -> SSHPool:
+    return SSHPool(
+        max_connections=settings.ssh_pool_size,
+        idle_timeout=settings.ssh_idle_timeout,
+        connect_timeout=settings.ssh_connect_timeout,
+        password=settings.ssh_password,
+        known_hosts=None if settings.ssh_disable_host_key_check else settings.ssh_known_hosts or (),
+    )
+
+
+async def collect_facts(
+    pool: SSHPool, targets: List[Tuple[int, SSHTarget]], concurrency: int
+) -> Dict[int, Union[Dict[str, Optional[str]], Exception]]:
+    """Run the fact command on every target over pooled sessions."""
+    # Pooled nodes first: they are reused before new connections push them out of the LRU
+    targets = sorted(targets, key=lambda item: item[0] not in pool)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(node_id: int, target: SSHTarget):
+        async with semaphore:
+            output = await pool.run(node_id, target, FACT_COMMAND, timeout=settings.ssh_command_timeout)
+            return parse_facts(output)
+
+    outcomes = await asyncio.gather(*(one(node_id, target) for node_id, target in targets), return_exceptions=True)
+    await pool.close_idle()
+    return {node_id: outcome for (node_id, _), outcome in zip(targets, outcomes)}
+
+
+class FactCollector:
+    """
+    Keeps an SSH pool alive between Celery task runs.
+
+    asyncssh connections belong to the event loop that opened them, so the pool
+    lives on one background loop per worker process and each task submits its
+    batch to that loop instead of calling asyncio.run().
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Optional[SSHPool] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._pool = build_pool()
+                threading.Thread(target=self._loop.run_forever, name="fact-collector", daemon=True).start()
+            return self._loop
+
+    def collect(self, targets: List[Tuple[int, SSHTarget]], concurrency: int):
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(collect_facts(self._pool, targets, concurrency), loop).result()
+
+
+collector = FactCollector()
+
+
+def load_fact_targets(db: Session) -> List[Tuple[int, SSHTarget]]:
+    """Every node with an address, as plain (node_id, SSHTarget) pairs that outlive the session."""
+    rows = db.execute(
+        select(Node.id, Node.ip_address, Node.hostname, Node.ssh_port, Node.ssh_username, Node.ssh_key_path)
+        .where(Node.ip_address.isnot(None) | Node.hostname.isnot(None))
+        .order_by(Node.id)
+    ).all()
+    return [
+        (
+            row.id,
+            SSHTarget(
+                host=row.ip_address or row.hostname,
+                port=row.ssh_port or 22,
+                username=row.ssh_username or settings.ssh_default_username,
+                key_path=row.ssh_key_path,
+            ),
+        )
+        for row in rows
+    ]
+
+
+def write_changed_facts(db: Session, facts: Dict[int, Dict[str, Optional[str]]]) -> int:
+    """Update only the fact columns that differ from what is stored. Returns rows touched."""
+    if not facts:
+        return 0
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(Node.id, *(getattr(Node, column) for column in FACT_COLUMNS)).where(Node.id.in_(list(facts)))
+        )
+    }
+    rows = []
+    for node_id, values in facts.items():
+        row = current.get(node_id)
+        if row is None:
+            continue
+        changed = {
+            column: value
+            for column, value in values.items()
+            if value is not None and getattr(row, column) != value
+        }
+        if changed:
+            rows.append({"id": node_id, **changed})
+    update_grouped(db, rows)
+    db.commit()
+    if rows:
+        cache.invalidate("clusters", *node_namespaces(row["id"] for row in rows))
+    return len(rows)
+
+
+async def _main(hosts: List[str]) -> None:
+    pool = build_pool()
+    targets = []
+    for index, spec in enumerate(hosts):
+        host, _, port = spec.partition(":")
+        targets.append((index, SSHTarget(host=host, port=int(port or 22), username=settings.ssh_default_username)))
+    try:
+        results = await collect_facts(pool, targets, settings.fact_collection_concurrency)
+    finally:
+        await pool.close()
+    for (_, target), (_, outcome) in zip(targets, sorted(results.items())):
+        value = outcome if isinstance(outcome, dict) else {"error": repr(outcome)}
+        print(json.dumps({"host": f"{target.host}:{target.port}", **value}))
+
+
+if __name__ == "__main__":
+    # e.g. SSH_PASSWORD=password123 SSH_DISABLE_HOST_KEY_CHECK=true python -m app.services.facts localhost:2221 localhost:2222
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,278 @@
+# backend/app/services/health.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.history import NodeHealthEvent
+from app.models.host import Node
+from app.services.alerts import cluster_counters
+from app.services.events import make_delta, publish_node_deltas
+from app.services.history import record_samples
+from app.utils.health import DEADLINE, ProbeResult
+
+logger = logging.getLogger(__name__)
+
+# (node_id, ip_address, ssh_port)
+ProbeTarget = Tuple[int, str, int]
+
+STATE_KEY = "watchdog:node-health"   # hash: node id -> NodeState.encode()
+
+_nodes = Node.__table__
+
+# Health-only writes leave updated_at alone: it tracks edits to the node, and
+# Node.updated_at's onupdate would otherwise fire on every transition
+_TRANSITION_UPDATE = (
+    update(_nodes)
+    .where(_nodes.c.id == bindparam("node_id"))
+    .values(
+        is_alive=bindparam("alive"),
+        ssh_reachable=bindparam("ssh"),
+        last_health_check=bindparam("checked"),
+        updated_at=_nodes.c.updated_at,
+    )
+)
+
+_CHUNK_SIZE = 5000
+
+
+def shard_bounds(db: Session, shard_size: int) -> List[Tuple[int, int]]:
+    """Split the node table into inclusive (first_id, last_id) ranges of about shard_size nodes."""
+    ids = db.execute(select(Node.id).order_by(Node.id)).scalars().all()
+    return [
+        (ids[i], ids[min(i + shard_size, len(ids)) - 1])
+        for i in range(0, len(ids), shard_size)
+    ]
+
+
+def load_targets(db: Session, first_id: int, last_id: int) -> List[ProbeTarget]:
+    """Fetch the probe targets for one shard of the node table."""
+    rows = db.execute(
+        select(Node.id, Node.ip_address, Node.ssh_port)
+        .where(Node.id.between(first_id, last_id), Node.ip_address.isnot(None))
+        .order_by(Node.id)
+    ).all()
+    return [(row.id, row.ip_address, row.ssh_port or 22) for row in rows]
+
+
+def load_targets_by_id(db: Session, node_ids: Sequence[int]):
+    """Fetch id, cluster_id, ip_address and ssh_port for specific nodes."""
+    if not node_ids:
+        return []
+    return db.execute(
+        select(Node.id, Node.cluster_id, Node.ip_address, Node.ssh_port).where(Node.id.in_(node_ids))
+    ).all()
+
+
+@dataclass
+class NodeState:
+    """What the nodes table holds for one node's health, as last written."""
+    cluster_id: int
+    is_alive: Optional[bool]
+    ssh_reachable: Optional[bool]
+    last_health_check: Optional[datetime]
+
+    def encode(self) -> str:
+        checked = self.last_health_check.isoformat() if self.last_health_check else ""
+        return f"{self.cluster_id}|{_flag(self.is_alive)}|{_flag(self.ssh_reachable)}|{checked}"
+
+    @classmethod
+    def decode(cls, raw: str) -> "NodeState":
+        cluster_id, alive, ssh, checked = raw.split("|", 3)
+        return cls(
+            cluster_id=int(cluster_id),
+            is_alive=_unflag(alive),
+            ssh_reachable=_unflag(ssh),
+            last_health_check=datetime.fromisoformat(checked) if checked else None,
+        )
+
+
+def _flag(value: Optional[bool]) -> str:
+    return "" if value is None else str(int(value))
+
+
+def _unflag(raw: str) -> Optional[bool]:
+    return None if raw == "" else raw == "1"
+
+
+class NodeStateCache:
+    """
+    Last-known node health in a Redis hash shared by every worker, so the
+    writer can detect transitions without reading the nodes table. Misses
+    (and a Redis outage) fall back to the database.
+
+    The writer evicts the nodes it is about to change before committing, so
+    a failed update afterwards leaves a miss rather than a stale state. If
+    the eviction itself fails, the whole hash is dropped before this cache
+    is trusted again.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self._suspect = False     # an eviction failed; entries may be stale
+
+    def _reset(self) -> bool:
+        try:
+            self.redis.delete(STATE_KEY)
+        except redis.RedisError:
+            return False
+        logger.info("node state cache dropped after a failed eviction")
+        self._suspect = False
+        return True
+
+    def get(self, node_ids: Sequence[int]) -> Dict[int, NodeState]:
+        if not node_ids:
+            return {}
+        if self._suspect and not self._reset():
+            return {}
+        try:
+            values = self.redis.hmget(STATE_KEY, [str(node_id) for node_id in node_ids])
+        except redis.RedisError as exc:
+            logger.warning("node state lookup failed, reading from the database: %s", exc)
+            return {}
+        return {node_id: NodeState.decode(raw) for node_id, raw in zip(node_ids, values) if raw}
+
+    def put(self, states: Dict[int, NodeState]) -> None:
+        if not states:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(STATE_KEY, mapping={str(node_id): state.encode() for node_id, state in states.items()})
+            pipe.expire(STATE_KEY, int(settings.health_state_ttl))
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("node state update failed: %s", exc)
+
+    def forget(self, node_ids: Iterable[int]) -> None:
+        keys = [str(node_id) for node_id in node_ids]
+        if not keys:
+            return
+        try:
+            self.redis.hdel(STATE_KEY, *keys)
+        except redis.RedisError as exc:
+            logger.warning("node state eviction failed, dropping the cache: %s", exc)
+            self._suspect = True
+
+
+state_cache = NodeStateCache()
+
+
+def coarsen(checked_at: datetime) -> datetime:
+    """Floor a check time to the health_check_resolution window."""
+    step = max(1, int(settings.health_check_resolution))
+    epoch = datetime(1970, 1, 1)
+    seconds = int((checked_at - epoch).total_seconds())
+    return epoch + timedelta(seconds=seconds - seconds % step)
+
+
+def _load_states(db: Session, node_ids: Sequence[int]) -> Dict[int, NodeState]:
+    states = {}
+    for start in range(0, len(node_ids), _CHUNK_SIZE):
+        rows = db.execute(
+            select(Node.id, Node.cluster_id, Node.is_alive, Node.ssh_reachable, Node.last_health_check)
+            .where(Node.id.in_(node_ids[start:start + _CHUNK_SIZE]))
+        )
+        for row in rows:
+            states[row.id] = NodeState(row.cluster_id, row.is_alive, row.ssh_reachable, row.last_health_check)
+    return states
+
+
+@dataclass
+class HealthWriteStats:
+    probed: int = 0
+    transitions: int = 0      # rows whose is_alive / ssh_reachable flipped
+    refreshed: int = 0        # rows that only had last_health_check moved forward
+
+
+def write_probe_results(
+    db: Session,
+    results: Sequence[Tuple[int, ProbeResult]],
+    checked_at: Optional[datetime] = None,
+    states: Optional[NodeStateCache] = None,
+) -> HealthWriteStats:
+    """
+    Persist a batch of probe results, writing only what changed.
+
+    Results are compared with the last-known state (Redis, falling back to the
+    nodes table). Nodes whose is_alive / ssh_reachable flipped get one
+    executemany UPDATE and a node_health_events row each, and are published to
+    the live stream and the alerting counters once the transaction commits.
+    Every other node only has last_health_check moved forward, to the start
+    of the current health_check_resolution window, and only once per window,
+    as a single UPDATE ... WHERE id IN (...). Raw history samples are still
+    appended for every result. Results cut off by the probe deadline say
+    nothing about the node and are dropped, leaving its state untouched.
+    """
+    stats = HealthWriteStats()
+    results = [(node_id, result) for node_id, result in results if result.error != DEADLINE]
+    if not results:
+        return stats
+    checked_at = checked_at or datetime.utcnow()
+    window = coarsen(checked_at)
+    states = states or state_cache
+
+    node_ids = [node_id for node_id, _ in results]
+    known = states.get(node_ids)
+    missing = [node_id for node_id in node_ids if node_id not in known]
+    if missing:
+        known.update(_load_states(db, missing))
+    # Nodes deleted since their targets were loaded are dropped entirely
+    results = [(node_id, result) for node_id, result in results if node_id in known]
+    stats.probed = len(results)
+
+    transitions, events, deltas, moves, refresh = [], [], [], [], []
+    updated: Dict[int, NodeState] = {}
+    for node_id, result in results:
+        previous = known[node_id]
+        changes = {
+            field: result.alive
+            for field in ("is_alive", "ssh_reachable")
+            if getattr(previous, field) != result.alive
+        }
+        if changes:
+            transitions.append({"node_id": node_id, "alive": result.alive, "ssh": result.alive, "checked": checked_at})
+            events.append({
+                "node_id": node_id,
+                "cluster_id": previous.cluster_id,
+                "occurred_at": checked_at,
+                "is_alive": result.alive,
+                "ssh_reachable": result.alive,
+                "was_alive": previous.is_alive,
+                "was_ssh_reachable": previous.ssh_reachable,
+            })
+            deltas.append(make_delta(node_id, previous.cluster_id, changes, checked_at))
+            moves.append((previous.cluster_id, previous.is_alive, previous.ssh_reachable, result.alive, result.alive))
+            updated[node_id] = NodeState(previous.cluster_id, result.alive, result.alive, checked_at)
+        elif previous.last_health_check is None or previous.last_health_check < window:
+            refresh.append(node_id)
+            updated[node_id] = NodeState(previous.cluster_id, previous.is_alive, previous.ssh_reachable, window)
+
+    if transitions:
+        db.execute(_TRANSITION_UPDATE, transitions)
+        db.execute(insert(NodeHealthEvent), events)
+    for start in range(0, len(refresh), _CHUNK_SIZE):
+        db.execute(
+            update(_nodes)
+            .where(_nodes.c.id.in_(refresh[start:start + _CHUNK_SIZE]))
+            .values(last_health_check=window, updated_at=_nodes.c.updated_at)
+        )
+    record_samples(db, results, checked_at)
+    # Evict transitions first: if the put below fails, the next write reads them from the database
+    states.forget(row["node_id"] for row in transitions)
+    db.commit()
+
+    # Seed the cache with unchanged nodes that had to be read from the database
+    states.put({**{node_id: known[node_id] for node_id in missing if node_id in known}, **updated})
+    if updated:
+        cache.invalidate("nodes")
+    publish_node_deltas(deltas)
+    cluster_counters.apply(moves)
+    stats.transitions = len(transitions)
+    stats.refreshed = len(refresh)
+    return stats
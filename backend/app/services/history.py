@@ -0,0 +1,285 @@
+# backend/app/services/history.py
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.history import HealthRollupWatermark, NodeHealthEvent, NodeHealthRollup, NodeHealthSample
+from app.utils.health import ProbeResult
+
+RAW = "raw"
+RESOLUTIONS = ("1m", "1h", "1d")
+
+_UNITS = {"1m": "minute", "1h": "hour", "1d": "day"}
+_SOURCES = {"1m": RAW, "1h": "1m", "1d": "1h"}
+
+# Widest range served from each resolution when the caller asks for "auto"
+_AUTO_SPANS = [
+    (RAW, timedelta(hours=6)),
+    ("1m", timedelta(days=3)),
+    ("1h", timedelta(days=60)),
+]
+
+
+def _retention(resolution: str) -> timedelta:
+    days = {
+        RAW: settings.history_raw_retention_days,
+        "1m": settings.history_1m_retention_days,
+        "1h": settings.history_1h_retention_days,
+        "1d": settings.history_1d_retention_days,
+    }[resolution]
+    return timedelta(days=days)
+
+
+def _truncate(ts: datetime, resolution: str) -> datetime:
+    if resolution == "1m":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def record_samples(
+    db: Session, results: Sequence[Tuple[int, ProbeResult]], checked_at: datetime
+) -> None:
+    """Append one raw sample per probe result as a multi-row INSERT. The caller commits."""
+    if not results:
+        return
+    db.execute(
+        insert(NodeHealthSample),
+        [
+            {"node_id": node_id, "checked_at": checked_at, "up": result.alive, "latency_ms": result.latency_ms}
+            for node_id, result in results
+        ],
+    )
+
+
+def _watermark(db: Session, resolution: str) -> Optional[datetime]:
+    return db.execute(
+        select(HealthRollupWatermark.rolled_until).where(HealthRollupWatermark.resolution == resolution)
+    ).scalar()
+
+
+def _raw_rollup_select(lo: datetime, hi: datetime):
+    # The window starts before lo so the first sample of the range is compared
+    # with the node's previous one, counting a flip that spans two runs
+    seed = lo - timedelta(seconds=settings.history_transition_lookback_seconds)
+    window = (
+        select(
+            NodeHealthSample.node_id,
+            NodeHealthSample.checked_at,
+            NodeHealthSample.up,
+            NodeHealthSample.latency_ms,
+            func.lag(NodeHealthSample.up)
+            .over(partition_by=NodeHealthSample.node_id, order_by=NodeHealthSample.checked_at)
+            .label("previous_up"),
+        )
+        .where(NodeHealthSample.checked_at >= seed, NodeHealthSample.checked_at < hi)
+        .subquery()
+    )
+    bucket = func.date_trunc("minute", window.c.checked_at)
+    return (
+        select(
+            window.c.node_id,
+            literal("1m"),
+            bucket,
+            func.count(),
+            func.sum(case((window.c.up.is_(True), 1), else_=0)),
+            func.sum(case((window.c.up != window.c.previous_up, 1), else_=0)),
+            func.sum(window.c.latency_ms),
+            func.max(window.c.latency_ms),
+        )
+        .where(window.c.checked_at >= lo)
+        .group_by(window.c.node_id, bucket)
+    )
+
+
+def _rollup_rollup_select(resolution: str, lo: datetime, hi: datetime):
+    source = NodeHealthRollup
+    bucket = func.date_trunc(_UNITS[resolution], source.bucket)
+    return (
+        select(
+            source.node_id,
+            literal(resolution),
+            bucket,
+            func.sum(source.samples),
+            func.sum(source.up_samples),
+            func.sum(source.transitions),
+            func.sum(source.latency_sum),
+            func.max(source.latency_max),
+        )
+        .where(source.resolution == _SOURCES[resolution], source.bucket >= lo, source.bucket < hi)
+        .group_by(source.node_id, bucket)
+    )
+
+
+def rollup(db: Session, resolution: str, now: Optional[datetime] = None) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Aggregate every closed bucket since the last run into `resolution` rollups.
+
+    Buckets are closed once the source data is complete: raw samples after a
+    grace period for late writes, rollups once the finer resolution has moved
+    past them. The insert and the watermark move in one transaction, so each
+    source row is counted exactly once. Returns the rolled (lo, hi) range.
+    """
+    now = now or datetime.utcnow()
+    source = _SOURCES[resolution]
+    if source == RAW:
+        hi = _truncate(now - timedelta(seconds=settings.history_rollup_grace_seconds), resolution)
+    else:
+        source_watermark = _watermark(db, source)
+        if source_watermark is None:
+            return None
+        hi = _truncate(source_watermark, resolution)
+
+    lo = _watermark(db, resolution)
+    if lo is None:
+        if source == RAW:
+            first = db.execute(select(func.min(NodeHealthSample.checked_at))).scalar()
+        else:
+            first = db.execute(
+                select(func.min(NodeHealthRollup.bucket)).where(NodeHealthRollup.resolution == source)
+            ).scalar()
+        if first is None:
+            return None
+        lo = _truncate(first, resolution)
+    if lo >= hi:
+        return None
+
+    columns = ["node_id", "resolution", "bucket", "samples", "up_samples", "transitions", "latency_sum", "latency_max"]
+    query = _raw_rollup_select(lo, hi) if source == RAW else _rollup_rollup_select(resolution, lo, hi)
+    db.execute(insert(NodeHealthRollup).from_select(columns, query))
+    db.merge(HealthRollupWatermark(resolution=resolution, rolled_until=hi))
+    db.commit()
+    return lo, hi
+
+
+def prune(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Delete data older than each resolution's retention window.
+
+    Nothing is deleted until the next coarser resolution has rolled it up.
+    Transition events are kept for health_event_retention_days.
+    """
+    now = now or datetime.utcnow()
+    deleted = {}
+    for resolution in (RAW,) + RESOLUTIONS:
+        cutoff = now - _retention(resolution)
+        coarser = {RAW: "1m", "1m": "1h", "1h": "1d"}.get(resolution)
+        if coarser is not None:
+            rolled = _watermark(db, coarser)
+            if rolled is None:
+                deleted[resolution] = 0
+                continue
+            cutoff = min(cutoff, rolled)
+        if resolution == RAW:
+            statement = delete(NodeHealthSample).where(NodeHealthSample.checked_at < cutoff)
+        else:
+            statement = delete(NodeHealthRollup).where(
+                NodeHealthRollup.resolution == resolution, NodeHealthRollup.bucket < cutoff
+            )
+        deleted[resolution] = db.execute(statement).rowcount
+    event_cutoff = now - timedelta(days=settings.health_event_retention_days)
+    deleted["events"] = db.execute(delete(NodeHealthEvent).where(NodeHealthEvent.occurred_at < event_cutoff)).rowcount
+    db.commit()
+    return deleted
+
+
+def pick_resolution(start: datetime, end: datetime) -> str:
+    """Choose the finest resolution that keeps a range query to a few hundred points."""
+    span = end - start
+    for resolution, widest in _AUTO_SPANS:
+        if span <= widest:
+            return resolution
+    return "1d"
+
+
+def query_history(
+    db: Session, node_id: int, start: datetime, end: datetime, resolution: str
+) -> List[dict]:
+    """Return history points for one node between start and end at the given resolution."""
+    if resolution == RAW:
+        rows = db.execute(
+            select(NodeHealthSample.checked_at, NodeHealthSample.up, NodeHealthSample.latency_ms)
+            .where(
+                NodeHealthSample.node_id == node_id,
+                NodeHealthSample.checked_at >= start,
+                NodeHealthSample.checked_at < end,
+            )
+            .order_by(NodeHealthSample.checked_at)
+        ).all()
+        points = []
+        previous = None
+        for row in rows:
+            points.append({
+                "ts": row.checked_at,
+                "samples": 1,
+                "up_samples": int(row.up),
+                "transitions": int(previous is not None and previous != row.up),
+                "avg_latency_ms": row.latency_ms,
+                "max_latency_ms": row.latency_ms,
+            })
+            previous = row.up
+        return points
+
+    rows = db.execute(
+        select(NodeHealthRollup)
+        .where(
+            NodeHealthRollup.node_id == node_id,
+            NodeHealthRollup.resolution == resolution,
+            NodeHealthRollup.bucket >= start,
+            NodeHealthRollup.bucket < end,
+        )
+        .order_by(NodeHealthRollup.bucket)
+    ).scalars()
+    return [
+        {
+            "ts": row.bucket,
+            "samples": row.samples,
+            "up_samples": row.up_samples,
+            "transitions": row.transitions,
+            "avg_latency_ms": row.latency_sum / row.up_samples if row.up_samples and row.latency_sum is not None else None,
+            "max_latency_ms": row.latency_max,
+        }
+        for row in rows
+    ]
+
+
+def encode_event_cursor(event: NodeHealthEvent) -> str:
+    raw = json.dumps([event.occurred_at.isoformat(), event.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(occurred_at, id) from encode_event_cursor; ValueError when malformed."""
+    try:
+        occurred_at, event_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(occurred_at), int(event_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def event_page(query: Select, cursor: Optional[str], limit: int, now: Optional[datetime] = None) -> Select:
+    """
+    Order events by (occurred_at, id), start after the cursor and leave out
+    the last health_event_settle_seconds.
+
+    Events are stamped with their probe time just before the writer commits,
+    and concurrent writers commit out of id order. Once an event is older than
+    the settle window every event up to its time has committed, so a poller
+    that follows the cursor sees each transition exactly once.
+    """
+    now = now or datetime.utcnow()
+    query = query.where(NodeHealthEvent.occurred_at <= now - timedelta(seconds=settings.health_event_settle_seconds))
+    if cursor:
+        occurred_at, event_id = decode_event_cursor(cursor)
+        query = query.where(or_(
+            NodeHealthEvent.occurred_at > occurred_at,
+            and_(NodeHealthEvent.occurred_at == occurred_at, NodeHealthEvent.id > event_id),
+        ))
+    return query.order_by(NodeHealthEvent.occurred_at, NodeHealthEvent.id).limit(limit)
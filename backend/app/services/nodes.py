@@ -0,0 +1,183 @@
+# backend/app/services/nodes.py
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.models.host import Node, UNHEALTHY
+
+
+class NodeStatus(str, Enum):
+    healthy = "healthy"
+    unhealthy = "unhealthy"          # any check failing; served by the ix_nodes_unhealthy partial index
+    down = "down"
+    unreachable = "unreachable"      # alive but SSH fails
+    failing_tests = "failing_tests"
+    upstream_down = "upstream_down"  # not probed while a node it depends on is down
+
+
+class NodeSort(str, Enum):
+    id = "id"
+    name = "name"
+    last_health_check = "last_health_check"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+_SORT_COLUMNS = {
+    NodeSort.id: Node.id,
+    NodeSort.name: Node.name,
+    NodeSort.last_health_check: Node.last_health_check,
+}
+
+# Sort keys whose column can be NULL need explicit NULL handling in the keyset
+_NULLABLE_SORTS = {NodeSort.last_health_check}
+
+
+def status_clause(status: NodeStatus) -> ColumnElement:
+    """
+    SQL predicate for a status. Comparisons use = rather than IS so the
+    (cluster_id, is_alive) index can serve them; "unhealthy" must match the
+    partial index predicate exactly.
+    """
+    if status is NodeStatus.healthy:
+        return and_(Node.is_alive == True, Node.ssh_reachable == True, Node.passing_unit_tests == True)  # noqa: E712
+    if status is NodeStatus.unhealthy:
+        return UNHEALTHY
+    if status is NodeStatus.down:
+        return or_(Node.is_alive == False, Node.is_alive.is_(None))  # noqa: E712
+    if status is NodeStatus.unreachable:
+        return and_(Node.is_alive == True, Node.ssh_reachable.isnot(True))  # noqa: E712
+    if status is NodeStatus.upstream_down:
+        return Node.upstream_down == True  # noqa: E712
+    return Node.passing_unit_tests.isnot(True)
+
+
+def encode_cursor(sort: NodeSort, node: Any) -> str:
+    value = getattr(node, sort.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, node.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort: NodeSort, cursor: str) -> Tuple[Any, int]:
+    try:
+        value, node_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if sort is NodeSort.last_health_check and value is not None:
+            value = datetime.fromisoformat(value)
+        return value, int(node_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(sort: NodeSort, descending: bool, value: Any, node_id: int) -> ColumnElement:
+    """Rows strictly after (value, node_id) in (sort column, id) order."""
+    column = _SORT_COLUMNS[sort]
+    if sort is NodeSort.id:
+        return Node.id < node_id if descending else Node.id > node_id
+    if sort not in _NULLABLE_SORTS:
+        if descending:
+            return or_(column < value, and_(column == value, Node.id < node_id))
+        return or_(column > value, and_(column == value, Node.id > node_id))
+    # NULLs sort last ascending and first descending, as a plain Postgres btree index returns them
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), Node.id < node_id), column.isnot(None))
+        return or_(column < value, and_(column == value, Node.id < node_id))
+    if value is None:
+        return and_(column.is_(None), Node.id > node_id)
+    return or_(column > value, and_(column == value, Node.id > node_id), column.is_(None))
+
+
+def keyset_page(
+    query: Select, sort: NodeSort, order: SortOrder, cursor: Optional[str], limit: int
+) -> Select:
+    """Order query by (sort column, id) and start it after the cursor."""
+    column = _SORT_COLUMNS[sort]
+    descending = order is SortOrder.desc
+    if cursor:
+        query = query.where(_after(sort, descending, *decode_cursor(sort, cursor)))
+    if sort is NodeSort.id:
+        ordering = [Node.id.desc() if descending else Node.id.asc()]
+    elif descending:
+        ordering = [column.desc().nulls_first(), Node.id.desc()]
+    else:
+        ordering = [column.asc().nulls_last(), Node.id.asc()]
+    return query.order_by(*ordering).limit(limit)
+
+
+def next_cursor(sort: NodeSort, nodes: List[Any], limit: int) -> Optional[str]:
+    """Cursor for the following page, or None when this page was the last."""
+    if len(nodes) < limit:
+        return None
+    return encode_cursor(sort, nodes[-1])
+
+
+def stale_clause(older_than: datetime, include_unchecked: bool) -> ColumnElement:
+    clause = Node.last_health_check < older_than
+    return or_(clause, Node.last_health_check.is_(None)) if include_unchecked else clause
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix(column, value: str) -> ColumnElement:
+    """Case-sensitive prefix match a text_pattern_ops index can serve."""
+    return column.like(_escape_like(value) + "%", escape="\\")
+
+
+def _contains(column, value: str) -> ColumnElement:
+    """Case-insensitive substring match a pg_trgm GIN index can serve."""
+    return column.ilike("%" + _escape_like(value) + "%", escape="\\")
+
+
+def filter_nodes(
+    query: Select,
+    cluster_ids: Optional[Iterable[int]] = None,
+    status: Optional[NodeStatus] = None,
+    is_alive: Optional[bool] = None,
+    ssh_reachable: Optional[bool] = None,
+    passing_unit_tests: Optional[bool] = None,
+    operating_system: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    hostname_prefix: Optional[str] = None,
+    ip_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    stale_since: Optional[datetime] = None,
+) -> Select:
+    """Narrow a Node query with every filter that is set, all pushed down to SQL."""
+    cluster_ids = list(cluster_ids or [])
+    if cluster_ids:
+        query = query.where(Node.cluster_id.in_(cluster_ids))
+    if status is not None:
+        query = query.where(status_clause(status))
+    for column, value in (
+        (Node.is_alive, is_alive),
+        (Node.ssh_reachable, ssh_reachable),
+        (Node.passing_unit_tests, passing_unit_tests),
+    ):
+        if value is not None:
+            query = query.where(column == value)
+    if operating_system:
+        query = query.where(_contains(Node.operating_system, operating_system))
+    if name_prefix:
+        query = query.where(_prefix(Node.name, name_prefix))
+    if hostname_prefix:
+        query = query.where(_prefix(Node.hostname, hostname_prefix))
+    if ip_prefix:
+        query = query.where(_prefix(Node.ip_address, ip_prefix))
+    if search:
+        query = query.where(or_(_contains(Node.name, search), _contains(Node.hostname, search)))
+    if stale_since is not None:
+        query = query.where(stale_clause(stale_since, include_unchecked=True))
+    return query
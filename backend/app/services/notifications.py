@@ -0,0 +1,171 @@
+# backend/app/services/notifications.py
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "watchdog:alert-notifications"   # list of queued notification envelopes (json)
+
+
+class NotificationSink:
+    """Somewhere grouped alert notifications are delivered, a batch at a time."""
+    name = "sink"
+
+    async def send(self, notifications: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+
+class WebhookSink(NotificationSink):
+    """POSTs each batch as {"notifications": [...]} to one URL."""
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        self.url = url
+        self.timeout = timeout or settings.alert_webhook_timeout
+
+    async def send(self, notifications: List[Dict[str, Any]]) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(self.url, json={"notifications": notifications})
+            response.raise_for_status()
+
+
+class FileSink(NotificationSink):
+    """Appends one JSON line per notification."""
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _append(self, notifications: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a") as out:
+            out.writelines(json.dumps(notification) + "\n" for notification in notifications)
+
+    async def send(self, notifications: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._append, notifications)
+
+
+class MemorySink(NotificationSink):
+    """Keeps every batch in memory; a stand-in for real sinks in tests and local runs."""
+    name = "memory"
+
+    def __init__(self):
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    @property
+    def notifications(self) -> List[Dict[str, Any]]:
+        return [notification for batch in self.batches for notification in batch]
+
+    async def send(self, notifications: List[Dict[str, Any]]) -> None:
+        self.batches.append(list(notifications))
+
+
+def configured_sinks() -> List[NotificationSink]:
+    sinks: List[NotificationSink] = []
+    if settings.alert_webhook_url:
+        sinks.append(WebhookSink(settings.alert_webhook_url))
+    if settings.alert_file_path:
+        sinks.append(FileSink(settings.alert_file_path))
+    return sinks
+
+
+class NotificationQueue:
+    """
+    Redis list between the alert evaluator and the dispatcher, so evaluation
+    never waits on a slow webhook. Each envelope remembers which sinks still
+    have to receive it; a failed delivery is retried for those sinks only.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def push(self, notifications: Sequence[Dict[str, Any]], sinks: Optional[Sequence[str]] = None) -> int:
+        if not notifications:
+            return 0
+        envelopes = [
+            json.dumps({"notification": notification, "sinks": list(sinks) if sinks else None, "attempts": 0})
+            for notification in notifications
+        ]
+        try:
+            self.redis.rpush(QUEUE_KEY, *envelopes)
+        except redis.RedisError as exc:
+            logger.warning("could not queue %d alert notifications: %s", len(envelopes), exc)
+            return 0
+        return len(envelopes)
+
+    def pop(self, count: int) -> List[Dict[str, Any]]:
+        raw = self.redis.lpop(QUEUE_KEY, count) or []
+        return [json.loads(envelope) for envelope in raw]
+
+    def retry(self, envelopes: Sequence[Dict[str, Any]]) -> None:
+        if envelopes:
+            self.redis.rpush(QUEUE_KEY, *(json.dumps(envelope) for envelope in envelopes))
+
+    def __len__(self) -> int:
+        return self.redis.llen(QUEUE_KEY)
+
+
+async def _deliver(
+    envelopes: List[Dict[str, Any]], sinks: Sequence[NotificationSink]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Send one batch to every sink concurrently; return the envelopes each failed sink still owes."""
+    pending = {
+        sink.name: [envelope for envelope in envelopes if envelope["sinks"] is None or sink.name in envelope["sinks"]]
+        for sink in sinks
+    }
+    active = [sink for sink in sinks if pending[sink.name]]
+    outcomes = await asyncio.gather(
+        *(sink.send([envelope["notification"] for envelope in pending[sink.name]]) for sink in active),
+        return_exceptions=True,
+    )
+    failed = {}
+    for sink, outcome in zip(active, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning("alert sink %s failed for %d notifications: %s", sink.name, len(pending[sink.name]), outcome)
+            failed[sink.name] = pending[sink.name]
+    return failed
+
+
+def dispatch(
+    queue: NotificationQueue,
+    sinks: Optional[Sequence[NotificationSink]] = None,
+    max_batches: int = 10,
+) -> Dict[str, int]:
+    """
+    Drain up to max_batches batches of alert_dispatch_batch notifications.
+
+    Every sink gets each batch in a single call. Envelopes a sink failed on
+    are queued again for that sink until alert_dispatch_max_attempts.
+    """
+    sinks = list(configured_sinks() if sinks is None else sinks)
+    stats = {"sent": 0, "retried": 0, "dropped": 0}
+    for _ in range(max_batches):
+        envelopes = queue.pop(settings.alert_dispatch_batch)
+        if not envelopes:
+            break
+        if not sinks:
+            logger.info("no alert sinks configured, dropping %d notifications", len(envelopes))
+            stats["dropped"] += len(envelopes)
+            continue
+        failed = asyncio.run(_deliver(envelopes, sinks))
+
+        retry: Dict[int, Dict[str, Any]] = {}
+        for sink_name, owed in failed.items():
+            for envelope in owed:
+                entry = retry.setdefault(id(envelope), {**envelope, "sinks": [], "attempts": envelope["attempts"] + 1})
+                entry["sinks"].append(sink_name)
+        requeue = [entry for entry in retry.values() if entry["attempts"] < settings.alert_dispatch_max_attempts]
+        queue.retry(requeue)
+        stats["sent"] += len(envelopes) - len(retry)
+        stats["retried"] += len(requeue)
+        stats["dropped"] += len(retry) - len(requeue)
+        if failed:
+            # Leave retries for the next run instead of hammering a failing sink
+            break
+    return stats
@@ -0,0 +1,304 @@
+# backend/app/services/reports.py
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from xml.etree.ElementTree import ParseError, XMLParser
+
+import redis
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.host import Node
+from app.models.reports import NodeTestSummary
+from app.services.alerts import cluster_counters
+from app.services.events import make_delta, publish_node_deltas
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "watchdog:test-reports"   # list of parsed report summaries (json) awaiting the batch writer
+
+JUNIT_TYPES = ("application/xml", "text/xml", "application/junit+xml")
+JSON_LINES_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+
+_OUTCOMES = {
+    "passed": "passed", "pass": "passed", "ok": "passed", "success": "passed", "xpassed": "passed",
+    "failed": "failed", "fail": "failed", "failure": "failed",
+    "error": "error", "errored": "error",
+    "skipped": "skipped", "skip": "skipped", "xfailed": "skipped",
+}
+
+
+class ReportParseError(ValueError):
+    pass
+
+
+@dataclass
+class TestSummary:
+    tests: int = 0
+    failures: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duration_seconds: float = 0.0
+    failed_tests: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.failures == 0 and self.errors == 0
+
+    def _note_failure(self, name: Optional[str]) -> None:
+        if name and len(self.failed_tests) < settings.test_report_failed_names:
+            self.failed_tests.append(name)
+
+    def add(self, name: Optional[str], outcome: str, duration: Optional[float]) -> None:
+        self.tests += 1
+        self.duration_seconds += duration or 0.0
+        if outcome == "failed":
+            self.failures += 1
+        elif outcome == "error":
+            self.errors += 1
+        elif outcome == "skipped":
+            self.skipped += 1
+        if outcome in ("failed", "error"):
+            self._note_failure(name)
+
+    def add_error(self, name: Optional[str]) -> None:
+        """A setup or teardown error outside any counted test."""
+        self.errors += 1
+        self._note_failure(name)
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _JUnitTarget:
+    """
+    XMLParser target that only keeps running totals: element text (captured
+    output, stack traces) is dropped as it streams past, so memory stays flat
+    however large the report is.
+    """
+
+    def __init__(self, summary: TestSummary):
+        self.summary = summary
+        self.suites = TestSummary()   # totals from <testsuite> attributes, for reports without <testcase>
+        self.case: Optional[List[Any]] = None
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        tag = tag.rpartition("}")[2]
+        if tag == "testcase":
+            name = ".".join(part for part in (attrib.get("classname"), attrib.get("name")) if part)
+            self.case = [name, "passed", _float(attrib.get("time"))]
+        elif self.case is not None and tag in ("failure", "error", "skipped"):
+            outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[tag]
+            # An error outranks a failure, and either outranks a skip
+            if self.case[1] != "error" and not (self.case[1] == "failed" and outcome == "skipped"):
+                self.case[1] = outcome
+        elif tag == "testsuite":
+            self.suites.tests += int(_float(attrib.get("tests")))
+            self.suites.failures += int(_float(attrib.get("failures")))
+            self.suites.errors += int(_float(attrib.get("errors")))
+            self.suites.skipped += int(_float(attrib.get("skipped") or attrib.get("disabled")))
+            self.suites.duration_seconds += _float(attrib.get("time"))
+
+    def end(self, tag: str) -> None:
+        if tag.rpartition("}")[2] == "testcase" and self.case is not None:
+            self.summary.add(*self.case)
+            self.case = None
+
+    def data(self, data: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JUnitReportParser:
+    """Incremental JUnit XML parser; feed() chunks as they arrive, then finish()."""
+
+    def __init__(self):
+        self.summary = TestSummary()
+        self._target = _JUnitTarget(self.summary)
+        self._parser = XMLParser(target=self._target)
+
+    def feed(self, chunk: bytes) -> None:
+        try:
+            self._parser.feed(chunk)
+        except ParseError as exc:
+            raise ReportParseError(f"invalid JUnit XML: {exc}")
+
+    def finish(self) -> TestSummary:
+        try:
+            self._parser.close()
+        except ParseError as exc:
+            raise ReportParseError(f"invalid JUnit XML: {exc}")
+        if self.summary.tests == 0 and self._target.suites.tests:
+            return self._target.suites
+        return self.summary
+
+
+class JsonLinesReportParser:
+    """
+    Incremental parser for one JSON object per test. Accepts plain records
+    ({"name", "outcome" or "status", "duration"}) and pytest-reportlog
+    output, where only the call phase counts as the test and failing setup
+    or teardown phases count as errors.
+    """
+
+    def __init__(self):
+        self.summary = TestSummary()
+        self._buffer = b""
+        self._line = 0
+
+    def feed(self, chunk: bytes) -> None:
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        for line in lines:
+            self._record(line)
+
+    def finish(self) -> TestSummary:
+        if self._buffer:
+            self._record(self._buffer)
+            self._buffer = b""
+        return self.summary
+
+    def _record(self, raw: bytes) -> None:
+        self._line += 1
+        if not raw.strip():
+            return
+        try:
+            record = json.loads(raw)
+        except ValueError as exc:
+            raise ReportParseError(f"line {self._line}: invalid JSON: {exc}")
+        if not isinstance(record, dict):
+            raise ReportParseError(f"line {self._line}: expected a JSON object")
+
+        report_type = record.get("$report_type")
+        if report_type is not None:
+            if report_type != "TestReport":
+                return
+            name, outcome, when = record.get("nodeid"), record.get("outcome"), record.get("when")
+            if when != "call":
+                if outcome == "failed":
+                    self.summary.add_error(name)
+                elif outcome == "skipped" and when == "setup":
+                    self.summary.add(name, "skipped", record.get("duration"))
+                return
+        else:
+            name = record.get("name") or record.get("test")
+            outcome = record.get("outcome") or record.get("status") or record.get("result")
+
+        normalized = _OUTCOMES.get(str(outcome).lower())
+        if normalized is None:
+            raise ReportParseError(f"line {self._line}: unknown outcome {outcome!r}")
+        self.summary.add(name, normalized, _float(record.get("duration")))
+
+
+ReportParser = Union[JUnitReportParser, JsonLinesReportParser]
+
+
+def report_parser(content_type: str) -> Optional[ReportParser]:
+    """A fresh parser for the upload's content type, or None when it is not a report format."""
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type in JUNIT_TYPES:
+        return JUnitReportParser()
+    if content_type in JSON_LINES_TYPES:
+        return JsonLinesReportParser()
+    return None
+
+
+class ReportQueue:
+    """
+    Redis list between the upload endpoint and the batch writer, so an upload
+    only costs the API a parse and an RPUSH.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def push(self, node_id: int, summary: TestSummary, reported_at: datetime) -> None:
+        self.redis.rpush(QUEUE_KEY, json.dumps({
+            "node_id": node_id, "reported_at": reported_at.isoformat(), "passed": summary.passed, **asdict(summary),
+        }))
+
+    def pop(self, count: int) -> List[Dict[str, Any]]:
+        return [json.loads(raw) for raw in self.redis.lpop(QUEUE_KEY, count) or []]
+
+    def retry(self, summaries: Sequence[Dict[str, Any]]) -> None:
+        if summaries:
+            self.redis.lpush(QUEUE_KEY, *(json.dumps(summary) for summary in reversed(summaries)))
+
+
+_summaries = NodeTestSummary.__table__
+_nodes = Node.__table__
+_SUMMARY_FIELDS = ("reported_at", "tests", "failures", "errors", "skipped", "duration_seconds", "passed", "failed_tests")
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT (node_id) DO UPDATE that never replaces a newer report with an older one."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(_summaries).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[_summaries.c.node_id],
+        set_={name: statement.excluded[name] for name in _SUMMARY_FIELDS},
+        where=_summaries.c.reported_at <= statement.excluded.reported_at,
+    )
+
+
+def apply_summaries(db: Session, summaries: Sequence[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Store a batch of report summaries and bring passing_unit_tests in line.
+
+    The latest summary per node is upserted in one statement, then a single
+    UPDATE ... FROM node_test_summaries flips passing_unit_tests only where it
+    differs, leaving updated_at alone as other health writes do. Flips are
+    published to the live stream and mark the clusters for an alert-counter
+    recount. Returns (summaries stored, nodes flipped).
+    """
+    latest: Dict[int, Dict[str, Any]] = {}
+    for summary in summaries:
+        current = latest.get(summary["node_id"])
+        if current is None or summary["reported_at"] >= current["reported_at"]:
+            latest[summary["node_id"]] = summary
+    if not latest:
+        return 0, 0
+
+    # Reports for nodes deleted after upload are dropped
+    node_ids = list(db.execute(select(Node.id).where(Node.id.in_(list(latest)))).scalars())
+    if not node_ids:
+        return 0, 0
+    rows = [
+        {
+            "node_id": node_id,
+            **{name: latest[node_id][name] for name in _SUMMARY_FIELDS},
+            "reported_at": datetime.fromisoformat(latest[node_id]["reported_at"]),
+        }
+        for node_id in node_ids
+    ]
+    db.execute(_upsert(db, rows))
+    flipped = db.execute(
+        update(_nodes)
+        .where(
+            _nodes.c.id == _summaries.c.node_id,
+            _summaries.c.node_id.in_(node_ids),
+            _nodes.c.passing_unit_tests.is_distinct_from(_summaries.c.passed),
+        )
+        .values(passing_unit_tests=_summaries.c.passed, updated_at=_nodes.c.updated_at)
+        .returning(_nodes.c.id, _nodes.c.cluster_id, _nodes.c.passing_unit_tests)
+    ).all()
+    db.commit()
+
+    if flipped:
+        now = datetime.utcnow()
+        cache.invalidate("nodes")
+        cluster_counters.mark_dirty({row.cluster_id for row in flipped})
+        publish_node_deltas([
+            make_delta(row.id, row.cluster_id, {"passing_unit_tests": row.passing_unit_tests}, now) for row in flipped
+        ])
+    return len(rows), len(flipped)
@@ -0,0 +1,187 @@
+# backend/app/services/scheduler.py
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.host import Node
+
+QUEUE_KEY = "watchdog:probe-queue"   # sorted set: node id -> next due time (unix seconds)
+STATE_KEY = "watchdog:probe-state"   # hash: node id -> ProbeState json
+TICK_LOCK_KEY = "watchdog:probe-tick"
+SYNCED_KEY = "watchdog:probe-synced"   # "<node count>:<max node id>" as of the last sync
+
+
+@dataclass
+class ProbeState:
+    interval: float
+    streak: int     # consecutive probes with the same outcome
+    up: bool
+
+
+def next_state(previous: Optional[ProbeState], up: bool) -> ProbeState:
+    """
+    Work out a node's next probe interval from its latest result.
+
+    New nodes, nodes that just changed state and nodes that are down are
+    probed at the minimum interval. A healthy node backs off geometrically
+    once it has been stable for probe_stable_after probes, up to the maximum.
+    """
+    if previous is None or previous.up != up:
+        return ProbeState(interval=settings.probe_min_interval, streak=1, up=up)
+    streak = previous.streak + 1
+    if not up or streak < settings.probe_stable_after:
+        return ProbeState(interval=settings.probe_min_interval, streak=streak, up=up)
+    interval = min(settings.probe_max_interval, previous.interval * settings.probe_backoff_factor)
+    return ProbeState(interval=interval, streak=streak, up=up)
+
+
+def jittered(interval: float, rng: random.Random = random) -> float:
+    spread = settings.probe_jitter
+    return interval * (1 + rng.uniform(-spread, spread))
+
+
+class ProbeScheduler:
+    """
+    Priority queue of per-node due times, kept in a Redis sorted set so every
+    worker and the API share it.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def sync(self, db: Session, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Add nodes missing from the queue and drop deleted ones.
+
+        New nodes get a random first due time within the minimum interval so a
+        bulk import does not land on a single tick. Returns (added, removed).
+        """
+        now = now or time.time()
+        fingerprint = self._fingerprint(db)
+        node_ids = {str(node_id) for node_id in db.execute(select(Node.id)).scalars()}
+        queued = set(self.redis.zrange(QUEUE_KEY, 0, -1))
+        added = node_ids - queued
+        removed = queued - node_ids
+
+        pipe = self.redis.pipeline(transaction=False)
+        if added:
+            pipe.zadd(QUEUE_KEY, {
+                node_id: now + random.uniform(0, settings.probe_min_interval) for node_id in added
+            })
+        if removed:
+            pipe.zrem(QUEUE_KEY, *removed)
+            pipe.hdel(STATE_KEY, *removed)
+        pipe.set(SYNCED_KEY, fingerprint)
+        pipe.execute()
+        return len(added), len(removed)
+
+    @staticmethod
+    def _fingerprint(db: Session) -> str:
+        count, max_id = db.execute(select(func.count(Node.id), func.max(Node.id))).one()
+        return f"{count}:{max_id or 0}"
+
+    def needs_sync(self, db: Session) -> bool:
+        """
+        Cheap check for added or deleted nodes. Ids only grow, so a node added
+        and another deleted since the last sync still move max(id); a queue
+        that lost entries no longer matches the row count.
+        """
+        fingerprint = self._fingerprint(db)
+        synced, queued = self.redis.get(SYNCED_KEY), self.redis.zcard(QUEUE_KEY)
+        return fingerprint != synced or int(fingerprint.split(":")[0]) != queued
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[int]:
+        """Node ids whose due time has passed, oldest first."""
+        now = now or time.time()
+        limit = limit or settings.probe_batch_size
+        return [int(node_id) for node_id in self.redis.zrangebyscore(QUEUE_KEY, "-inf", now, start=0, num=limit)]
+
+    def apply_cluster_caps(
+        self, due: Sequence[Tuple[int, int]], now: Optional[float] = None
+    ) -> List[int]:
+        """
+        Keep at most probe_cluster_rate_limit nodes per cluster this tick.
+
+        `due` is (node_id, cluster_id) pairs in due order. Overflow nodes are
+        pushed back one tick per extra cap-sized batch, so a large cluster is
+        spread over the following ticks instead of starving other clusters.
+        """
+        now = now or time.time()
+        cap = max(1, settings.probe_cluster_rate_limit)
+        seen: Dict[int, int] = {}
+        selected: List[int] = []
+        deferred: Dict[str, float] = {}
+        for node_id, cluster_id in due:
+            position = seen.get(cluster_id, 0)
+            seen[cluster_id] = position + 1
+            if position < cap:
+                selected.append(node_id)
+            else:
+                deferred[str(node_id)] = now + settings.probe_scheduler_tick * (position // cap)
+        if deferred:
+            self.redis.zadd(QUEUE_KEY, deferred)
+        return selected
+
+    def postpone(self, node_ids: Iterable[int], seconds: float, now: Optional[float] = None) -> None:
+        """Push nodes out of the due window, e.g. ones with no address to probe."""
+        now = now or time.time()
+        mapping = {str(node_id): now + seconds for node_id in node_ids}
+        if mapping:
+            self.redis.zadd(QUEUE_KEY, mapping)
+
+    def forget(self, node_ids: Iterable[int]) -> None:
+        """Drop deleted nodes from the queue."""
+        keys = [str(node_id) for node_id in node_ids]
+        if keys:
+            self.redis.zrem(QUEUE_KEY, *keys)
+            self.redis.hdel(STATE_KEY, *keys)
+
+    def reschedule(self, outcomes: Sequence[Tuple[int, bool]], now: Optional[float] = None) -> None:
+        """Record probe outcomes and queue each node at its next jittered interval."""
+        if not outcomes:
+            return
+        now = now or time.time()
+        keys = [str(node_id) for node_id, _ in outcomes]
+        previous = self.redis.hmget(STATE_KEY, keys)
+
+        states = {}
+        due = {}
+        for key, (_, up), raw in zip(keys, outcomes, previous):
+            state = next_state(ProbeState(**json.loads(raw)) if raw else None, up)
+            states[key] = json.dumps(asdict(state))
+            due[key] = now + jittered(state.interval)
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(STATE_KEY, mapping=states)
+        pipe.zadd(QUEUE_KEY, due)
+        pipe.execute()
+
+    def requeue(self, node_ids: Iterable[int], now: Optional[float] = None) -> None:
+        """Queue nodes again at their current interval without recording an outcome, e.g. probes cut off by the deadline."""
+        keys = [str(node_id) for node_id in node_ids]
+        if not keys:
+            return
+        now = now or time.time()
+        due = {
+            key: now + jittered(ProbeState(**json.loads(raw)).interval if raw else settings.probe_min_interval)
+            for key, raw in zip(keys, self.redis.hmget(STATE_KEY, keys))
+        }
+        self.redis.zadd(QUEUE_KEY, due)
+
+    def probe_now(self, node_ids: Iterable[int]) -> int:
+        """Move nodes to the front of the queue."""
+        mapping = {str(node_id): 0 for node_id in node_ids}
+        if mapping:
+            self.redis.zadd(QUEUE_KEY, mapping)
+        return len(mapping)
+
+    def tick_lock(self):
+        """Non-blocking lock so overlapping ticks never probe the same due nodes twice."""
+        return self.redis.lock(TICK_LOCK_KEY, timeout=settings.probe_deadline + 30, blocking=False)
@@ -0,0 +1,157 @@
+# backend/app/services/sharding.py
+import bisect
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.host import Cluster, Node
+
+AGENTS_KEY = "watchdog:probe-agents:{zone}"         # sorted set: agent id -> last heartbeat (unix seconds)
+AGENT_INFO_KEY = "watchdog:probe-agents:{zone}:info"  # hash: agent id -> AgentInfo json
+
+# (node_id, cluster_id, ip_address, ssh_port)
+AgentTarget = Tuple[int, int, str, int]
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes. Adding or removing a member only
+    moves the keys between it and its neighbours, about 1/N of the total.
+    """
+
+    def __init__(self, members: Iterable[str], vnodes: Optional[int] = None):
+        vnodes = vnodes or settings.probe_ring_vnodes
+        points = sorted((_point(f"{member}#{i}"), member) for member in set(members) for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+    @property
+    def members(self) -> Set[str]:
+        return set(self._owners)
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        return self._owners[bisect.bisect(self._points, _point(key)) % len(self._points)]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        assignment: Dict[str, List[str]] = {}
+        for key in keys:
+            owner = self.owner(key)
+            if owner is not None:
+                assignment.setdefault(owner, []).append(key)
+        return assignment
+
+
+def shard_key(cluster_id: int, node_id: int) -> str:
+    """Ring key for a node: its cluster, split into probe_cluster_slices slices by node id."""
+    return f"{cluster_id}/{node_id % max(1, settings.probe_cluster_slices)}"
+
+
+_CLUSTER_CHUNK = 1000
+
+
+@dataclass
+class AgentInfo:
+    agent_id: str
+    zone: str
+    host: str
+    started_at: float
+    heartbeat_at: float = 0.0
+    nodes: int = 0             # nodes owned in the last cycle
+    cycle_seconds: float = 0.0
+
+
+class AgentRegistry:
+    """
+    Live probe agents per zone, from heartbeats in a Redis sorted set. Every
+    agent reads the same live set and builds the same ring, so no coordinator
+    is needed; an agent whose heartbeat stops drops out of the ring once its
+    heartbeat is older than probe_agent_ttl and its keys move to the others.
+    """
+
+    def __init__(self, zone: Optional[str] = None, client: Optional[redis.Redis] = None):
+        self.zone = zone or settings.probe_agent_zone
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self.key = AGENTS_KEY.format(zone=self.zone)
+        self.info_key = AGENT_INFO_KEY.format(zone=self.zone)
+
+    def heartbeat(self, info: AgentInfo, now: Optional[float] = None) -> None:
+        now = now or time.time()
+        info.heartbeat_at = now
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zadd(self.key, {info.agent_id: now})
+        pipe.hset(self.info_key, info.agent_id, json.dumps(info.__dict__))
+        pipe.execute()
+
+    def leave(self, *agent_ids: str) -> None:
+        """Deregister agents, e.g. on shutdown, so the others take over on their next cycle."""
+        if not agent_ids:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrem(self.key, *agent_ids)
+        pipe.hdel(self.info_key, *agent_ids)
+        pipe.execute()
+
+    def live(self, now: Optional[float] = None) -> List[str]:
+        now = now or time.time()
+        return self.redis.zrangebyscore(self.key, now - settings.probe_agent_ttl, "+inf")
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """Forget agents whose heartbeats have expired."""
+        now = now or time.time()
+        dead = self.redis.zrangebyscore(self.key, "-inf", f"({now - settings.probe_agent_ttl}")
+        self.leave(*dead)
+        return len(dead)
+
+    def agents(self, now: Optional[float] = None) -> List[AgentInfo]:
+        live = self.live(now)
+        if not live:
+            return []
+        return [AgentInfo(**json.loads(raw)) for raw in self.redis.hmget(self.info_key, live) if raw]
+
+    def ring(self, now: Optional[float] = None) -> HashRing:
+        return HashRing(self.live(now))
+
+
+def owned_targets(db: Session, ring: HashRing, agent_id: str, zone: str) -> List[AgentTarget]:
+    """
+    Probe targets this agent owns on its zone's ring.
+
+    Only clusters whose probe_zone is the agent's zone are considered, so
+    each zone probes its own clusters and no node is probed twice. Ownership
+    is worked out per (cluster, slice) key from the cluster ids alone, so
+    each agent only reads the nodes of clusters it has a slice of.
+    """
+    slices = max(1, settings.probe_cluster_slices)
+    owned = {
+        (cluster_id, slice_)
+        for cluster_id in db.execute(select(Cluster.id).where(Cluster.probe_zone == zone)).scalars()
+        for slice_ in range(slices)
+        if ring.owner(f"{cluster_id}/{slice_}") == agent_id
+    }
+    cluster_ids = sorted({cluster_id for cluster_id, _ in owned})
+    targets = []
+    for start in range(0, len(cluster_ids), _CLUSTER_CHUNK):
+        rows = db.execute(
+            select(Node.id, Node.cluster_id, Node.ip_address, Node.ssh_port)
+            .where(Node.cluster_id.in_(cluster_ids[start:start + _CLUSTER_CHUNK]), Node.ip_address.isnot(None))
+            .order_by(Node.id)
+        )
+        targets.extend(
+            (row.id, row.cluster_id, row.ip_address, row.ssh_port or 22)
+            for row in rows
+            if (row.cluster_id, row.id % slices) in owned
+        )
+    return targets
@@ -0,0 +1,305 @@
+# backend/app/services/topology.py
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import redis
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.host import Node
+from app.models.topology import NodeDependency
+from app.services.events import make_delta, publish_node_deltas
+from app.utils.health import DEADLINE, ProbeResult, probe_all, probe_many
+
+logger = logging.getLogger(__name__)
+
+# (node_id, ip_address, ssh_port), as in app.services.health
+ProbeTarget = Tuple[int, str, int]
+
+DOWN_PARENTS_KEY = "watchdog:topology:down-parents"   # set of parent node ids last seen down or blocked
+
+_CHUNK_SIZE = 1000
+
+_nodes = Node.__table__
+
+
+@dataclass
+class TopologyProbe:
+    results: List[Tuple[int, ProbeResult]] = field(default_factory=list)   # probed targets, in target order
+    blocked: List[int] = field(default_factory=list)       # targets skipped: a node upstream is down
+    marked: Set[int] = field(default_factory=set)          # targets already flagged upstream_down
+    parents_up: Dict[int, bool] = field(default_factory=dict)   # every parent resolved on the way
+
+
+def _load_nodes(db: Session, node_ids: Sequence[int]):
+    rows = []
+    for start in range(0, len(node_ids), _CHUNK_SIZE):
+        rows.extend(db.execute(
+            select(Node.id, Node.cluster_id, Node.ip_address, Node.ssh_port, Node.upstream_down)
+            .where(Node.id.in_(node_ids[start:start + _CHUNK_SIZE]))
+        ).all())
+    return rows
+
+
+def _load_parents(db: Session, cluster_of: Dict[int, int]) -> Dict[int, Set[int]]:
+    """Parent node ids of each node, from its own edges and its cluster's."""
+    by_node: Dict[int, Set[int]] = {}
+    by_cluster: Dict[int, Set[int]] = {}
+    for column, keys, into in (
+        (NodeDependency.node_id, sorted(cluster_of), by_node),
+        (NodeDependency.cluster_id, sorted(set(cluster_of.values())), by_cluster),
+    ):
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            for child, parent in db.execute(
+                select(column, NodeDependency.parent_node_id).where(column.in_(keys[start:start + _CHUNK_SIZE]))
+            ):
+                into.setdefault(child, set()).add(parent)
+
+    parents = {}
+    for node_id, cluster_id in cluster_of.items():
+        # A gateway listed for its own cluster does not sit behind itself
+        found = (by_node.get(node_id, set()) | by_cluster.get(cluster_id, set())) - {node_id}
+        if found:
+            parents[node_id] = found
+    return parents
+
+
+def _is_down(result: ProbeResult) -> bool:
+    # A parent cut off by the deadline says nothing about what sits behind it
+    return not result.alive and result.error != DEADLINE
+
+
+async def probe_in_waves(
+    targets: Dict[int, Tuple[str, int]],
+    parents: Dict[int, Set[int]],
+    concurrency: int = 1000,
+    timeout: float = 0.5,
+    deadline: Optional[float] = None,
+) -> Tuple[Dict[int, ProbeResult], Set[int]]:
+    """
+    Probe nodes parents first: each wave holds the nodes whose parents have
+    all been resolved. A node with a parent that is down, or blocked itself,
+    is blocked rather than probed. Nodes caught in a dependency cycle are
+    probed together once nothing else is left. `deadline` bounds every wave
+    together. Returns (results of probed nodes, blocked node ids).
+    """
+    loop = asyncio.get_running_loop()
+    ends = loop.time() + deadline if deadline is not None else None
+    order = list(targets)
+    remaining = set(order)
+    results: Dict[int, ProbeResult] = {}
+    blocked: Set[int] = set()
+
+    while remaining:
+        wave = [node_id for node_id in order if node_id in remaining and parents.get(node_id, set()).isdisjoint(remaining)]
+        wave = wave or [node_id for node_id in order if node_id in remaining]
+        probe = []
+        for node_id in wave:
+            if any(parent in blocked or (parent in results and _is_down(results[parent]))
+                   for parent in parents.get(node_id, ())):
+                blocked.add(node_id)
+            else:
+                probe.append(node_id)
+        left = None if ends is None else max(0.0, ends - loop.time())
+        for node_id, result in zip(probe, await probe_many([targets[node_id] for node_id in probe], concurrency, timeout, left)):
+            results[node_id] = result
+        remaining.difference_update(wave)
+    return results, blocked
+
+
+def probe_with_dependencies(
+    db: Session,
+    targets: Sequence[ProbeTarget],
+    concurrency: int = 1000,
+    timeout: float = 0.5,
+    deadline: Optional[float] = None,
+) -> TopologyProbe:
+    """
+    Probe targets behind their dependency graph.
+
+    Parents are looked up edge by edge up the graph, so only the ancestry of
+    the batch is read. Parents outside the batch are probed too, to decide
+    what they block; only the targets' results are returned for writing, the
+    parents are written by their own probes. Without any edges this is a
+    plain probe_all.
+
+    The graph is read before probing and the read transaction committed, so
+    db holds no connection while the probes run; it must have no pending
+    changes of its own.
+    """
+    if not targets:
+        return TopologyProbe()
+    if db.execute(select(NodeDependency.id).limit(1)).first() is None:
+        db.commit()
+        results = probe_all([(address, port) for _, address, port in targets], concurrency, timeout, deadline)
+        return TopologyProbe(results=[(target[0], result) for target, result in zip(targets, results)])
+
+    rows = {row.id: row for row in _load_nodes(db, [node_id for node_id, _, _ in targets])}
+    addresses = {node_id: (address, port) for node_id, address, port in targets}
+    parents: Dict[int, Set[int]] = {}
+    requested = set(rows)
+    frontier = dict(rows)
+    while frontier:
+        found = _load_parents(db, {row.id: row.cluster_id for row in frontier.values()})
+        parents.update(found)
+        missing = sorted({parent for ids in found.values() for parent in ids} - requested)
+        requested.update(missing)
+        frontier = {row.id: row for row in _load_nodes(db, missing)}
+        for row in frontier.values():
+            if row.ip_address and row.id not in addresses:
+                addresses[row.id] = (row.ip_address, row.ssh_port or 22)
+
+    db.commit()
+    results, blocked = asyncio.run(probe_in_waves(addresses, parents, concurrency, timeout, deadline))
+
+    # Parents of nodes outside this batch too, so a recovery is seen wherever the parent is probed
+    probed = sorted(results.keys() | blocked)
+    is_parent = set()
+    for start in range(0, len(probed), _CHUNK_SIZE):
+        is_parent.update(db.execute(
+            select(NodeDependency.parent_node_id)
+            .where(NodeDependency.parent_node_id.in_(probed[start:start + _CHUNK_SIZE]))
+            .distinct()
+        ).scalars())
+    parents_up = {}
+    for parent in is_parent:
+        if parent in blocked:
+            parents_up[parent] = False
+        elif parent in results and results[parent].error != DEADLINE:
+            parents_up[parent] = results[parent].alive
+    return TopologyProbe(
+        results=[(node_id, results[node_id]) for node_id, _, _ in targets if node_id in results],
+        blocked=[node_id for node_id, _, _ in targets if node_id in blocked],
+        marked={row.id for row in rows.values() if row.upstream_down},
+        parents_up=parents_up,
+    )
+
+
+class DownParents:
+    """
+    Parents last seen down or blocked, in a Redis set shared by every worker,
+    so whichever worker next sees one up knows it just recovered.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def recovered(self, parents_up: Dict[int, bool]) -> List[int]:
+        """Record parent states; returns the parents that were down and are now up."""
+        if not parents_up:
+            return []
+        down = [str(node_id) for node_id, up in parents_up.items() if not up]
+        up = [node_id for node_id, is_up in parents_up.items() if is_up]
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if down:
+                pipe.sadd(DOWN_PARENTS_KEY, *down)
+            for node_id in up:
+                pipe.srem(DOWN_PARENTS_KEY, str(node_id))
+            removed = pipe.execute()[1 if down else 0:]
+        except redis.RedisError as exc:
+            logger.warning("parent state update failed: %s", exc)
+            return []
+        return [node_id for node_id, count in zip(up, removed) if count]
+
+
+down_parents = DownParents()
+
+
+def marked_behind(db: Session, parent_ids: Iterable[int]) -> List[int]:
+    """Nodes flagged upstream_down anywhere beneath the given parents."""
+    found: Set[int] = set()
+    frontier = sorted(set(parent_ids))
+    while frontier:
+        node_ids, cluster_ids = set(), set()
+        for start in range(0, len(frontier), _CHUNK_SIZE):
+            for node_id, cluster_id in db.execute(
+                select(NodeDependency.node_id, NodeDependency.cluster_id)
+                .where(NodeDependency.parent_node_id.in_(frontier[start:start + _CHUNK_SIZE]))
+            ):
+                if node_id is not None:
+                    node_ids.add(node_id)
+                else:
+                    cluster_ids.add(cluster_id)
+        children = set()
+        for ids, column in ((sorted(node_ids), Node.id), (sorted(cluster_ids), Node.cluster_id)):
+            for start in range(0, len(ids), _CHUNK_SIZE):
+                children.update(db.execute(
+                    select(Node.id).where(column.in_(ids[start:start + _CHUNK_SIZE]), Node.upstream_down.is_(True))
+                ).scalars())
+        frontier = sorted(children - found)
+        found.update(frontier)
+    return sorted(found)
+
+
+@dataclass
+class UpstreamStats:
+    blocked: int = 0      # targets skipped because a node upstream was down
+    marked: int = 0       # nodes newly flagged upstream_down
+    cleared: int = 0      # flagged nodes probed again
+    released: List[int] = field(default_factory=list)   # flagged nodes behind parents that just recovered
+
+
+def write_upstream_state(db: Session, probe: TopologyProbe, checked_at: Optional[datetime] = None) -> UpstreamStats:
+    """
+    Flag blocked targets upstream_down and clear the flag on probed ones,
+    writing only the nodes that flip and leaving updated_at alone. Returns
+    the flagged nodes behind parents that recovered, for a bulk re-probe.
+    """
+    checked_at = checked_at or datetime.utcnow()
+    stats = UpstreamStats(blocked=len(probe.blocked))
+    mark = sorted(set(probe.blocked) - probe.marked)
+    clear = sorted({node_id for node_id, _ in probe.results} & probe.marked)
+
+    flipped = []
+    for node_ids, value in ((mark, True), (clear, False)):
+        for start in range(0, len(node_ids), _CHUNK_SIZE):
+            flipped.extend(db.execute(
+                update(_nodes)
+                .where(_nodes.c.id.in_(node_ids[start:start + _CHUNK_SIZE]), _nodes.c.upstream_down.isnot(value))
+                .values(upstream_down=value, updated_at=_nodes.c.updated_at)
+                .returning(_nodes.c.id, _nodes.c.cluster_id, _nodes.c.upstream_down)
+            ).all())
+    recovered = down_parents.recovered(probe.parents_up)
+    stats.released = marked_behind(db, recovered) if recovered else []
+    db.commit()
+
+    if flipped:
+        cache.invalidate("nodes")
+        publish_node_deltas([
+            make_delta(row.id, row.cluster_id, {"upstream_down": row.upstream_down}, checked_at) for row in flipped
+        ])
+    stats.marked = sum(1 for row in flipped if row.upstream_down)
+    stats.cleared = len(flipped) - stats.marked
+    if recovered:
+        logger.info("parents %s recovered, re-probing %d nodes behind them", recovered, len(stats.released))
+    return stats
+
+
+def parent_chain(db: Session, parent_id: int) -> Iterable[Tuple[int, int]]:
+    """(node_id, cluster_id) of a node and every node above it, nearest first."""
+    seen: Set[int] = set()
+    frontier = [parent_id]
+    while frontier:
+        rows = _load_nodes(db, frontier)
+        for row in rows:
+            yield row.id, row.cluster_id
+        seen.update(frontier)
+        found = _load_parents(db, {row.id: row.cluster_id for row in rows})
+        frontier = sorted({parent for ids in found.values() for parent in ids} - seen)
+
+
+def creates_cycle(db: Session, parent_node_id: int, node_id: Optional[int], cluster_id: Optional[int]) -> bool:
+    """Whether an edge from the node, or every node of the cluster, to the parent would close a loop."""
+    for ancestor_id, ancestor_cluster_id in parent_chain(db, parent_node_id):
+        if node_id is not None and ancestor_id == node_id:
+            return True
+        # The parent itself may live in the cluster; only nodes above it would loop
+        if cluster_id is not None and ancestor_cluster_id == cluster_id and ancestor_id != parent_node_id:
+            return True
+    return False
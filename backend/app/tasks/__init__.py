@@ -1,12 +1,24 @@
 from celery import Celery
 from app.core.config import settings
+from app.core.metrics import instrument_celery
 
 # Create Celery instance
 celery = Celery(
     "watchdog",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.tasks"]
+    include=[
+        "app.tasks",
+        "app.tasks.health",
+        "app.tasks.history",
+        "app.tasks.facts",
+        "app.tasks.scheduler",
+        "app.tasks.alerts",
+        "app.tasks.reports",
+        "app.tasks.checks",
+        "app.tasks.discovery",
+        "app.tasks.topology",
+    ],
 )
 
 # Configure Celery
@@ -16,8 +28,53 @@ celery.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        "rollup-health-history": {
+            "task": "app.tasks.history.rollup_health_history_task",
+            "schedule": settings.history_rollup_interval,
+        },
+        "collect-node-facts": {
+            "task": "app.tasks.facts.collect_facts_task",
+            "schedule": settings.fact_collection_interval,
+        },
+        "evaluate-alerts": {
+            "task": "app.tasks.alerts.evaluate_alerts_task",
+            "schedule": settings.alert_eval_interval,
+        },
+        # Picks up retries; fresh notifications are dispatched as soon as they are queued
+        "dispatch-alert-notifications": {
+            "task": "app.tasks.alerts.dispatch_alert_notifications_task",
+            "schedule": settings.alert_dispatch_interval,
+        },
+        "apply-test-reports": {
+            "task": "app.tasks.reports.apply_test_reports_task",
+            "schedule": settings.test_report_apply_interval,
+        },
+        "run-service-checks": {
+            "task": "app.tasks.checks.run_checks_task",
+            "schedule": settings.check_tick_interval,
+        },
+        "discover-nodes": {
+            "task": "app.tasks.discovery.discover_nodes_task",
+            "schedule": settings.discovery_tick_interval,
+        },
+    },
 )
 
+# Probing is driven by the adaptive per-node scheduler or the fixed-rate full
+# sweep; beat schedules neither when standalone probe agents (app.agent) run
+if not settings.probe_agents_enabled:
+    celery.conf.beat_schedule["probe-node-health"] = {
+        "task": "app.tasks.scheduler.scheduled_probe_task",
+        "schedule": settings.probe_scheduler_tick,
+    } if settings.probe_scheduler_enabled else {
+        "task": "app.tasks.health.sweep_health_task",
+        "schedule": settings.health_sweep_interval,
+    }
+
+if settings.metrics_enabled:
+    instrument_celery(celery)
+
 # Optional: Add some basic tasks
 @celery.task
 def ping_task():
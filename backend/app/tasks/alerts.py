@@ -0,0 +1,51 @@
+# backend/app/tasks/alerts.py
+import logging
+import time
+
+from redis.exceptions import LockError
+
+from app.db.session import SessionLocal
+from app.services.alerts import ClusterCounters, evaluate
+from app.services.notifications import NotificationQueue, dispatch
+from app.tasks import celery
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def evaluate_alerts_task():
+    """Evaluate alert rules against the per-cluster counters and queue grouped notifications."""
+    counters = ClusterCounters()
+    lock = counters.eval_lock()
+    if not lock.acquire():
+        return {"skipped": "previous evaluation still running"}
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        recounted = counters.refresh(db)
+        notifications, stats = evaluate(db, counters.snapshot())
+    finally:
+        db.close()
+        try:
+            lock.release()
+        except LockError:
+            # Held past its timeout, so another run may already own it
+            logger.warning("alert evaluation lock expired before the run finished")
+
+    stats["recounted"] = recounted
+    stats["queued"] = NotificationQueue().push(notifications)
+    if stats["queued"]:
+        dispatch_alert_notifications_task.delay()
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("alert evaluation: %s", stats)
+    return stats
+
+
+@celery.task
+def dispatch_alert_notifications_task():
+    """Send queued alert notifications to the configured sinks in batches."""
+    stats = dispatch(NotificationQueue())
+    if any(stats.values()):
+        logger.info("alert dispatch: %s", stats)
+    return stats
@@ -0,0 +1,48 @@
+# backend/app/tasks/checks.py
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+from redis.exceptions import LockError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.checks import load_due_jobs, run_lock, write_check_results
+from app.tasks import celery
+from app.utils.checks import check_all
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def run_checks_task():
+    """Run every due service check in one event loop and store the outcomes that changed."""
+    lock = run_lock()
+    if not lock.acquire():
+        return {"skipped": "previous run still in progress"}
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        jobs = load_due_jobs(db, datetime.utcnow())
+        if not jobs:
+            return {"checked": 0}
+        outcomes = check_all(
+            jobs,
+            concurrency=settings.check_concurrency,
+            per_host=settings.check_per_host,
+            deadline=settings.check_deadline,
+        )
+        stats = asdict(write_check_results(db, jobs, outcomes, datetime.utcnow()))
+    finally:
+        db.close()
+        try:
+            lock.release()
+        except LockError:
+            # Held past its timeout, so another run may already own it
+            logger.warning("service check run lock expired before the run finished")
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("service checks: %s", stats)
+    return stats
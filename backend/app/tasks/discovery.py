@@ -0,0 +1,57 @@
+# backend/app/tasks/discovery.py
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+from redis.exceptions import LockError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.discovery import apply_discovered, claim_due_targets, discovery_lock, record_stats
+from app.tasks import celery
+from app.utils.discovery import ReverseResolver, discover, parse_network
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def discover_nodes_task():
+    """Sweep every due discovery target and register the hosts that answer as nodes."""
+    lock = discovery_lock()
+    if not lock.acquire():
+        return {"skipped": "previous sweep still running"}
+
+    results = {}
+    try:
+        # Claim in a short transaction; nothing is held open while a range is swept
+        with SessionLocal() as db:
+            targets = claim_due_targets(db, datetime.utcnow())
+        for target in targets:
+            started = time.perf_counter()
+            try:
+                hosts = discover(
+                    [parse_network(target.cidr, settings.discovery_max_addresses)],
+                    target.ports,
+                    concurrency=settings.discovery_concurrency,
+                    rate=settings.discovery_rate,
+                    timeout=settings.discovery_timeout,
+                    resolver=ReverseResolver(settings.discovery_dns_concurrency, settings.discovery_dns_timeout),
+                )
+                with SessionLocal() as db:
+                    stats = asdict(apply_discovered(db, target.cluster_id, hosts))
+            except Exception as exc:
+                logger.exception("discovery of %s for cluster %s failed", target.cidr, target.cluster_id)
+                stats = {"error": str(exc)}
+            stats["seconds"] = round(time.perf_counter() - started, 3)
+            with SessionLocal() as db:
+                record_stats(db, target.id, stats)
+            results[target.cidr] = stats
+            logger.info("discovery of %s for cluster %s: %s", target.cidr, target.cluster_id, stats)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # Held past its timeout, so another run may already own it
+            logger.warning("discovery sweep lock expired before the run finished")
+    return results
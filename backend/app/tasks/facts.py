@@ -0,0 +1,33 @@
+# backend/app/tasks/facts.py
+import logging
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.facts import collector, load_fact_targets, write_changed_facts
+from app.tasks import celery
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def collect_facts_task():
+    """Collect OS/CPU/memory/disk facts over pooled SSH sessions and store what changed."""
+    started = time.perf_counter()
+    # Load in a short transaction; nothing is held open while the fleet is swept
+    with SessionLocal() as db:
+        targets = load_fact_targets(db)
+    outcomes = collector.collect(targets, settings.fact_collection_concurrency)
+    facts = {node_id: outcome for node_id, outcome in outcomes.items() if isinstance(outcome, dict)}
+    with SessionLocal() as db:
+        changed = write_changed_facts(db, facts)
+
+    stats = {
+        "nodes": len(targets),
+        "collected": len(facts),
+        "failed": len(targets) - len(facts),
+        "changed": changed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("fact collection: %s", stats)
+    return stats
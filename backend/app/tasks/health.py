@@ -0,0 +1,95 @@
+# backend/app/tasks/health.py
+import logging
+import time
+from datetime import datetime
+
+from celery import chord
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.health import load_targets, shard_bounds, write_probe_results
+from app.services.topology import probe_with_dependencies, write_upstream_state
+from app.tasks import celery
+from app.tasks.topology import reprobe
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def sweep_health_task():
+    """Split the node table into shards and probe them on the workers in parallel."""
+    db = SessionLocal()
+    try:
+        bounds = shard_bounds(db, settings.health_sweep_shard_size)
+    finally:
+        db.close()
+
+    if not bounds:
+        return {"shards": 0}
+
+    started = time.time()
+    chord(probe_shard_task.s(first_id, last_id) for first_id, last_id in bounds)(
+        summarize_sweep_task.s(started)
+    )
+    return {"shards": len(bounds)}
+
+
+@celery.task
+def probe_shard_task(first_id: int, last_id: int):
+    """
+    Probe one shard of nodes, parents first, and write the results back with
+    a single bulk UPDATE. Nodes behind a down parent are flagged instead.
+    """
+    started = time.perf_counter()
+    # Plain tuples from a short transaction; no connection sits idle in transaction while the shard is probed
+    with SessionLocal() as db:
+        targets = load_targets(db, first_id, last_id)
+    loaded = time.perf_counter()
+
+    with SessionLocal() as db:
+        probe = probe_with_dependencies(
+            db,
+            targets,
+            concurrency=settings.probe_concurrency,
+            timeout=settings.probe_timeout,
+            deadline=settings.probe_deadline,
+        )
+    probed = time.perf_counter()
+
+    checked_at = datetime.utcnow()
+    with SessionLocal() as db:
+        written = write_probe_results(db, probe.results, checked_at=checked_at)
+        upstream = write_upstream_state(db, probe, checked_at)
+    finished = time.perf_counter()
+    reprobe(upstream.released)
+
+    stats = {
+        "shard": [first_id, last_id],
+        "nodes": len(targets),
+        "alive": sum(1 for _, result in probe.results if result.alive),
+        "blocked": upstream.blocked,
+        "transitions": written.transitions,
+        "refreshed": written.refreshed,
+        "load_seconds": round(loaded - started, 4),
+        "probe_seconds": round(probed - loaded, 4),
+        "write_seconds": round(finished - probed, 4),
+        "total_seconds": round(finished - started, 4),
+    }
+    logger.info("health shard %s-%s: %s", first_id, last_id, stats)
+    return stats
+
+
+@celery.task
+def summarize_sweep_task(shard_stats, started: float):
+    """Log fleet-wide totals and the slowest shard once every shard has reported."""
+    summary = {
+        "shards": len(shard_stats),
+        "nodes": sum(stats["nodes"] for stats in shard_stats),
+        "alive": sum(stats["alive"] for stats in shard_stats),
+        "blocked": sum(stats.get("blocked", 0) for stats in shard_stats),
+        "transitions": sum(stats.get("transitions", 0) for stats in shard_stats),
+        "slowest_shard_seconds": max((stats["total_seconds"] for stats in shard_stats), default=0),
+        "wall_seconds": round(time.time() - started, 4),
+    }
+    logger.info("health sweep complete: %s", summary)
+    return summary
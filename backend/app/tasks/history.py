@@ -0,0 +1,25 @@
+# backend/app/tasks/history.py
+import logging
+
+from app.db.session import SessionLocal
+from app.services.history import RESOLUTIONS, prune, rollup
+from app.tasks import celery
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def rollup_health_history_task():
+    """Roll raw samples up to 1m, 1h and 1d buckets, then prune expired data."""
+    db = SessionLocal()
+    try:
+        rolled = {}
+        for resolution in RESOLUTIONS:
+            window = rollup(db, resolution)
+            if window:
+                rolled[resolution] = [window[0].isoformat(), window[1].isoformat()]
+        deleted = prune(db)
+    finally:
+        db.close()
+    logger.info("health history rollup: rolled=%s deleted=%s", rolled, deleted)
+    return {"rolled": rolled, "deleted": deleted}
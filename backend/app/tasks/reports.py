@@ -0,0 +1,36 @@
+# backend/app/tasks/reports.py
+import logging
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.reports import ReportQueue, apply_summaries
+from app.tasks import celery
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def apply_test_reports_task(max_batches: int = 20):
+    """Write queued test-report summaries and passing_unit_tests flips, a batch per transaction."""
+    queue = ReportQueue()
+    stats = {"summaries": 0, "stored": 0, "flipped": 0}
+    db = SessionLocal()
+    try:
+        for _ in range(max_batches):
+            batch = queue.pop(settings.test_report_batch)
+            if not batch:
+                break
+            try:
+                stored, flipped = apply_summaries(db, batch)
+            except Exception:
+                db.rollback()
+                queue.retry(batch)
+                raise
+            stats["summaries"] += len(batch)
+            stats["stored"] += stored
+            stats["flipped"] += flipped
+    finally:
+        db.close()
+    if stats["summaries"]:
+        logger.info("test reports applied: %s", stats)
+    return stats
@@ -0,0 +1,81 @@
+# backend/app/tasks/scheduler.py
+import logging
+import time
+from datetime import datetime
+
+from redis.exceptions import LockError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.health import load_targets_by_id, write_probe_results
+from app.services.scheduler import ProbeScheduler
+from app.services.topology import probe_with_dependencies, write_upstream_state
+from app.tasks import celery
+from app.utils.health import DEADLINE
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def scheduled_probe_task():
+    """Probe the nodes that are due according to the adaptive scheduler."""
+    scheduler = ProbeScheduler()
+    lock = scheduler.tick_lock()
+    if not lock.acquire():
+        return {"skipped": "previous tick still running"}
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if scheduler.needs_sync(db):
+            scheduler.sync(db)
+
+        due_ids = scheduler.due()
+        rows = {row.id: row for row in load_targets_by_id(db, due_ids)}
+        scheduler.forget(node_id for node_id in due_ids if node_id not in rows)
+
+        selected = scheduler.apply_cluster_caps(
+            [(node_id, rows[node_id].cluster_id) for node_id in due_ids if node_id in rows]
+        )
+        targets = [rows[node_id] for node_id in selected if rows[node_id].ip_address]
+        scheduler.postpone(
+            (node_id for node_id in selected if not rows[node_id].ip_address), settings.probe_max_interval
+        )
+
+        probe = probe_with_dependencies(
+            db,
+            [(row.id, row.ip_address, row.ssh_port or 22) for row in targets],
+            concurrency=settings.probe_concurrency,
+            timeout=settings.probe_timeout,
+            deadline=settings.probe_deadline,
+        )
+        checked_at = datetime.utcnow()
+        written = write_probe_results(db, probe.results, checked_at=checked_at)
+        upstream = write_upstream_state(db, probe, checked_at)
+        # A probe cut off by the deadline says nothing about the node, so it keeps its streak and interval
+        scheduler.reschedule([
+            (node_id, result.alive) for node_id, result in probe.results if result.error != DEADLINE
+        ])
+        scheduler.requeue(node_id for node_id, result in probe.results if result.error == DEADLINE)
+        # Blocked nodes wait for their parent; its recovery moves them to the front
+        scheduler.postpone(probe.blocked, settings.probe_max_interval)
+        scheduler.probe_now(upstream.released)
+    finally:
+        db.close()
+        try:
+            lock.release()
+        except LockError:
+            # Held past its timeout, so another run may already own it
+            logger.warning("probe tick lock expired before the run finished")
+
+    stats = {
+        "due": len(due_ids),
+        "probed": len(probe.results),
+        "blocked": upstream.blocked,
+        "released": len(upstream.released),
+        "deferred": len(due_ids) - len(selected),
+        "transitions": written.transitions,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("scheduled probes: %s", stats)
+    return stats
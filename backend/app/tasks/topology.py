@@ -0,0 +1,61 @@
+# backend/app/tasks/topology.py
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, List
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.health import load_targets_by_id, write_probe_results
+from app.services.scheduler import ProbeScheduler
+from app.services.topology import probe_with_dependencies, write_upstream_state
+from app.tasks import celery
+
+logger = logging.getLogger(__name__)
+
+
+def reprobe(node_ids: Iterable[int]) -> int:
+    """
+    Re-probe nodes in bulk, e.g. once the parent they sat behind is back or
+    on a probe-now request: on the next tick when the adaptive scheduler
+    drives probing, otherwise as shard-sized tasks.
+    """
+    node_ids = sorted(set(node_ids))
+    if not node_ids:
+        return 0
+    if settings.probe_scheduler_enabled and not settings.probe_agents_enabled:
+        return ProbeScheduler().probe_now(node_ids)
+    for start in range(0, len(node_ids), settings.health_sweep_shard_size):
+        reprobe_nodes_task.delay(node_ids[start:start + settings.health_sweep_shard_size])
+    return len(node_ids)
+
+
+@celery.task
+def reprobe_nodes_task(node_ids: List[int]):
+    """Probe specific nodes behind their parents and write the results."""
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        targets = [(row.id, row.ip_address, row.ssh_port or 22) for row in load_targets_by_id(db, node_ids) if row.ip_address]
+    with SessionLocal() as db:
+        probe = probe_with_dependencies(
+            db, targets,
+            concurrency=settings.probe_concurrency,
+            timeout=settings.probe_timeout,
+            deadline=settings.probe_deadline,
+        )
+    checked_at = datetime.utcnow()
+    with SessionLocal() as db:
+        written = write_probe_results(db, probe.results, checked_at=checked_at)
+        upstream = write_upstream_state(db, probe, checked_at)
+    reprobe(upstream.released)
+
+    stats = {
+        "nodes": len(targets),
+        "probed": len(probe.results),
+        "blocked": upstream.blocked,
+        "transitions": written.transitions,
+        "released": len(upstream.released),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("re-probed nodes: %s", stats)
+    return stats
@@ -0,0 +1,377 @@
+# backend/app/utils/checks.py
+"""
+Check plugins: service checks beyond the TCP connect in app.utils.health.
+
+A plugin is registered under its kind with @register. validate() normalizes
+a definition's params when it is saved and run() checks one node. Every
+check of a run shares one event loop and one CheckLimits, which bounds the
+connections open in total and to any single node.
+"""
+import asyncio
+import ssl
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from app.utils.health import DEADLINE, ERROR, classify, probe
+
+# Error classes reported in CheckOutcome.error, next to those of app.utils.health
+BAD_STATUS = "bad_status"
+BAD_BANNER = "bad_banner"
+TLS = "tls"
+CERT_EXPIRING = "cert_expiring"
+SLOW = "slow"
+UNKNOWN_KIND = "unknown_kind"
+
+_MAX_DETAIL = 255
+
+
+@dataclass
+class CheckOutcome:
+    ok: bool
+    latency_ms: Optional[float] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    detail: Optional[str] = None
+
+
+@dataclass
+class CheckJob:
+    """One check definition applied to one node."""
+    check_id: int
+    kind: str
+    params: Dict[str, Any]
+    timeout: float
+    node_id: int
+    cluster_id: int
+    address: str
+    ssh_port: int = 22
+
+
+class CheckLimits:
+    """Connection slots shared by every check in a run: a global cap and a per-host cap."""
+
+    def __init__(self, concurrency: int, per_host: int):
+        self._total = asyncio.Semaphore(max(1, concurrency))
+        self._per_host = max(1, per_host)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def connection(self, address: str):
+        host = self._hosts.get(address)
+        if host is None:
+            host = self._hosts[address] = asyncio.Semaphore(self._per_host)
+        async with host:
+            async with self._total:
+                yield
+
+
+def _error(exc: BaseException) -> str:
+    return TLS if isinstance(exc, ssl.SSLError) else classify(exc)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000.0, 3)
+
+
+def _port(value: Any, name: str = "port") -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 < value < 65536:
+        raise ValueError(f"{name} must be a TCP port number")
+    return value
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+
+
+class CheckPlugin:
+    kind = ""
+
+    def validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return normalized params, or raise ValueError."""
+        return dict(params)
+
+    async def run(self, job: CheckJob, limits: CheckLimits) -> CheckOutcome:
+        raise NotImplementedError
+
+
+PLUGINS: Dict[str, CheckPlugin] = {}
+
+
+def register(plugin: Type[CheckPlugin]) -> Type[CheckPlugin]:
+    PLUGINS[plugin.kind] = plugin()
+    return plugin
+
+
+@register
+class TcpCheck(CheckPlugin):
+    """TCP connects to a set of ports, e.g. {"ports": [80, 3306], "require": "all"}."""
+    kind = "tcp"
+
+    def validate(self, params):
+        ports = params.get("ports")
+        if not isinstance(ports, list) or not 0 < len(ports) <= 64:
+            raise ValueError("ports must be a list of 1 to 64 port numbers")
+        require = params.get("require", "all")
+        if require not in ("all", "any"):
+            raise ValueError("require must be all or any")
+        return {"ports": sorted({_port(port, "ports") for port in ports}), "require": require}
+
+    async def run(self, job, limits):
+        async def connect(port: int):
+            async with limits.connection(job.address):
+                return await probe(job.address, port, job.timeout)
+
+        results = await asyncio.gather(*(connect(port) for port in job.params["ports"]))
+        closed = [result for result in results if not result.alive]
+        ok = not closed if job.params.get("require", "all") == "all" else len(closed) < len(results)
+        latencies = [result.latency_ms for result in results if result.alive]
+        return CheckOutcome(
+            ok=ok,
+            latency_ms=max(latencies) if latencies else None,
+            error=None if ok else closed[0].error,
+            detail=", ".join(f"{result.port} {result.error}" for result in closed)[:_MAX_DETAIL] or None,
+        )
+
+
+def _tls_context(verify: bool) -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+@register
+class HttpCheck(CheckPlugin):
+    """
+    One HTTP GET, judged on status and optionally latency:
+    {"scheme": "http", "port": 80, "path": "/", "host": null,
+     "expect_status": [200], "max_latency_ms": null, "verify_tls": false}.
+    Without expect_status any 2xx or 3xx passes.
+    """
+    kind = "http"
+
+    def validate(self, params):
+        scheme = params.get("scheme", "http")
+        if scheme not in ("http", "https"):
+            raise ValueError("scheme must be http or https")
+        path = params.get("path", "/")
+        if not isinstance(path, str) or not path.startswith("/") or any(c in path for c in "\r\n "):
+            raise ValueError("path must be an absolute path without spaces")
+        expect = params.get("expect_status")
+        if expect is not None and (
+            not isinstance(expect, list) or not all(isinstance(code, int) and 100 <= code < 600 for code in expect)
+        ):
+            raise ValueError("expect_status must be a list of HTTP status codes")
+        max_latency_ms = params.get("max_latency_ms")
+        if max_latency_ms is not None and not (isinstance(max_latency_ms, (int, float)) and max_latency_ms > 0):
+            raise ValueError("max_latency_ms must be positive")
+        host = params.get("host")
+        if host is not None and (not isinstance(host, str) or any(c in host for c in "\r\n /")):
+            raise ValueError("host must be a host name")
+        return {
+            "scheme": scheme,
+            "port": _port(params.get("port", 443 if scheme == "https" else 80)),
+            "path": path,
+            "host": host,
+            "expect_status": expect,
+            "max_latency_ms": max_latency_ms,
+            "verify_tls": bool(params.get("verify_tls", False)),
+        }
+
+    async def _get(self, job: CheckJob) -> int:
+        params = job.params
+        https = params["scheme"] == "https"
+        host = params.get("host") or job.address
+        reader, writer = await asyncio.open_connection(
+            job.address,
+            params["port"],
+            ssl=_tls_context(params.get("verify_tls", False)) if https else None,
+            server_hostname=host if https else None,
+        )
+        try:
+            writer.write(
+                f"GET {params['path']} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: watchdog-check\r\n"
+                f"Accept: */*\r\nConnection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+            # Only the status line matters; the body is never read
+            status_line = (await reader.readline()).decode("latin-1").split()
+        finally:
+            await _close(writer)
+        if len(status_line) < 2 or not status_line[0].startswith("HTTP/") or not status_line[1].isdigit():
+            raise ValueError("not an HTTP response")
+        return int(status_line[1])
+
+    async def run(self, job, limits):
+        async with limits.connection(job.address):
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(self._get(job), job.timeout)
+            except Exception as exc:
+                return CheckOutcome(False, error=_error(exc), detail=str(exc)[:_MAX_DETAIL] or None)
+            latency_ms = _elapsed_ms(start)
+
+        expect = job.params.get("expect_status")
+        if not (status in expect if expect else 200 <= status < 400):
+            return CheckOutcome(False, latency_ms, status, BAD_STATUS)
+        max_latency_ms = job.params.get("max_latency_ms")
+        if max_latency_ms and latency_ms > max_latency_ms:
+            return CheckOutcome(False, latency_ms, status, SLOW)
+        return CheckOutcome(True, latency_ms, status)
+
+
+@register
+class TlsCheck(CheckPlugin):
+    """
+    TLS handshake, certificate validity and days to expiry:
+    {"port": 443, "server_name": null, "verify": true, "min_days_valid": 14}.
+    Expiry is only known when the certificate is verified.
+    """
+    kind = "tls"
+
+    def validate(self, params):
+        server_name = params.get("server_name")
+        if server_name is not None and not isinstance(server_name, str):
+            raise ValueError("server_name must be a host name")
+        min_days_valid = params.get("min_days_valid", 14)
+        if not isinstance(min_days_valid, (int, float)) or min_days_valid < 0:
+            raise ValueError("min_days_valid must be zero or more")
+        return {
+            "port": _port(params.get("port", 443)),
+            "server_name": server_name,
+            "verify": bool(params.get("verify", True)),
+            "min_days_valid": min_days_valid,
+        }
+
+    async def _handshake(self, job: CheckJob) -> ssl.SSLObject:
+        _, writer = await asyncio.open_connection(
+            job.address,
+            job.params["port"],
+            ssl=_tls_context(job.params.get("verify", True)),
+            server_hostname=job.params.get("server_name") or job.address,
+        )
+        tls = writer.get_extra_info("ssl_object")
+        await _close(writer)
+        return tls
+
+    async def run(self, job, limits):
+        async with limits.connection(job.address):
+            start = time.perf_counter()
+            try:
+                tls = await asyncio.wait_for(self._handshake(job), job.timeout)
+            except Exception as exc:
+                return CheckOutcome(False, error=_error(exc), detail=str(exc)[:_MAX_DETAIL] or None)
+            latency_ms = _elapsed_ms(start)
+
+        certificate = tls.getpeercert()
+        if not certificate or "notAfter" not in certificate:
+            return CheckOutcome(True, latency_ms, detail=tls.version())
+        days = (ssl.cert_time_to_seconds(certificate["notAfter"]) - time.time()) / 86400
+        detail = f"{tls.version()}, certificate expires in {days:.0f} days"
+        if days < job.params.get("min_days_valid", 14):
+            return CheckOutcome(False, latency_ms, error=CERT_EXPIRING, detail=detail)
+        return CheckOutcome(True, latency_ms, detail=detail)
+
+
+@register
+class SshBannerCheck(CheckPlugin):
+    """
+    Reads the SSH identification line: {"port": null, "expect": "SSH-2.0-"}.
+    The port defaults to the node's ssh_port.
+    """
+    kind = "ssh_banner"
+
+    _MAX_PRELUDE = 5   # servers may send a few lines before the banner
+
+    def validate(self, params):
+        port = params.get("port")
+        expect = params.get("expect", "SSH-2.0-")
+        if not isinstance(expect, str) or not expect:
+            raise ValueError("expect must be a banner prefix")
+        return {"port": None if port is None else _port(port), "expect": expect}
+
+    async def _banner(self, job: CheckJob) -> str:
+        reader, writer = await asyncio.open_connection(job.address, job.params.get("port") or job.ssh_port)
+        try:
+            # The banner, or else the first line seen, so a failure shows what answered instead
+            first = ""
+            for _ in range(self._MAX_PRELUDE):
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").strip()
+                if line.startswith("SSH-"):
+                    return line
+                first = first or line
+            return first
+        finally:
+            await _close(writer)
+
+    async def run(self, job, limits):
+        async with limits.connection(job.address):
+            start = time.perf_counter()
+            try:
+                banner = await asyncio.wait_for(self._banner(job), job.timeout)
+            except Exception as exc:
+                return CheckOutcome(False, error=_error(exc))
+            latency_ms = _elapsed_ms(start)
+        ok = banner.startswith(job.params.get("expect", "SSH-2.0-"))
+        return CheckOutcome(ok, latency_ms, error=None if ok else BAD_BANNER, detail=banner[:_MAX_DETAIL] or None)
+
+
+async def check_many(
+    jobs: Iterable[CheckJob],
+    concurrency: int = 500,
+    per_host: int = 4,
+    deadline: Optional[float] = None,
+) -> List[CheckOutcome]:
+    """
+    Run every job concurrently under shared connection limits.
+
+    Outcomes come back in the same order as jobs; checks cut off by the
+    deadline are reported as failed with error "deadline".
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    limits = CheckLimits(concurrency, per_host)
+
+    async def run(job: CheckJob) -> CheckOutcome:
+        plugin = PLUGINS.get(job.kind)
+        if plugin is None:
+            return CheckOutcome(False, error=UNKNOWN_KIND, detail=job.kind)
+        return await plugin.run(job, limits)
+
+    tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    outcomes = []
+    for task in tasks:
+        if task.cancelled():
+            outcomes.append(CheckOutcome(False, error=DEADLINE))
+        elif task.exception() is not None:
+            outcomes.append(CheckOutcome(False, error=ERROR, detail=str(task.exception())[:_MAX_DETAIL] or None))
+        else:
+            outcomes.append(task.result())
+    return outcomes
+
+
+def check_all(
+    jobs: Iterable[CheckJob],
+    concurrency: int = 500,
+    per_host: int = 4,
+    deadline: Optional[float] = None,
+) -> List[CheckOutcome]:
+    """Blocking entry point for check_many, for use outside an event loop."""
+    return asyncio.run(check_many(jobs, concurrency, per_host, deadline))
@@ -0,0 +1,166 @@
+# backend/app/utils/discovery.py
+import asyncio
+import ipaddress
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from app.utils.health import probe
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@dataclass
+class DiscoveredHost:
+    address: str
+    open_ports: List[int] = field(default_factory=list)
+    hostname: Optional[str] = None
+
+
+def parse_network(cidr: str, max_addresses: int) -> Network:
+    """Parse a CIDR range, rejecting ones with more than max_addresses addresses."""
+    try:
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+    except ValueError as exc:
+        raise ValueError(f"Invalid CIDR range {cidr!r}: {exc}")
+    if network.num_addresses > max_addresses:
+        raise ValueError(f"{network} has {network.num_addresses} addresses; the limit is {max_addresses}")
+    return network
+
+
+def addresses(networks: Iterable[Network]) -> Iterator[str]:
+    """Every usable host address of the networks, each once, generated lazily."""
+    seen = set()
+    for network in networks:
+        for address in network.hosts() if network.num_addresses > 2 else network:
+            if address not in seen:
+                seen.add(address)
+                yield str(address)
+
+
+class RateLimiter:
+    """Spaces out calls to at most rate per second across every task of one event loop."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        self._next = max(self._next, now)
+        delay = self._next - now
+        self._next += self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def sweep(
+    hosts: Iterable[str],
+    ports: Sequence[int],
+    concurrency: int = 1000,
+    rate: float = 5000.0,
+    timeout: float = 0.5,
+) -> List[DiscoveredHost]:
+    """
+    TCP-connect every port of every host and return the hosts with an open
+    port. A fixed pool of workers pulls addresses from the iterator, so a /16
+    never has more than `concurrency` hosts in flight, and every connect
+    waits its turn on a shared rate limit.
+    """
+    limiter = RateLimiter(rate)
+    pending = iter(hosts)
+    found: List[DiscoveredHost] = []
+
+    async def worker():
+        for address in pending:
+            open_ports = []
+            for port in ports:
+                await limiter.wait()
+                if (await probe(address, port, timeout)).alive:
+                    open_ports.append(port)
+            if open_ports:
+                found.append(DiscoveredHost(address, open_ports))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    found.sort(key=lambda host: ipaddress.ip_address(host.address))
+    return found
+
+
+def _normalize_hostname(name: str) -> Optional[str]:
+    name = name.strip().rstrip(".").lower()
+    # getnameinfo hands the address back when there is no PTR record
+    try:
+        ipaddress.ip_address(name)
+        return None
+    except ValueError:
+        return name or None
+
+
+class ReverseResolver:
+    """
+    Reverse DNS for many addresses at once. Lookups go through the system
+    resolver on a dedicated thread pool, so /etc/hosts and nsswitch apply,
+    at most `concurrency` at a time and each bounded by `timeout`.
+    """
+
+    def __init__(self, concurrency: int = 64, timeout: float = 2.0):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+    async def resolve(self, addresses: Sequence[str]) -> Dict[str, Optional[str]]:
+        if not addresses:
+            return {}
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="rdns")
+
+        async def lookup(address: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    name, _ = await asyncio.wait_for(
+                        loop.run_in_executor(executor, socket.getnameinfo, (address, 0), socket.NI_NAMEREQD),
+                        self.timeout,
+                    )
+                except (OSError, asyncio.TimeoutError):
+                    return None
+                return _normalize_hostname(name)
+
+        try:
+            names = await asyncio.gather(*(lookup(address) for address in addresses))
+        finally:
+            # Lookups that timed out may still hold a thread; don't wait for them
+            executor.shutdown(wait=False, cancel_futures=True)
+        return dict(zip(addresses, names))
+
+
+async def discover_many(
+    networks: Sequence[Network],
+    ports: Sequence[int],
+    concurrency: int = 1000,
+    rate: float = 5000.0,
+    timeout: float = 0.5,
+    resolver: Optional[ReverseResolver] = None,
+) -> List[DiscoveredHost]:
+    """Sweep the networks, then reverse-resolve the hosts that answered in one batch."""
+    found = await sweep(addresses(networks), ports, concurrency, rate, timeout)
+    if resolver is not None:
+        names = await resolver.resolve([host.address for host in found])
+        for host in found:
+            host.hostname = names.get(host.address)
+    return found
+
+
+def discover(
+    networks: Sequence[Network],
+    ports: Sequence[int],
+    concurrency: int = 1000,
+    rate: float = 5000.0,
+    timeout: float = 0.5,
+    resolver: Optional[ReverseResolver] = None,
+) -> List[DiscoveredHost]:
+    """Blocking entry point for discover_many, for use outside an event loop."""
+    return asyncio.run(discover_many(networks, ports, concurrency, rate, timeout, resolver))
@@ -1,13 +1,127 @@
 # backend/app/utils/health.py
+import asyncio
+import errno
 import socket
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+# Error classes reported in ProbeResult.error
+TIMEOUT = "timeout"
+DEADLINE = "deadline"
+REFUSED = "refused"
+UNREACHABLE = "unreachable"
+DNS = "dns"
+ERROR = "error"
+
+_UNREACHABLE_ERRNOS = {
+    errno.ENETUNREACH,
+    errno.EHOSTUNREACH,
+    errno.ENETDOWN,
+    getattr(errno, "EHOSTDOWN", errno.EHOSTUNREACH),
+}
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of a single TCP connect probe."""
+    address: str
+    port: int
+    alive: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+def classify(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return TIMEOUT
+    if isinstance(exc, socket.gaierror):
+        return DNS
+    if isinstance(exc, ConnectionRefusedError):
+        return REFUSED
+    if isinstance(exc, OSError) and exc.errno in _UNREACHABLE_ERRNOS:
+        return UNREACHABLE
+    return ERROR
+
+
+async def probe(address: str, port: int = 22, timeout: float = 0.5) -> ProbeResult:
+    """
+    Attempt one TCP connect to (address, port) and report latency or the error class.
+    """
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+    except Exception as exc:
+        return ProbeResult(address, port, False, error=classify(exc))
+
+    latency_ms = (time.perf_counter() - start) * 1000.0
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return ProbeResult(address, port, True, latency_ms=round(latency_ms, 3))
+
+
+async def probe_many(
+    targets: Iterable[Tuple[str, int]],
+    concurrency: int = 1000,
+    timeout: float = 0.5,
+    deadline: Optional[float] = None,
+) -> List[ProbeResult]:
+    """
+    Probe every (address, port) pair concurrently.
+
+    At most `concurrency` connects are in flight at once, each one is bounded by
+    `timeout` seconds and the whole sweep by `deadline` seconds. Results come back
+    in the same order as `targets`; probes cut off by the deadline are reported as
+    down with error "deadline".
+    """
+    targets = list(targets)
+    if not targets:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(address: str, port: int) -> ProbeResult:
+        async with semaphore:
+            return await probe(address, port, timeout)
+
+    tasks = [asyncio.ensure_future(bounded(address, port)) for address, port in targets]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for (address, port), task in zip(targets, tasks):
+        if task.cancelled() or task.exception() is not None:
+            results.append(ProbeResult(address, port, False, error=DEADLINE))
+        else:
+            results.append(task.result())
+    return results
+
+
+def probe_all(
+    targets: Iterable[Tuple[str, int]],
+    concurrency: int = 1000,
+    timeout: float = 0.5,
+    deadline: Optional[float] = None,
+) -> List[ProbeResult]:
+    """Blocking entry point for probe_many, for use outside an event loop."""
+    return asyncio.run(probe_many(targets, concurrency, timeout, deadline))
+
 
 def is_alive(address: str, port: int = 22, timeout: float = 0.5) -> bool:
     """
     Return True if a TCP connect to (address, port) succeeds within timeout.
+
+    A plain blocking connect, so it works in threads and inside a running
+    event loop alike; use probe_many/probe_all for more than a handful.
     """
     try:
         with socket.create_connection((address, port), timeout):
             return True
     except Exception:
         return False
-
@@ -0,0 +1,153 @@
+# backend/app/utils/ssh.py
+import asyncio
+import errno
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple, Union
+
+import asyncssh
+
+# Out of file descriptors: closing idle sessions frees some, so the command is worth retrying
+_DESCRIPTOR_ERRNOS = (errno.EMFILE, errno.ENFILE)
+
+
+@dataclass(frozen=True)
+class SSHTarget:
+    host: str
+    port: int = 22
+    username: str = "root"
+    key_path: Optional[str] = None
+
+
+class SSHPool:
+    """
+    Bounded LRU pool of persistent SSH connections, one per key (usually node id).
+
+    Commands run as new channels on an existing connection, so only the first
+    command to a node pays for the TCP and SSH handshake. When the pool is full
+    the least recently used idle connection is closed to make room, keeping
+    the worker's open sockets well under its file descriptor limit.
+
+    known_hosts follows asyncssh: () checks host keys against
+    ~/.ssh/known_hosts, a path uses that file and None accepts any key.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 200,
+        idle_timeout: float = 1800.0,
+        connect_timeout: float = 10.0,
+        password: Optional[str] = None,
+        known_hosts: Union[str, Tuple[()], None] = (),
+    ):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.password = password
+        self.known_hosts = known_hosts
+        self._connections: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._busy: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._connections
+
+    async def _connect(self, target: SSHTarget) -> asyncssh.SSHClientConnection:
+        options = {
+            "port": target.port,
+            "username": target.username,
+            "known_hosts": self.known_hosts,
+            "connect_timeout": self.connect_timeout,
+            "keepalive_interval": 60,
+        }
+        if target.key_path:
+            options["client_keys"] = [target.key_path]
+        if self.password:
+            options["password"] = self.password
+        return await asyncssh.connect(target.host, **options)
+
+    async def connection(self, key: Hashable, target: SSHTarget) -> asyncssh.SSHClientConnection:
+        """Return a live connection for key, opening one if needed."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._connections.get(key)
+            if entry is not None:
+                conn, cached_target, _ = entry
+                if cached_target == target and not conn.is_closed():
+                    self._connections[key] = (conn, target, time.monotonic())
+                    self._connections.move_to_end(key)
+                    return conn
+                await self.discard(key)
+
+            conn = await self._connect(target)
+            self._connections[key] = (conn, target, time.monotonic())
+            await self._evict()
+            return conn
+
+    async def _evict(self, excess: Optional[int] = None) -> None:
+        # Close least recently used connections that have no command in flight
+        if excess is None:
+            excess = len(self._connections) - self.max_connections
+        for key in list(self._connections):
+            if excess <= 0:
+                break
+            if not self._busy.get(key):
+                await self.discard(key)
+                excess -= 1
+
+    def _forget_lock(self, key: Hashable) -> None:
+        # A key's lock is only needed while it has a connection or a command waiting on one
+        if key not in self._connections and not self._busy.get(key):
+            self._locks.pop(key, None)
+
+    async def run(self, key: Hashable, target: SSHTarget, command: str, timeout: float = 20.0) -> str:
+        """
+        Run command over the pooled connection and return stdout.
+
+        A connection that died since its last use is reopened once. Running
+        out of file descriptors closes a tenth of the pool's idle connections
+        before the one retry.
+        """
+        for attempt in (0, 1):
+            self._busy[key] = self._busy.get(key, 0) + 1
+            try:
+                conn = await self.connection(key, target)
+                result = await asyncio.wait_for(conn.run(command, check=False), timeout)
+                return result.stdout or ""
+            except (asyncssh.ConnectionLost, asyncssh.DisconnectError, asyncssh.ChannelOpenError, BrokenPipeError):
+                await self.discard(key)
+                if attempt:
+                    raise
+            except OSError as exc:
+                if attempt or exc.errno not in _DESCRIPTOR_ERRNOS:
+                    raise
+                await self._evict(max(1, len(self._connections) // 10))
+            finally:
+                self._busy[key] -= 1
+                if not self._busy[key]:
+                    del self._busy[key]
+                self._forget_lock(key)
+        return ""
+
+    async def discard(self, key: Hashable) -> None:
+        entry = self._connections.pop(key, None)
+        if entry is not None:
+            entry[0].close()
+        self._forget_lock(key)
+
+    async def close_idle(self) -> int:
+        """Close connections unused for longer than idle_timeout, then trim back to max_connections."""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [key for key, (_, _, last_used) in self._connections.items() if last_used < cutoff]
+        for key in idle:
+            await self.discard(key)
+        await self._evict()
+        return len(idle)
+
+    async def close(self) -> None:
+        for key in list(self._connections):
+            await self.discard(key)
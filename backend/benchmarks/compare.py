@@ -0,0 +1,64 @@
+# backend/benchmarks/compare.py
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Metric -> True when higher is better
+METRICS = {"throughput": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+Key = Tuple[str, str, int]
+
+
+def load(path: str, commit: Optional[str] = None) -> Dict[Key, Dict]:
+    """Last record per (suite, benchmark, concurrency), optionally for one commit prefix."""
+    records: Dict[Key, Dict] = {}
+    with open(path) as results:
+        for line in results:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if commit and not (record.get("commit") or "").startswith(commit):
+                continue
+            records[(record["suite"], record["benchmark"], record["concurrency"])] = record
+    return records
+
+
+def compare(base: Dict[Key, Dict], head: Dict[Key, Dict], threshold: float) -> List[Dict]:
+    """Relative change per metric for every benchmark present in both runs."""
+    rows = []
+    for key in sorted(set(base) & set(head)):
+        for metric, higher_is_better in METRICS.items():
+            before, after = base[key].get(metric), head[key].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            rows.append({
+                "suite": key[0], "benchmark": key[1], "concurrency": key[2], "metric": metric,
+                "base": before, "head": after, "change": round(change, 4), "regression": worse > threshold,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs and flag regressions")
+    parser.add_argument("base", help="JSON lines from benchmarks.run")
+    parser.add_argument("head", nargs="?", help="second results file; defaults to base")
+    parser.add_argument("--base-commit", help="commit prefix to select from the base file")
+    parser.add_argument("--head-commit", help="commit prefix to select from the head file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    rows = compare(
+        load(args.base, args.base_commit), load(args.head or args.base, args.head_commit), args.threshold
+    )
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['suite']:<6} {row['benchmark']:<24} c={row['concurrency']:<5} {row['metric']:<10} "
+              f"{row['base']:>10} -> {row['head']:>10} {row['change']:+.1%} {flag}")
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
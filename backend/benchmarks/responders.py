@@ -0,0 +1,172 @@
+# backend/benchmarks/responders.py
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+
+BANNER = b"SSH-2.0-OpenSSH_9.6 watchdog-bench\r\n"
+
+
+def assign_targets(spec: Dict, count: int) -> List[Tuple[str, int]]:
+    """
+    Deterministically map `count` nodes onto a farm described by spec.
+
+    A `loss` fraction go to the blackhole port (connects time out), a
+    `refused` fraction to the closed port, and the rest round-robin over the
+    responder ports.
+    """
+    rng = random.Random(spec.get("seed", 0))
+    host, ports = spec["host"], spec["ports"]
+    targets = []
+    for index in range(count):
+        roll = rng.random()
+        if roll < spec.get("loss", 0.0):
+            targets.append((host, spec["blackhole"]))
+        elif roll < spec.get("loss", 0.0) + spec.get("refused", 0.0):
+            targets.append((host, spec["closed"]))
+        else:
+            targets.append((host, ports[index % len(ports)]))
+    return targets
+
+
+class ResponderFarm:
+    """
+    Local stand-ins for a fleet's SSH ports.
+
+    Each responder port accepts connections and sends an SSH banner after
+    latency_ms +/- jitter_ms. Lost targets point at a listener whose accept
+    queue is kept full, so the kernel drops their SYNs and connects time out;
+    refused targets point at a bound port that is not listening. The kernel
+    completes TCP handshakes itself, so injected latency shows up when reading
+    the banner (the SSH path), not in bare connect probes.
+    """
+
+    def __init__(
+        self,
+        ports: int = 50,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        loss: float = 0.0,
+        refused: float = 0.0,
+        host: str = "127.0.0.1",
+        seed: int = 0,
+    ):
+        self.port_count = ports
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.refused = refused
+        self.host = host
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._servers: List[asyncio.AbstractServer] = []
+        self._sockets: List[socket.socket] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.ports: List[int] = []
+        self.blackhole: Optional[int] = None
+        self.closed: Optional[int] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(BANNER)
+            await writer.drain()
+            # Hold the session open until the client hangs up
+            await asyncio.wait_for(reader.read(), timeout=30)
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "ResponderFarm":
+        for _ in range(self.port_count):
+            server = await asyncio.start_server(self._handle, self.host, 0, backlog=4096)
+            self._servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+
+        blackhole = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        blackhole.bind((self.host, 0))
+        blackhole.listen(0)
+        self.blackhole = blackhole.getsockname()[1]
+        self._sockets.append(blackhole)
+        # Fill the accept queue so further SYNs are dropped
+        for _ in range(2):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex((self.host, self.blackhole))
+            self._sockets.append(filler)
+
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind((self.host, 0))
+        self.closed = closed.getsockname()[1]
+        self._sockets.append(closed)
+        return self
+
+    async def stop(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for sock in self._sockets:
+            sock.close()
+        self._servers, self._sockets = [], []
+
+    def spec(self) -> Dict:
+        return {
+            "host": self.host,
+            "ports": self.ports,
+            "blackhole": self.blackhole,
+            "closed": self.closed,
+            "loss": self.loss,
+            "refused": self.refused,
+            "seed": self.seed,
+        }
+
+    def targets(self, count: int) -> List[Tuple[str, int]]:
+        return assign_targets(self.spec(), count)
+
+    def start_in_thread(self) -> "ResponderFarm":
+        """Run the farm on a background event loop so blocking code can probe it."""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="responder-farm", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+    def stop_thread(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+async def _serve(args) -> None:
+    farm = await ResponderFarm(
+        ports=args.ports, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        loss=args.loss, refused=args.refused, host=args.host, seed=args.seed,
+    ).start()
+    print(json.dumps(farm.spec()), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await farm.stop()
+
+
+if __name__ == "__main__":
+    # Prints the farm spec as JSON, then serves until interrupted;
+    # pass the spec to `python -m benchmarks.seed --farm-spec` to point nodes at it.
+    parser = argparse.ArgumentParser(description="Fake SSH responder farm for probe benchmarks")
+    parser.add_argument("--ports", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--refused", type=float, default=0.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--seed", type=int, default=0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
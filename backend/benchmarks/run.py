@@ -0,0 +1,334 @@
+# backend/benchmarks/run.py
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.host import Cluster, Node
+from app.services.bulk import update_grouped
+from app.services.health import shard_bounds
+from app.tasks.health import probe_shard_task
+from app.utils.health import probe_all
+from benchmarks.responders import BANNER, ResponderFarm
+from benchmarks.seed import CLUSTER_PREFIX, reset_fleet, seed_fleet
+
+# (method, url, request kwargs) for one API call
+Call = Tuple[str, str, Dict]
+
+
+def git_revision() -> Dict:
+    """Commit the results belong to, so runs can be compared across commits."""
+    root = Path(__file__).resolve().parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def raise_fd_limit() -> int:
+    """Probing thousands of sockets at once needs more than the usual 1024 descriptors."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def percentiles(samples_ms: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not samples_ms:
+        return {"p50_ms": None, "p90_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None, "mean_ms": None}
+    ordered = sorted(samples_ms)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {
+        "p50_ms": at(0.50),
+        "p90_ms": at(0.90),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+async def drive(client: httpx.AsyncClient, make_call: Callable[[], Call], total: int, concurrency: int) -> Dict:
+    """Issue `total` calls from `concurrency` workers and summarize latency and throughput."""
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal errors, issued
+        while issued < total:
+            issued += 1
+            method, url, kwargs = make_call()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else None,
+        **percentiles(latencies),
+    }
+
+
+def api_scenarios(node_ids: Sequence[int], rng: random.Random) -> Dict[str, Tuple[Callable[[], Call], int]]:
+    """Benchmark name -> (call factory, weight dividing the request count)."""
+
+    def bulk_patch() -> Call:
+        body = "\n".join(
+            json.dumps({"id": node_id, "notes": f"bench {rng.random():.6f}"})
+            for node_id in rng.sample(node_ids, min(1000, len(node_ids)))
+        )
+        return "PATCH", "/api/nodes/bulk", {"content": body, "headers": {"content-type": "application/x-ndjson"}}
+
+    return {
+        "list_clusters": (lambda: ("GET", "/api/clusters?limit=50", {}), 1),
+        "list_clusters_no_nodes": (lambda: ("GET", "/api/clusters?include_nodes=false", {}), 1),
+        "list_clusters_fields": (lambda: ("GET", "/api/clusters?limit=50&fields=name,is_alive", {}), 1),
+        "list_clusters_msgpack": (lambda: ("GET", "/api/clusters?limit=50&format=msgpack", {}), 1),
+        "list_clusters_uncompressed": (
+            lambda: ("GET", "/api/clusters?limit=50", {"headers": {"accept-encoding": "identity"}}), 1
+        ),
+        "cluster_summary": (lambda: ("GET", "/api/clusters/summary", {}), 1),
+        "get_node": (lambda: ("GET", f"/api/nodes/{rng.choice(node_ids)}", {}), 1),
+        "bulk_patch": (bulk_patch, 20),
+    }
+
+
+async def run_api(
+    api_url: Optional[str], node_ids: Sequence[int], levels: Sequence[int], total: int, only: Optional[set], seed: int
+) -> List[Dict]:
+    if api_url:
+        transport = None
+        base_url = api_url
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    rng = random.Random(seed)
+    records = []
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=120) as client:
+        for name, (make_call, weight) in api_scenarios(node_ids, rng).items():
+            if only and name not in only:
+                continue
+            await drive(client, make_call, min(levels), min(levels))  # warm-up
+            for concurrency in levels:
+                stats = await drive(client, make_call, max(concurrency, total // weight), concurrency)
+                records.append({"suite": "api", "benchmark": name, "concurrency": concurrency, **stats})
+                print(f"api {name:<24} c={concurrency:<4} {stats['throughput']} req/s p95={stats['p95_ms']}ms",
+                      file=sys.stderr)
+    return records
+
+
+async def _banner_probe(address: str, port: int, timeout: float) -> Optional[float]:
+    """Connect and read the SSH banner, as the first step of an SSH session would."""
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return (time.perf_counter() - start) * 1000.0 if line == BANNER else None
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+
+
+async def _banner_sweep(targets: Sequence[Tuple[str, int]], concurrency: int, timeout: float) -> List[Optional[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(address: str, port: int):
+        async with semaphore:
+            return await _banner_probe(address, port, timeout)
+
+    return await asyncio.gather(*(bounded(address, port) for address, port in targets))
+
+
+def run_probes(targets: Sequence[Tuple[str, int]], levels: Sequence[int], timeout: float) -> List[Dict]:
+    records = []
+    for concurrency in levels:
+        started = time.perf_counter()
+        results = probe_all(targets, concurrency=concurrency, timeout=timeout)
+        elapsed = time.perf_counter() - started
+        stats = {
+            "targets": len(targets),
+            "alive": sum(1 for result in results if result.alive),
+            "seconds": round(elapsed, 4),
+            "throughput": round(len(targets) / elapsed, 2),
+            **percentiles([result.latency_ms for result in results if result.latency_ms is not None]),
+        }
+        records.append({"suite": "probe", "benchmark": "tcp_connect", "concurrency": concurrency, **stats})
+        print(f"probe tcp_connect c={concurrency:<5} {stats['throughput']} targets/s", file=sys.stderr)
+
+        started = time.perf_counter()
+        banners = asyncio.run(_banner_sweep(targets, concurrency, timeout))
+        elapsed = time.perf_counter() - started
+        stats = {
+            "targets": len(targets),
+            "alive": sum(1 for latency in banners if latency is not None),
+            "seconds": round(elapsed, 4),
+            "throughput": round(len(targets) / elapsed, 2),
+            **percentiles([latency for latency in banners if latency is not None]),
+        }
+        records.append({"suite": "probe", "benchmark": "ssh_banner", "concurrency": concurrency, **stats})
+        print(f"probe ssh_banner  c={concurrency:<5} {stats['throughput']} targets/s", file=sys.stderr)
+    return records
+
+
+def run_health_shards(shard_size: int) -> List[Dict]:
+    """Run the health sweep's shard task inline over the whole seeded fleet."""
+    db = SessionLocal()
+    try:
+        bounds = shard_bounds(db, shard_size)
+    finally:
+        db.close()
+    started = time.perf_counter()
+    shards = [probe_shard_task(first_id, last_id) for first_id, last_id in bounds]
+    elapsed = time.perf_counter() - started
+    nodes = sum(shard["nodes"] for shard in shards)
+    record = {
+        "suite": "probe",
+        "benchmark": "health_shards",
+        "concurrency": settings.probe_concurrency,
+        "shards": len(shards),
+        "targets": nodes,
+        "alive": sum(shard["alive"] for shard in shards),
+        "seconds": round(elapsed, 4),
+        "throughput": round(nodes / elapsed, 2) if elapsed else None,
+    }
+    for phase in ("load", "probe", "write"):
+        record[f"{phase}_seconds"] = round(sum(shard[f"{phase}_seconds"] for shard in shards), 4)
+    print(f"probe health_shards {record['throughput']} nodes/s", file=sys.stderr)
+    return [record]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Watchdog API and probe paths")
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--nodes-per-cluster", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated API concurrency levels")
+    parser.add_argument("--probe-concurrency", default="100,1000", help="comma-separated probe concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per API benchmark and level")
+    parser.add_argument("--api-url", help="benchmark a running server instead of the app in-process")
+    parser.add_argument("--only", help="comma-separated API benchmark names to run")
+    parser.add_argument("--skip", default="", help="comma-separated suites to skip: api, probe, health")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache (in-process only)")
+    parser.add_argument("--reuse", action="store_true", help="keep an existing seeded fleet instead of reseeding")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (SQLite, scratch databases)")
+    parser.add_argument("--farm-ports", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--loss", type=float, default=0.01)
+    parser.add_argument("--refused", type=float, default=0.01)
+    parser.add_argument("--probe-timeout", type=float, default=settings.probe_timeout)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="append JSON lines here as well as to stdout")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    probe_levels = [int(level) for level in args.probe_concurrency.split(",")]
+    skip = {suite.strip() for suite in args.skip.split(",") if suite.strip()}
+    only = {name.strip() for name in args.only.split(",")} if args.only else None
+    if args.no_cache:
+        settings.cache_enabled = False
+    fd_limit = raise_fd_limit()
+
+    farm = ResponderFarm(
+        ports=args.farm_ports, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        loss=args.loss, refused=args.refused, seed=args.seed,
+    ).start_in_thread()
+    try:
+        if args.create_schema:
+            Base.metadata.create_all(engine)
+        fleet_size = args.clusters * args.nodes_per_cluster
+        db = SessionLocal()
+        try:
+            if args.reuse:
+                node_ids = db.execute(
+                    select(Node.id).join(Cluster).where(Cluster.name.startswith(CLUSTER_PREFIX))
+                ).scalars().all()
+                # Repoint the fleet at this run's farm, whose ports are new every run
+                targets = farm.targets(len(node_ids))
+                update_grouped(db, [
+                    {"id": node_id, "ip_address": address, "ssh_port": port}
+                    for node_id, (address, port) in zip(node_ids, targets)
+                ])
+                db.commit()
+            else:
+                reset_fleet(db)
+                started = time.perf_counter()
+                _, node_ids = seed_fleet(
+                    db, args.clusters, args.nodes_per_cluster, farm.targets(fleet_size), seed=args.seed
+                )
+                print(f"seeded {len(node_ids)} nodes in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        finally:
+            db.close()
+
+        context = {
+            **git_revision(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "database": make_url(settings.database_url).get_backend_name(),
+            "nodes": len(node_ids),
+            "clusters": args.clusters,
+            "cache": settings.cache_enabled,
+            "farm": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "loss": args.loss,
+                     "refused": args.refused},
+            "fd_limit": fd_limit,
+        }
+
+        records = []
+        if "api" not in skip:
+            records += asyncio.run(run_api(args.api_url, node_ids, levels, args.requests, only, args.seed))
+        if "probe" not in skip:
+            records += run_probes(farm.targets(len(node_ids)), probe_levels, args.probe_timeout)
+        if "health" not in skip:
+            records += run_health_shards(settings.health_sweep_shard_size)
+    finally:
+        farm.stop_thread()
+
+    lines = [json.dumps({**context, **record}) for record in records]
+    print("\n".join(lines))
+    if args.output:
+        with open(args.output, "a") as out:
+            out.write("".join(line + "\n" for line in lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# backend/benchmarks/seed.py
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.host import Cluster, Node
+import app.models.history  # noqa: F401  (registers history tables for create_all)
+from benchmarks.responders import assign_targets
+
+CLUSTER_PREFIX = "bench-"
+CHUNK_SIZE = 5000
+
+OPERATING_SYSTEMS = ["Ubuntu 22.04.4 LTS", "Debian GNU/Linux 12", "CentOS Linux 7", "Alpine Linux v3.19"]
+
+
+def reset_fleet(db: Session) -> int:
+    """Delete every benchmark cluster and its nodes. Returns clusters removed."""
+    cluster_ids = db.execute(select(Cluster.id).where(Cluster.name.startswith(CLUSTER_PREFIX))).scalars().all()
+    for start in range(0, len(cluster_ids), CHUNK_SIZE):
+        chunk = cluster_ids[start:start + CHUNK_SIZE]
+        db.execute(delete(Node).where(Node.cluster_id.in_(chunk)))
+        db.execute(delete(Cluster).where(Cluster.id.in_(chunk)))
+    db.commit()
+    return len(cluster_ids)
+
+
+def seed_fleet(
+    db: Session,
+    clusters: int,
+    nodes_per_cluster: int,
+    targets: Optional[Sequence[Tuple[str, int]]] = None,
+    alive_ratio: float = 0.9,
+    seed: int = 0,
+) -> Tuple[List[int], List[int]]:
+    """
+    Insert clusters x nodes_per_cluster synthetic nodes with multi-row INSERTs.
+
+    Nodes are pointed at `targets` round-robin (e.g. a responder farm); without
+    targets they get unique addresses in 10.0.0.0/8 on port 22. Expects no
+    benchmark clusters to exist yet (see reset_fleet). Returns the new cluster
+    and node ids.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for start in range(0, clusters, CHUNK_SIZE):
+        rows = [
+            {"name": f"{CLUSTER_PREFIX}{index:05d}", "description": "synthetic benchmark cluster",
+             "created_at": now, "updated_at": now}
+            for index in range(start, min(clusters, start + CHUNK_SIZE))
+        ]
+        db.execute(insert(Cluster), rows)
+    cluster_ids = db.execute(
+        select(Cluster.id).where(Cluster.name.startswith(CLUSTER_PREFIX)).order_by(Cluster.id)
+    ).scalars().all()
+
+    first_node_id = db.execute(select(Node.id).order_by(Node.id.desc()).limit(1)).scalar() or 0
+    batch = []
+    position = 0
+    for cluster_id in cluster_ids:
+        for index in range(nodes_per_cluster):
+            if targets:
+                address, port = targets[position % len(targets)]
+            else:
+                address, port = f"10.{position >> 16 & 255}.{position >> 8 & 255}.{position & 255}", 22
+            alive = rng.random() < alive_ratio
+            batch.append({
+                "name": f"node-{index:05d}",
+                "hostname": f"c{cluster_id}-n{index}.bench.local",
+                "ip_address": address,
+                "ssh_port": port,
+                "ssh_username": "root",
+                "is_alive": alive,
+                "ssh_reachable": alive,
+                "passing_unit_tests": rng.random() < 0.95,
+                "operating_system": rng.choice(OPERATING_SYSTEMS),
+                "last_health_check": now if alive else None,
+                "created_at": now,
+                "updated_at": now,
+                "cluster_id": cluster_id,
+            })
+            position += 1
+            if len(batch) >= CHUNK_SIZE:
+                db.execute(insert(Node), batch)
+                batch = []
+    if batch:
+        db.execute(insert(Node), batch)
+    db.commit()
+
+    node_ids = db.execute(select(Node.id).where(Node.id > first_node_id).order_by(Node.id)).scalars().all()
+    return list(cluster_ids), list(node_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic fleet into DATABASE_URL")
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--nodes-per-cluster", type=int, default=500)
+    parser.add_argument("--alive-ratio", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--farm-spec", help="JSON spec printed by benchmarks.responders; nodes are pointed at it")
+    parser.add_argument("--create-schema", action="store_true", help="create tables first (SQLite, scratch databases)")
+    parser.add_argument("--reset", action="store_true", help="only delete previously seeded benchmark clusters")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        removed = reset_fleet(db)
+        if args.reset:
+            print(f"removed {removed} benchmark clusters")
+            return
+        targets = None
+        if args.farm_spec:
+            with open(args.farm_spec) as spec_file:
+                targets = assign_targets(json.load(spec_file), args.clusters * args.nodes_per_cluster)
+        started = time.perf_counter()
+        cluster_ids, node_ids = seed_fleet(
+            db, args.clusters, args.nodes_per_cluster, targets, alive_ratio=args.alive_ratio, seed=args.seed
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    print(f"seeded {len(cluster_ids)} clusters / {len(node_ids)} nodes in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
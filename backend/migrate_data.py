@@ -1,108 +1,269 @@
 #!/usr/bin/env python3
 """
-Migration script to convert existing hosts table to new systems/machines structure.
-Run this after creating the new tables with alembic.
-"""
+Import hosts into a cluster: python migrate_data.py [--source-url URL] [--cluster NAME]
 
-import sys
+Reads the legacy hosts table (id, name, address and optionally hostname and
+created_at), from this database or any other, or a CSV inventory with name,
+ip_address (or address) and optional hostname columns. Source rows are
+streamed through a server-side cursor; each chunk is checked against
+existing nodes with one lookup and written with one multi-row INSERT.
+
+After every committed chunk the position is saved to a checkpoint file, so
+an interrupted run picks up where it stopped when started again. The file
+is removed once the import finishes. Run the alembic migrations first.
+"""
+import argparse
+import csv
+import json
+import logging
 import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import MetaData, Table, create_engine, insert, inspect, select
+from sqlalchemy.engine import make_url
+
+from app.core.cache import cache
 from app.core.config import settings
-from app.models.host import System, Machine
 from app.db.session import SessionLocal
+from app.models.host import Cluster, Node
+from app.services.alerts import cluster_counters
 
-def migrate_hosts_to_systems():
-    """Migrate existing hosts to a default system with machines."""
-    
-    # Create database engine
-    engine = create_engine(settings.database_url)
-    
-    # Check if old hosts table exists
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = 'hosts'
-            );
-        """))
-        hosts_table_exists = result.scalar()
-        
-        if not hosts_table_exists:
-            print("No existing hosts table found. Migration not needed.")
-            return
-        
-        # Check if new tables exist
-        result = conn.execute(text("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = 'systems'
-            );
-        """))
-        systems_table_exists = result.scalar()
-        
-        if not systems_table_exists:
-            print("New systems table not found. Please run alembic migrations first.")
-            return
-    
-    # Create a default system
-    db = SessionLocal()
+logger = logging.getLogger("migrate_data")
+
+DEFAULT_CLUSTER = "Default Cluster"
+DEFAULT_CHECKPOINT = "migrate_data.checkpoint.json"
+
+
+@dataclass
+class SourceRow:
+    position: int     # source id, or line number for CSV; the checkpoint resumes after it
+    name: str
+    address: str
+    hostname: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    created: int = 0
+    existing: int = 0      # address already registered as a node
+    conflicts: int = 0     # name already taken in the cluster
+    invalid: int = 0       # missing name or address
+
+
+def stream_table(url: str, table_name: str, after: int, batch_size: int) -> Iterator[List[SourceRow]]:
+    """Source rows with id greater than `after`, in id order, a cursor batch at a time."""
+    engine = create_engine(url)
     try:
-        # Check if default system already exists
-        default_system = db.query(System).filter(System.name == "Default System").first()
-        if not default_system:
-            default_system = System(
-                name="Default System",
-                description="Migrated from existing hosts"
-            )
-            db.add(default_system)
-            db.commit()
-            db.refresh(default_system)
-            print(f"Created default system: {default_system.name} (ID: {default_system.id})")
-        else:
-            print(f"Using existing default system: {default_system.name} (ID: {default_system.id})")
-        
-        # Migrate hosts to machines
         with engine.connect() as conn:
-            # Get all hosts from old table
-            result = conn.execute(text("SELECT id, name, address, created_at FROM hosts"))
-            hosts = result.fetchall()
-            
-            migrated_count = 0
-            for host in hosts:
-                # Check if machine already exists
-                existing_machine = db.query(Machine).filter(
-                    Machine.ip_address == host.address
-                ).first()
-                
-                if not existing_machine:
-                    # Create new machine
-                    machine = Machine(
-                        name=host.name,
-                        ip_address=host.address,
-                        system_id=default_system.id,
-                        created_at=host.created_at,
-                        ssh_port=22,
-                        is_alive=False,  # Will be updated on first health check
-                        passing_unit_tests=True  # Default to True
+            if not inspect(conn).has_table(table_name):
+                raise SystemExit(f"No {table_name} table in the source database; nothing to import.")
+            table = Table(table_name, MetaData(), autoload_with=conn)
+            optional = [table.c[name] for name in ("hostname", "created_at") if name in table.c]
+            query = (
+                select(table.c.id, table.c.name, table.c.address, *optional)
+                .where(table.c.id > after)
+                .order_by(table.c.id)
+            )
+            # yield_per streams through a server-side cursor instead of buffering the whole table
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            for partition in result.partitions():
+                yield [
+                    SourceRow(
+                        position=row.id,
+                        name=row.name,
+                        address=row.address,
+                        hostname=row._mapping.get("hostname"),
+                        created_at=row._mapping.get("created_at"),
                     )
-                    db.add(machine)
-                    migrated_count += 1
-                    print(f"Migrated host: {host.name} ({host.address})")
-                else:
-                    print(f"Machine already exists for: {host.name} ({host.address})")
-            
+                    for row in partition
+                ]
+    finally:
+        engine.dispose()
+
+
+def stream_csv(path: str, after: int, batch_size: int) -> Iterator[List[SourceRow]]:
+    """CSV records after the first `after`, batch_size at a time."""
+    with open(path, newline="") as handle:
+        batch = []
+        for position, record in enumerate(csv.DictReader(handle), start=1):
+            if position <= after:
+                continue
+            batch.append(SourceRow(
+                position=position,
+                name=record.get("name") or "",
+                address=record.get("ip_address") or record.get("address") or "",
+                hostname=record.get("hostname") or None,
+            ))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def import_chunk(db, cluster_id: int, rows: List[SourceRow], stats: ImportStats) -> None:
+    """
+    Insert the rows whose address is not a node yet and whose name is free
+    in the cluster, with one lookup for each and one multi-row INSERT.
+    """
+    stats.read += len(rows)
+    valid = []
+    for row in rows:
+        row.name, row.address = (row.name or "").strip(), (row.address or "").strip()
+        if row.name and row.address:
+            valid.append(row)
+        else:
+            stats.invalid += 1
+    if not valid:
+        return
+
+    addresses = set(db.execute(
+        select(Node.ip_address).where(Node.ip_address.in_({row.address for row in valid}))
+    ).scalars())
+    names = set(db.execute(
+        select(Node.name).where(Node.cluster_id == cluster_id, Node.name.in_({row.name for row in valid}))
+    ).scalars())
+
+    now = datetime.utcnow()
+    inserts = []
+    for row in valid:
+        if row.address in addresses:
+            stats.existing += 1
+        elif row.name in names:
+            stats.conflicts += 1
+        else:
+            # Later duplicates within the chunk count as existing too
+            addresses.add(row.address)
+            names.add(row.name)
+            inserts.append({
+                "cluster_id": cluster_id,
+                "name": row.name,
+                "ip_address": row.address,
+                "hostname": row.hostname,
+                "ssh_port": 22,
+                "is_alive": False,            # set by the first health check
+                "passing_unit_tests": True,
+                "created_at": row.created_at or now,
+                "updated_at": now,
+            })
+    if inserts:
+        db.execute(insert(Node), inserts)
+    stats.created += len(inserts)
+
+
+def load_checkpoint(path: str, source: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        checkpoint = json.load(handle)
+    if checkpoint.get("source") != source:
+        raise SystemExit(
+            f"{path} belongs to an import of {checkpoint.get('source')}; "
+            "finish that one or start over with --restart."
+        )
+    return checkpoint
+
+
+def save_checkpoint(path: str, source: str, cluster_id: int, position: int, stats: ImportStats) -> None:
+    """Write the checkpoint atomically so a crash mid-write never leaves a torn file."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump({
+            "source": source,
+            "cluster_id": cluster_id,
+            "position": position,
+            "stats": asdict(stats),
+            "saved_at": datetime.utcnow().isoformat(),
+        }, handle)
+    os.replace(temporary, path)
+
+
+def get_or_create_cluster(db, name: str) -> int:
+    cluster = db.execute(select(Cluster).where(Cluster.name == name)).scalar_one_or_none()
+    if cluster is None:
+        cluster = Cluster(name=name, description="Imported hosts")
+        db.add(cluster)
+        db.commit()
+        logger.info("created cluster %s (id %s)", cluster.name, cluster.id)
+    return cluster.id
+
+
+def run(args: argparse.Namespace) -> ImportStats:
+    source = (
+        f"csv:{os.path.abspath(args.csv)}" if args.csv
+        else f"table:{args.table}@{make_url(args.source_url).render_as_string(hide_password=True)}"
+    )
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    checkpoint = load_checkpoint(args.checkpoint, source)
+    stats = ImportStats(**checkpoint["stats"]) if checkpoint else ImportStats()
+    position = checkpoint["position"] if checkpoint else 0
+    if checkpoint:
+        logger.info("resuming after position %s (%s rows already read)", position, stats.read)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    read_at_start = stats.read
+    try:
+        cluster_id = checkpoint["cluster_id"] if checkpoint else get_or_create_cluster(db, args.cluster)
+        batches = (
+            stream_csv(args.csv, position, args.batch_size) if args.csv
+            else stream_table(args.source_url, args.table, position, args.batch_size)
+        )
+        for rows in batches:
+            import_chunk(db, cluster_id, rows, stats)
             db.commit()
-            print(f"\nMigration complete! Migrated {migrated_count} hosts to machines.")
-            
-    except Exception as e:
-        print(f"Migration failed: {e}")
+            position = rows[-1].position
+            save_checkpoint(args.checkpoint, source, cluster_id, position, stats)
+            cache.invalidate("clusters", "nodes")
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "%d rows read, %d created, %d existing, %d name conflicts, %d invalid; %.0f rows/s",
+                stats.read, stats.created, stats.existing, stats.conflicts, stats.invalid,
+                (stats.read - read_at_start) / elapsed if elapsed else 0,
+            )
+    except KeyboardInterrupt:
         db.rollback()
+        logger.warning("interrupted after position %s; run again to resume", position)
+        raise SystemExit(130)
     finally:
         db.close()
 
+    if stats.created:
+        cluster_counters.mark_dirty([cluster_id])
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "import complete in %.1fs: %s, %.0f rows/s",
+        elapsed, asdict(stats), (stats.read - read_at_start) / elapsed if elapsed else 0,
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream hosts from the legacy table or a CSV inventory into a cluster")
+    parser.add_argument("--source-url", default=settings.database_url, help="database holding the hosts table; defaults to DATABASE_URL")
+    parser.add_argument("--table", default="hosts", help="source table with id, name and address columns")
+    parser.add_argument("--csv", default=None, help="read a CSV inventory instead of a table")
+    parser.add_argument("--cluster", default=DEFAULT_CLUSTER, help="cluster the nodes are created in, created if missing")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows fetched, checked and inserted together")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start from the top")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    run(args)
+
+
 if __name__ == "__main__":
-    print("Starting migration from hosts to systems/machines...")
-    migrate_hosts_to_systems()
-    print("Migration script completed.") 
\ No newline at end of file
+    main()
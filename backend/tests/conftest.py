@@ -0,0 +1,103 @@
+# backend/tests/conftest.py
+import os
+
+# Settings are read when app.core.config is first imported; keep tests off real services
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["CACHE_USE_REDIS"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+
+import asyncio
+import shutil
+from datetime import datetime
+
+import fakeredis
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.alerts  # noqa: F401  register every table on Base.metadata
+import app.models.checks  # noqa: F401
+import app.models.discovery  # noqa: F401
+import app.models.history  # noqa: F401
+import app.models.host  # noqa: F401
+import app.models.reports  # noqa: F401
+import app.models.topology  # noqa: F401
+from app.db.base import Base
+from app.db.routing import Replica, ReplicaPool, RoutingSession, _primary_pinned
+from app.models.host import Cluster
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A session on a fresh SQLite database holding every table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'watchdog.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def make_database(path, marker: str):
+    """A SQLite database holding one cluster named after it, so a read shows where it went."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        now = datetime.utcnow()
+        conn.execute(insert(Cluster.__table__).values(name=marker, created_at=now, updated_at=now))
+    return engine
+
+
+class Databases:
+    def __init__(self, tmp_path):
+        self.primary = make_database(tmp_path / "primary.db", "primary")
+        (tmp_path / "replica").mkdir()
+        self.replica_path = tmp_path / "replica"
+        replica_engine = make_database(self.replica_path / "replica.db", "replica")
+        self.replica = Replica(
+            name="local/replica",
+            engine=replica_engine,
+            async_engine=create_async_engine(f"sqlite+aiosqlite:///{self.replica_path / 'replica.db'}"),
+        )
+        self.pool = ReplicaPool([self.replica])
+        # Checks are run by hand below instead of on the background thread
+        self.pool._started = True
+        self.sessions = sessionmaker(bind=self.primary, class_=RoutingSession, replicas=self.pool.pick_sync)
+        self.async_primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+
+    def read(self) -> str:
+        with self.sessions() as db:
+            return db.execute(select(Cluster.name)).scalars().first()
+
+    def drop_replica(self) -> None:
+        shutil.rmtree(self.replica_path)
+        self.replica.engine.dispose()
+
+    def dispose(self) -> None:
+        self.primary.dispose()
+        self.replica.engine.dispose()
+        asyncio.run(self.replica.async_engine.dispose())
+        asyncio.run(self.async_primary.dispose())
+
+
+@pytest.fixture
+def databases(tmp_path):
+    databases = Databases(tmp_path)
+    yield databases
+    databases.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fresh_request():
+    """Every test starts as a new request that has not written anything."""
+    token = _primary_pinned.set(False)
+    yield
+    _primary_pinned.reset(token)
@@ -0,0 +1,150 @@
+# backend/tests/test_alerts.py
+from datetime import datetime, timedelta
+
+import pytest
+import redis
+
+from app.core.config import settings
+from app.models.alerts import Alert, AlertRule
+from app.models.host import Cluster, Node
+from app.services.alerts import COUNTERS_KEY, ClusterCounters, counter_changes, evaluate
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def cluster(db):
+    cluster = Cluster(name="edge")
+    db.add(cluster)
+    db.flush()
+    db.add_all(Node(name=f"n{i}", ip_address=f"10.0.0.{i}", cluster_id=cluster.id, is_alive=i >= 3) for i in range(10))
+    db.commit()
+    return cluster
+
+
+def add_rule(db, **fields) -> AlertRule:
+    values = dict(name="nodes down", metric="down", threshold=2, ratio=False, for_seconds=0, clear_for_seconds=0)
+    values.update(fields)
+    rule = AlertRule(**values)
+    db.add(rule)
+    db.commit()
+    return rule
+
+
+def run(db, cluster, down: int, at: datetime):
+    """Evaluate with `down` of 10 nodes down; returns the notified statuses."""
+    notifications, _ = evaluate(db, {cluster.id: {"total": 10, "down": down}}, now=at)
+    return [alert["status"] for notification in notifications for alert in notification["alerts"]]
+
+
+def test_alert_fires_after_for_seconds_and_resolves_after_clear_for_seconds(db, cluster):
+    add_rule(db, for_seconds=60, clear_for_seconds=60)
+
+    assert run(db, cluster, 3, START) == []
+    assert db.query(Alert).one().state == "pending"
+    assert run(db, cluster, 3, START + timedelta(seconds=30)) == []
+    assert run(db, cluster, 3, START + timedelta(seconds=60)) == ["firing"]
+    assert db.query(Alert).one().state == "firing"
+
+    assert run(db, cluster, 1, START + timedelta(seconds=90)) == []
+    assert db.query(Alert).one().state == "firing"
+    assert run(db, cluster, 1, START + timedelta(seconds=150)) == ["resolved"]
+    alert = db.query(Alert).one()
+    assert (alert.state, alert.peak_value, alert.notified_state) == ("resolved", 3, "resolved")
+
+
+def test_pending_alert_that_clears_is_dropped_silently(db, cluster):
+    add_rule(db, for_seconds=60)
+
+    assert run(db, cluster, 3, START) == []
+    assert run(db, cluster, 0, START + timedelta(seconds=30)) == []
+    assert db.query(Alert).count() == 0
+
+
+def test_clear_threshold_holds_the_alert_inside_the_hysteresis_band(db, cluster):
+    add_rule(db, threshold=4, clear_threshold=1)
+
+    assert run(db, cluster, 5, START) == ["firing"]
+    # At or below threshold but above clear_threshold: still firing
+    assert run(db, cluster, 3, START + timedelta(seconds=10)) == []
+    assert db.query(Alert).one().state == "firing"
+    assert run(db, cluster, 1, START + timedelta(seconds=20)) == ["resolved"]
+
+
+def test_refiring_within_the_flap_window_reopens_until_flapping(db, cluster, monkeypatch):
+    monkeypatch.setattr(settings, "alert_flap_threshold", 2)
+    monkeypatch.setattr(settings, "alert_flap_window", 900)
+    add_rule(db)
+
+    statuses = []
+    at = START
+    for down in (3, 0, 3, 0, 3, 0, 3, 0):
+        statuses.append(run(db, cluster, down, at))
+        at += timedelta(seconds=10)
+
+    assert statuses == [
+        ["firing"], ["resolved"],
+        ["firing"], ["resolved"],     # reopened once
+        ["flapping"], [],             # second reopening reaches the threshold
+        [], [],                       # held back while flapping
+    ]
+    alert = db.query(Alert).one()
+    assert (alert.flaps, alert.flapping, alert.state) == (3, True, "resolved")
+
+    # Announced as resolved once it has stayed resolved for the whole window
+    assert run(db, cluster, 0, at + timedelta(seconds=900)) == ["resolved"]
+    assert db.query(Alert).one().flapping is False
+
+
+def test_firing_after_the_flap_window_opens_a_new_alert(db, cluster):
+    add_rule(db)
+
+    run(db, cluster, 3, START)
+    run(db, cluster, 0, START + timedelta(seconds=10))
+    assert run(db, cluster, 3, START + timedelta(seconds=10 + settings.alert_flap_window + 1)) == ["firing"]
+    assert [alert.flaps for alert in db.query(Alert).order_by(Alert.id)] == [0, 0]
+
+
+def test_notification_lists_affected_nodes(db, cluster):
+    add_rule(db)
+    notifications, stats = evaluate(db, {cluster.id: {"total": 10, "down": 3}}, now=START)
+
+    assert stats["firing"] == 1
+    [notification] = notifications
+    assert notification["cluster"] == "edge"
+    assert [node["name"] for node in notification["alerts"][0]["nodes"]] == ["n0", "n1", "n2"]
+
+
+def test_counter_changes_nets_out_moves_per_cluster():
+    moves = [
+        (1, True, True, False, False),    # up -> down
+        (1, False, False, True, True),    # down -> up
+        (1, True, True, True, False),     # up -> unreachable
+        (2, None, None, True, True),      # unknown counts as down
+    ]
+    assert counter_changes(moves) == {"1:unreachable": 1, "2:down": -1}
+
+
+def test_cluster_counters_apply_moves_counts_and_snapshot_clamps(redis_client):
+    counters = ClusterCounters(redis_client)
+    redis_client.hset(COUNTERS_KEY, mapping={"1:down": 2, "1:unreachable": 1, "2:down": 0})
+
+    counters.apply([
+        (1, True, True, False, False),
+        (1, True, False, True, True),
+        (2, None, None, True, False),
+    ])
+
+    assert counters.snapshot() == {1: {"down": 3, "unreachable": 0}, 2: {"down": 0, "unreachable": 1}}
+    assert redis_client.hget(COUNTERS_KEY, "2:down") == "-1"
+
+
+def test_cluster_counters_apply_survives_a_redis_outage(redis_client, monkeypatch):
+    counters = ClusterCounters(redis_client)
+
+    def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(redis_client, "pipeline", unavailable)
+    counters.apply([(1, True, True, False, False)])
+    counters.apply([])
@@ -0,0 +1,152 @@
+# backend/tests/test_bulk.py
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.api.bulk as bulk_api
+from app.db.session import get_async_db
+from app.main import app
+from app.models.host import Cluster, Node
+from app.services.alerts import DIRTY_KEY, ClusterCounters
+
+
+@pytest.fixture
+def cluster(db):
+    cluster = Cluster(name="edge")
+    db.add(cluster)
+    db.flush()
+    db.add_all([
+        Node(name="n1", ip_address="10.0.0.1", cluster_id=cluster.id, notes="old"),
+        Node(name="n2", ip_address="10.0.0.2", cluster_id=cluster.id),
+    ])
+    db.commit()
+    return cluster
+
+
+@pytest.fixture
+def client(db, redis_client, monkeypatch):
+    """The API on the same SQLite file as `db`."""
+    engine = create_async_engine(str(db.get_bind().url).replace("sqlite://", "sqlite+aiosqlite://"))
+
+    async def override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    monkeypatch.setattr(bulk_api, "cluster_counters", ClusterCounters(redis_client))
+    app.dependency_overrides[get_async_db] = override
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        asyncio.run(engine.dispose())
+
+
+def nodes(db):
+    db.expire_all()
+    return {node.name: node for node in db.execute(select(Node)).scalars()}
+
+
+def chunked(body: bytes, size: int = 7):
+    """Stream the body in small pieces so lines and quoted fields straddle chunks."""
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_csv_quoted_fields_can_span_lines(client, db, cluster):
+    body = (
+        "name,ip_address,cluster_id,notes\r\n"
+        f'n3,10.0.0.3,{cluster.id},"rack 4\r\n\r\nsays ""hot"", see, ticket"\r\n'
+        "\r\n"
+        f"n4,10.0.0.4,{cluster.id},\r\n"
+    ).encode()
+    response = client.post("/api/nodes/bulk", content=chunked(body), headers={"content-type": "text/csv"})
+
+    assert response.json() == {"created": 2, "updated": 0, "deleted": 0, "errors": []}
+    stored = nodes(db)
+    assert stored["n3"].notes == 'rack 4\n\nsays "hot", see, ticket'
+    assert stored["n4"].notes is None
+
+
+def test_csv_reports_bad_rows_and_an_unterminated_field(client, db, cluster):
+    body = (
+        "name,ip_address,cluster_id\n"
+        f"n3,10.0.0.3\n"
+        f"n4,10.0.0.4,{cluster.id}\n"
+        f'"n5,10.0.0.5,{cluster.id}\n'
+    ).encode()
+    response = client.post("/api/nodes/bulk", content=body, headers={"content-type": "text/csv"})
+
+    assert response.json()["created"] == 1
+    assert response.json()["errors"] == [
+        {"row": 0, "error": "expected 3 columns, got 2"},
+        {"row": 2, "error": "unterminated quoted field"},
+    ]
+
+
+def test_upsert_batch_mixes_creates_and_updates(client, db, cluster, redis_client):
+    records = [
+        {"name": "n1", "ip_address": "10.0.1.1", "cluster_id": cluster.id},
+        {"name": "n9", "ip_address": "10.0.0.9", "cluster_id": cluster.id},
+        {"name": "n9", "ip_address": "10.0.0.99", "cluster_id": cluster.id},
+        {"name": "n1", "ip_address": "10.0.0.1", "cluster_id": cluster.id + 100},
+        {"name": "bad", "cluster_id": cluster.id},
+    ]
+    response = client.post("/api/nodes/bulk", json=records)
+
+    result = response.json()
+    assert (result["created"], result["updated"]) == (1, 1)
+    assert [error["row"] for error in result["errors"]] == [4, 3]
+    assert result["errors"][1]["error"] == "Cluster not found"
+    stored = nodes(db)
+    # The update only touches fields the record set; the last record for a key wins
+    assert (stored["n1"].ip_address, stored["n1"].notes) == ("10.0.1.1", "old")
+    assert stored["n9"].ip_address == "10.0.0.99"
+    assert redis_client.smembers(DIRTY_KEY)
+
+
+def test_ndjson_reports_undecodable_lines(client, db, cluster):
+    body = "\n".join([
+        json.dumps({"name": "n3", "ip_address": "10.0.0.3", "cluster_id": cluster.id}),
+        "{not json",
+        "",
+        json.dumps({"name": "n4", "ip_address": "10.0.0.4", "cluster_id": cluster.id}),
+    ])
+    response = client.post("/api/nodes/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+
+    result = response.json()
+    assert result["created"] == 2
+    assert [error["row"] for error in result["errors"]] == [1]
+
+
+def test_patch_reports_unknown_ids(client, db, cluster):
+    stored = nodes(db)
+    records = [
+        {"id": stored["n1"].id, "notes": "new"},
+        {"id": 9999, "notes": "gone"},
+        {"id": stored["n2"].id, "ssh_port": 2222},
+        {"id": 8888},
+    ]
+    response = client.patch("/api/nodes/bulk", json=records)
+
+    result = response.json()
+    assert result["updated"] == 2
+    assert sorted(result["errors"], key=lambda error: error["row"]) == [
+        {"row": 1, "error": "Node not found"},
+        {"row": 3, "error": "Node not found"},
+    ]
+    stored = nodes(db)
+    assert (stored["n1"].notes, stored["n1"].ssh_port) == ("new", 22)
+    assert (stored["n2"].notes, stored["n2"].ssh_port) == (None, 2222)
+
+
+def test_bulk_delete(client, db, cluster):
+    ids = [node.id for node in nodes(db).values()]
+    response = client.request("DELETE", "/api/nodes/bulk", json={"ids": ids + [9999]})
+
+    assert response.json()["deleted"] == 2
+    assert nodes(db) == {}
@@ -0,0 +1,141 @@
+# backend/tests/test_cache.py
+import asyncio
+
+import fakeredis
+import pytest
+import redis
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.core.cache as cache_module
+from app.core.cache import ReadCache, cached_response
+from app.db.routing import RoutingSession, _primary_pinned
+from app.models.host import Cluster
+
+NAMESPACES = ["clusters", "nodes"]
+
+
+class Renderer:
+    """A render() that counts its calls and returns the next body."""
+
+    def __init__(self):
+        self.calls = 0
+        self.pinned = []
+        self.during = None      # run inside the render, e.g. to invalidate mid-render
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        self.pinned.append(_primary_pinned.get())
+        if self.during:
+            self.during()
+        return Response(content=f"render {self.calls}".encode(), media_type="application/json")
+
+
+@pytest.fixture
+def read_cache(monkeypatch):
+    read_cache = ReadCache(fresh_window=60.0)
+    monkeypatch.setattr(cache_module, "cache", read_cache)
+    return read_cache
+
+
+def make_request(path: str = "/clusters", query: str = "limit=10", headers=()) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+    })
+
+
+def serve(render, request=None) -> Response:
+    """One request: asyncio.run gives it its own context, as a real request has."""
+    return asyncio.run(cached_response(request or make_request(), NAMESPACES, render))
+
+
+def test_hit_skips_the_render_and_answers_if_none_match(read_cache):
+    render = Renderer()
+    first = serve(render)
+    second = serve(render, make_request(query="limit=10"))
+    assert render.calls == 1
+    assert first.body == second.body == b"render 1"
+    assert first.headers["etag"] == second.headers["etag"]
+
+    not_modified = serve(render, make_request(headers=[("if-none-match", f"W/{first.headers['etag']}")]))
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+
+
+def test_invalidate_renders_again(read_cache):
+    render = Renderer()
+    serve(render)
+    read_cache.invalidate("nodes")
+    assert serve(render).body == b"render 2"
+    assert serve(render).body == b"render 2"
+
+
+def test_invalidation_during_a_render_is_not_served_afterwards(read_cache):
+    render = Renderer()
+    render.during = lambda: read_cache.invalidate("nodes")
+    assert serve(render).body == b"render 1"
+    render.during = None
+    assert serve(render).body == b"render 2"
+    assert serve(render).body == b"render 2"
+
+
+def test_renders_read_from_the_primary_inside_the_fresh_window(read_cache, monkeypatch):
+    render = Renderer()
+    serve(render)
+    read_cache.invalidate("nodes")
+    serve(render)
+    monkeypatch.setattr(read_cache, "fresh_window", 0.0)
+    read_cache.invalidate("clusters")
+    serve(render)
+    assert render.pinned == [False, True, False]
+
+
+def test_fresh_window_routes_the_render_to_the_primary(read_cache, databases):
+    databases.pool.check()
+
+    async def render() -> Response:
+        async with AsyncSession(
+            databases.async_primary, sync_session_class=RoutingSession, replicas=databases.pool.pick_async
+        ) as db:
+            name = (await db.execute(select(Cluster.name))).scalars().first()
+        return Response(content=name.encode())
+
+    assert serve(render).body == b"replica"
+    read_cache.invalidate("clusters")
+    assert serve(render).body == b"primary"
+
+
+def test_redis_shares_generations_and_freshness(read_cache):
+    read_cache._redis = fakeredis.FakeRedis()
+    other = ReadCache(fresh_window=60.0)
+    other._redis = read_cache._redis
+    render = Renderer()
+
+    serve(render)
+    read_cache._entries.clear()
+    assert serve(render).body == b"render 1"    # from the Redis copy
+    other.invalidate("nodes")
+    assert serve(render).body == b"render 2"
+    assert render.pinned == [False, True]
+    assert read_cache._redis.pttl("watchdog:cache:fresh:nodes") > 0
+
+
+def test_redis_outage_bypasses_the_cache_and_reads_the_primary(read_cache, monkeypatch):
+    read_cache._redis = fakeredis.FakeRedis()
+
+    def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(read_cache._redis, "mget", unavailable)
+    render = Renderer()
+    first, second = serve(render), serve(render)
+
+    assert (first.body, second.body) == (b"render 1", b"render 2")
+    assert first.headers["etag"] != second.headers["etag"]
+    # Freshness is unknown, so the replicas are not trusted
+    assert render.pinned == [True, True]
@@ -0,0 +1,220 @@
+# backend/tests/test_checks.py
+import asyncio
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+import app.services.checks as checks_service
+from app.models.checks import CheckDefinition, CheckResult
+from app.models.host import Cluster, Node
+from app.services.checks import checks_passing_update, write_check_results
+from app.utils.checks import (
+    BAD_BANNER, BAD_STATUS, SLOW, UNKNOWN_KIND, PLUGINS, CheckJob, CheckOutcome, check_many,
+)
+from app.utils.health import DEADLINE, REFUSED
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def closed_port() -> int:
+    """A port nothing listens on, so connects are refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def job(kind: str, params=None, port: int = 22, timeout: float = 2.0, check_id: int = 1, node_id: int = 1) -> CheckJob:
+    plugin = PLUGINS.get(kind)
+    return CheckJob(
+        check_id=check_id,
+        kind=kind,
+        params=plugin.validate(params or {}) if plugin else {},
+        timeout=timeout,
+        node_id=node_id,
+        cluster_id=1,
+        address="127.0.0.1",
+        ssh_port=port,
+    )
+
+
+def run_checks(jobs, *, serve=None, deadline=None):
+    """Run check_many with `serve` (a connection handler) listening on a local port."""
+    async def main():
+        if serve is None:
+            return await check_many(jobs(None), deadline=deadline)
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await check_many(jobs(port), deadline=deadline)
+    return asyncio.run(main())
+
+
+def replying(*chunks: bytes, delay: float = 0.0):
+    async def serve(reader, writer):
+        if delay:
+            await asyncio.sleep(delay)
+        for chunk in chunks:
+            writer.write(chunk)
+        await writer.drain()
+        writer.close()
+    return serve
+
+
+async def silent(reader, writer):
+    await asyncio.sleep(10)
+
+
+def test_tcp_check_requires_all_or_any_port():
+    closed = closed_port()
+    outcomes = run_checks(
+        lambda port: [
+            job("tcp", {"ports": [port, closed], "require": "all"}),
+            job("tcp", {"ports": [port, closed], "require": "any"}),
+            job("tcp", {"ports": [port]}),
+        ],
+        serve=replying(),
+    )
+    assert [outcome.ok for outcome in outcomes] == [False, True, True]
+    assert outcomes[0].error == REFUSED
+    assert outcomes[0].detail == f"{closed} {REFUSED}"
+    assert outcomes[2].latency_ms is not None
+
+
+def test_tcp_check_validation():
+    with pytest.raises(ValueError):
+        PLUGINS["tcp"].validate({"ports": []})
+    with pytest.raises(ValueError):
+        PLUGINS["tcp"].validate({"ports": [80], "require": "most"})
+    assert PLUGINS["tcp"].validate({"ports": [443, 80, 80]}) == {"ports": [80, 443], "require": "all"}
+
+
+def test_http_check_judges_the_status():
+    outcomes = run_checks(
+        lambda port: [
+            job("http", {"port": port}),
+            job("http", {"port": port, "expect_status": [503]}),
+        ],
+        serve=replying(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n"),
+    )
+    assert (outcomes[0].ok, outcomes[0].status_code, outcomes[0].error) == (False, 503, BAD_STATUS)
+    assert (outcomes[1].ok, outcomes[1].status_code) == (True, 503)
+
+
+def test_http_check_fails_a_slow_response():
+    outcomes = run_checks(
+        lambda port: [
+            job("http", {"port": port, "max_latency_ms": 10}),
+            job("http", {"port": port, "max_latency_ms": 5000}),
+        ],
+        serve=replying(b"HTTP/1.1 200 OK\r\n\r\n", delay=0.05),
+    )
+    assert (outcomes[0].ok, outcomes[0].status_code, outcomes[0].error) == (False, 200, SLOW)
+    assert outcomes[0].latency_ms >= 50
+    assert outcomes[1].ok
+
+
+def test_http_check_rejects_a_non_http_reply():
+    [outcome] = run_checks(lambda port: [job("http", {"port": port})], serve=replying(b"SSH-2.0-OpenSSH\r\n"))
+    assert not outcome.ok
+    assert outcome.detail == "not an HTTP response"
+
+
+def test_ssh_banner_check_skips_the_prelude():
+    [outcome] = run_checks(
+        lambda port: [job("ssh_banner", port=port)],
+        serve=replying(b"Authorized use only\r\n", b"SSH-2.0-OpenSSH_9.6\r\n"),
+    )
+    assert outcome.ok
+    assert outcome.detail == "SSH-2.0-OpenSSH_9.6"
+
+
+def test_ssh_banner_check_fails_another_service():
+    outcomes = run_checks(
+        lambda port: [job("ssh_banner", port=port), job("ssh_banner", {"port": port, "expect": "SSH-1.99-"}, port=1)],
+        serve=replying(b"220 mail ESMTP\r\n"),
+    )
+    assert [(outcome.ok, outcome.error) for outcome in outcomes] == [(False, BAD_BANNER), (False, BAD_BANNER)]
+    assert outcomes[0].detail == "220 mail ESMTP"
+
+
+def test_check_many_reports_the_deadline_and_unknown_kinds():
+    outcomes = run_checks(
+        lambda port: [job("http", {"port": port}, timeout=10), job("gopher")],
+        serve=silent,
+        deadline=0.2,
+    )
+    assert [(outcome.ok, outcome.error) for outcome in outcomes] == [(False, DEADLINE), (False, UNKNOWN_KIND)]
+
+
+@pytest.fixture
+def published(monkeypatch):
+    deltas = []
+    monkeypatch.setattr(checks_service, "publish_node_deltas", deltas.extend)
+    return deltas
+
+
+@pytest.fixture
+def nodes(db):
+    cluster = Cluster(name="edge")
+    db.add(cluster)
+    db.flush()
+    db.add_all(Node(id=i, name=f"n{i}", ip_address=f"10.0.0.{i}", cluster_id=cluster.id) for i in (1, 2))
+    db.add_all([
+        CheckDefinition(id=1, name="web", kind="http", cluster_id=cluster.id),
+        CheckDefinition(id=2, name="ssh", kind="ssh_banner", cluster_id=cluster.id),
+    ])
+    db.commit()
+    return cluster
+
+
+def write(db, outcomes, at):
+    """outcomes maps (check_id, node_id) to ok."""
+    jobs = [job("tcp", {"ports": [80]}, check_id=check_id, node_id=node_id) for check_id, node_id in outcomes]
+    return write_check_results(db, jobs, [CheckOutcome(ok) for ok in outcomes.values()], at)
+
+
+def passing(db):
+    return dict(db.execute(select(Node.id, Node.checks_passing).order_by(Node.id)).all())
+
+
+def test_write_check_results_skips_unchanged_and_flips_nodes(db, nodes, published):
+    first = write(db, {(1, 1): True, (2, 1): True, (1, 2): True}, START)
+    assert (first.written, first.changed, first.nodes_flipped) == (3, 3, 2)
+    assert passing(db) == {1: True, 2: True}
+
+    # Same outcomes inside the same resolution window: nothing to write
+    again = write(db, {(1, 1): True, (2, 1): True, (1, 2): True}, START + timedelta(seconds=10))
+    assert (again.written, again.changed, again.nodes_flipped) == (0, 0, 0)
+
+    failed = write(db, {(1, 1): True, (2, 1): False, (1, 2): True}, START + timedelta(seconds=20))
+    assert (failed.written, failed.changed, failed.nodes_flipped) == (1, 1, 1)
+    assert passing(db) == {1: False, 2: True}
+    assert [(delta.node_id, delta.changes) for delta in published[-1:]] == [(1, {"checks_passing": False})]
+    result = db.get(CheckResult, (2, 1))
+    assert (result.ok, result.changed_at) == (False, START + timedelta(seconds=20))
+
+
+def test_unchanged_results_are_refreshed_once_per_window(db, nodes, published):
+    write(db, {(1, 1): True}, START)
+    later = START + timedelta(seconds=3600)
+    refreshed = write(db, {(1, 1): True}, later)
+    assert (refreshed.written, refreshed.changed) == (1, 0)
+    result = db.get(CheckResult, (1, 1))
+    assert (result.checked_at, result.changed_at) == (later, START)
+
+
+def test_checks_passing_ignores_disabled_definitions(db, nodes, published):
+    write(db, {(1, 1): True, (2, 1): False}, START)
+    assert passing(db)[1] is False
+
+    db.get(CheckDefinition, 2).enabled = False
+    db.commit()
+    assert [tuple(row) for row in db.execute(checks_passing_update([1, 2])).all()] == [(1, nodes.id, True)]
+
+    db.get(CheckDefinition, 1).enabled = False
+    db.commit()
+    db.execute(checks_passing_update([1]))
+    db.commit()
+    assert passing(db) == {1: None, 2: None}
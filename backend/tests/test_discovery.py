@@ -0,0 +1,119 @@
+# backend/tests/test_discovery.py
+import pytest
+from sqlalchemy import select
+
+import app.services.discovery as discovery_service
+from app.core.cache import ReadCache
+from app.models.host import Cluster, Node
+from app.services.alerts import DIRTY_KEY, ClusterCounters
+from app.services.discovery import DiscoveryStats, apply_discovered
+from app.utils.discovery import DiscoveredHost
+
+
+class RecordingCache(ReadCache):
+    def __init__(self):
+        super().__init__()
+        self.invalidated = []
+
+    def invalidate(self, *namespaces):
+        self.invalidated.append(set(namespaces))
+        super().invalidate(*namespaces)
+
+
+@pytest.fixture
+def spies(redis_client, monkeypatch):
+    cache = RecordingCache()
+    monkeypatch.setattr(discovery_service, "cache", cache)
+    monkeypatch.setattr(discovery_service, "cluster_counters", ClusterCounters(redis_client))
+    return cache
+
+
+@pytest.fixture
+def clusters(db):
+    home, other = Cluster(name="home"), Cluster(name="other")
+    db.add_all([home, other])
+    db.flush()
+    db.add_all([
+        Node(name="web", ip_address="10.0.0.1", hostname="web.example", cluster_id=home.id),
+        Node(name="db", ip_address="10.0.0.2", cluster_id=home.id),
+        Node(name="10.0.0.9", ip_address="10.0.0.99", cluster_id=home.id),
+        Node(name="shared", ip_address="10.0.0.3", cluster_id=other.id),
+    ])
+    db.commit()
+    return home, other
+
+
+def nodes(db, cluster):
+    db.expire_all()
+    return {node.name: node for node in db.execute(select(Node).where(Node.cluster_id == cluster.id)).scalars()}
+
+
+def test_new_hosts_are_named_after_their_short_hostname(db, clusters, spies, redis_client):
+    home, _ = clusters
+    stats = apply_discovered(db, home.id, [
+        DiscoveredHost("10.0.0.10", [22, 80], "app1.example"),
+        DiscoveredHost("10.0.0.11", [443]),
+    ])
+
+    assert stats == DiscoveryStats(found=2, created=2)
+    stored = nodes(db, home)
+    assert (stored["app1"].ip_address, stored["app1"].hostname) == ("10.0.0.10", "app1.example")
+    assert (stored["app1"].is_alive, stored["app1"].ssh_reachable) == (True, True)
+    assert stored["10.0.0.11"].ssh_reachable is False
+    assert stored["10.0.0.11"].notes == "Discovered with open ports 443"
+    assert spies.invalidated == [{"clusters", "nodes"}]
+    assert redis_client.smembers(DIRTY_KEY) == {str(home.id)}
+
+
+def test_name_collisions_fall_back_to_the_address_then_skip(db, clusters, spies):
+    home, _ = clusters
+    stats = apply_discovered(db, home.id, [
+        DiscoveredHost("10.0.0.20", [22], "web.other.example"),   # "web" is taken
+        DiscoveredHost("10.0.0.9", [22], "db.example"),           # "db" and "10.0.0.9" are taken
+        DiscoveredHost("10.0.0.21", [22], "new.example"),
+        DiscoveredHost("10.0.0.22", [22], "new.example"),         # "new" taken within the batch
+    ])
+
+    assert (stats.created, stats.skipped) == (3, 1)
+    stored = nodes(db, home)
+    assert stored["10.0.0.20"].hostname == "web.other.example"
+    assert stored["new"].ip_address == "10.0.0.21"
+    assert stored["10.0.0.22"].hostname == "new.example"
+    assert "10.0.0.9" in stored and stored["10.0.0.9"].ip_address == "10.0.0.99"
+
+
+def test_known_addresses_only_get_hostname_updates(db, clusters, spies):
+    home, other = clusters
+    web_id = nodes(db, home)["web"].id
+    stats = apply_discovered(db, home.id, [
+        DiscoveredHost("10.0.0.1", [22], "web2.example"),   # hostname changed
+        DiscoveredHost("10.0.0.2", [22]),                   # no reverse DNS: left alone
+        DiscoveredHost("10.0.0.3", [22], "shared.example"), # registered in the other cluster
+    ])
+
+    assert stats == DiscoveryStats(found=3, updated=1, unchanged=1, elsewhere=1)
+    stored = nodes(db, home)
+    assert stored["web"].hostname == "web2.example"
+    assert stored["db"].hostname is None
+    assert nodes(db, other)["shared"].hostname is None
+    assert len(stored) == 3
+    assert spies.invalidated == [{"clusters", "nodes", f"node:{web_id}"}]
+
+
+def test_an_address_in_this_cluster_wins_over_another_cluster(db, clusters, spies):
+    home, other = clusters
+    db.add(Node(name="dup", ip_address="10.0.0.3", cluster_id=home.id))
+    db.commit()
+
+    stats = apply_discovered(db, home.id, [DiscoveredHost("10.0.0.3", [22], "dup.example")])
+    assert (stats.updated, stats.elsewhere) == (1, 0)
+    assert nodes(db, home)["dup"].hostname == "dup.example"
+
+
+def test_nothing_changed_writes_and_invalidates_nothing(db, clusters, spies, redis_client):
+    home, _ = clusters
+    stats = apply_discovered(db, home.id, [DiscoveredHost("10.0.0.1", [22], "web.example")])
+
+    assert stats == DiscoveryStats(found=1, unchanged=1)
+    assert spies.invalidated == []
+    assert redis_client.smembers(DIRTY_KEY) == set()
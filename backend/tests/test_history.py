@@ -0,0 +1,75 @@
+# backend/tests/test_history.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.history import NodeHealthEvent
+from app.models.host import Cluster, Node
+from app.services.history import decode_event_cursor, encode_event_cursor, event_page
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def node(db):
+    cluster = Cluster(name="edge")
+    db.add(cluster)
+    db.flush()
+    node = Node(name="n0", ip_address="10.0.0.1", cluster_id=cluster.id)
+    db.add(node)
+    db.commit()
+    return node
+
+
+def add_event(db, node, event_id: int, seconds_ago: float) -> None:
+    db.add(NodeHealthEvent(
+        id=event_id, node_id=node.id, cluster_id=node.cluster_id,
+        occurred_at=NOW - timedelta(seconds=seconds_ago), is_alive=True, ssh_reachable=True,
+    ))
+    db.commit()
+
+
+def poll(db, cursor, now=NOW, limit=10):
+    events = db.execute(event_page(select(NodeHealthEvent), cursor, limit, now=now)).scalars().all()
+    return [event.id for event in events], encode_event_cursor(events[-1]) if events else cursor
+
+
+def test_events_inside_the_settle_window_are_held_back(db, node):
+    add_event(db, node, 1, seconds_ago=60)
+    add_event(db, node, 2, seconds_ago=5)
+
+    ids, cursor = poll(db, None)
+    assert ids == [1]
+    assert poll(db, cursor) == ([], cursor)
+    assert poll(db, cursor, now=NOW + timedelta(seconds=30))[0] == [2]
+
+
+def test_an_event_committed_late_with_a_lower_id_is_not_skipped(db, node):
+    # Writer A took id 1 but commits after writer B's id 2 was polled
+    add_event(db, node, 2, seconds_ago=50)
+    ids, cursor = poll(db, None)
+    assert ids == [2]
+
+    add_event(db, node, 1, seconds_ago=10)
+    later = NOW + timedelta(seconds=30)
+    ids, cursor = poll(db, cursor, now=later)
+    assert ids == [1]
+    assert poll(db, cursor, now=later) == ([], cursor)
+
+
+def test_events_at_the_same_time_page_by_id(db, node):
+    for event_id in (1, 2, 3):
+        add_event(db, node, event_id, seconds_ago=60)
+
+    first, cursor = poll(db, None, limit=2)
+    second, _ = poll(db, cursor, limit=2)
+    assert (first, second) == ([1, 2], [3])
+
+
+def test_malformed_cursor_is_rejected():
+    assert decode_event_cursor(encode_event_cursor(
+        NodeHealthEvent(id=7, occurred_at=NOW)
+    )) == (NOW, 7)
+    with pytest.raises(ValueError):
+        decode_event_cursor("not-a-cursor")
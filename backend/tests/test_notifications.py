@@ -0,0 +1,80 @@
+# backend/tests/test_notifications.py
+import pytest
+
+from app.core.config import settings
+from app.services.notifications import MemorySink, NotificationQueue, NotificationSink, dispatch
+
+
+class FailingSink(NotificationSink):
+    """Fails its first `failures` sends, then delivers into a MemorySink."""
+
+    def __init__(self, name: str, failures: int = 1):
+        self.name = name
+        self.failures = failures
+        self.delivered = MemorySink()
+
+    async def send(self, notifications):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("sink unavailable")
+        await self.delivered.send(notifications)
+
+
+@pytest.fixture
+def queue(redis_client):
+    return NotificationQueue(redis_client)
+
+
+def test_every_sink_gets_each_batch_in_one_call(queue, monkeypatch):
+    monkeypatch.setattr(settings, "alert_dispatch_batch", 2)
+    first, second = MemorySink(), MemorySink()
+    first.name, second.name = "first", "second"
+    queue.push([{"cluster_id": cluster_id} for cluster_id in range(5)])
+
+    stats = dispatch(queue, [first, second])
+
+    assert stats == {"sent": 5, "retried": 0, "dropped": 0}
+    assert [len(batch) for batch in first.batches] == [2, 2, 1]
+    assert first.notifications == second.notifications == [{"cluster_id": cluster_id} for cluster_id in range(5)]
+    assert len(queue) == 0
+
+
+def test_failed_sink_is_retried_alone(queue):
+    healthy = MemorySink()
+    flaky = FailingSink("flaky", failures=1)
+    queue.push([{"cluster_id": 1}, {"cluster_id": 2}])
+
+    stats = dispatch(queue, [healthy, flaky])
+    assert stats == {"sent": 0, "retried": 2, "dropped": 0}
+    assert healthy.notifications == [{"cluster_id": 1}, {"cluster_id": 2}]
+    assert [envelope["sinks"] for envelope in queue.pop(10)] == [["flaky"], ["flaky"]]
+
+
+def test_retry_skips_sinks_that_already_delivered(queue):
+    healthy = MemorySink()
+    flaky = FailingSink("flaky", failures=1)
+    queue.push([{"cluster_id": 1}])
+
+    dispatch(queue, [healthy, flaky])
+    stats = dispatch(queue, [healthy, flaky])
+
+    assert stats == {"sent": 1, "retried": 0, "dropped": 0}
+    assert healthy.notifications == [{"cluster_id": 1}]
+    assert flaky.delivered.notifications == [{"cluster_id": 1}]
+    assert len(queue) == 0
+
+
+def test_notifications_are_dropped_after_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(settings, "alert_dispatch_max_attempts", 2)
+    broken = FailingSink("broken", failures=10)
+    queue.push([{"cluster_id": 1}])
+
+    assert dispatch(queue, [broken]) == {"sent": 0, "retried": 1, "dropped": 0}
+    assert dispatch(queue, [broken]) == {"sent": 0, "retried": 0, "dropped": 1}
+    assert len(queue) == 0
+
+
+def test_nothing_configured_drops_the_queue(queue):
+    queue.push([{"cluster_id": 1}, {"cluster_id": 2}])
+    assert dispatch(queue, []) == {"sent": 0, "retried": 0, "dropped": 2}
+    assert len(queue) == 0
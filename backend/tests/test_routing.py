@@ -0,0 +1,115 @@
+# backend/tests/test_routing.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.routing import RoutingSession, _primary_pinned, standby_lag
+from app.models.host import Cluster
+
+
+def test_reads_stay_on_the_primary_until_a_replica_passes_a_check(databases):
+    assert databases.read() == "primary"
+    databases.pool.check()
+    assert databases.replica.healthy
+    assert databases.read() == "replica"
+
+
+def test_a_write_pins_the_session_and_the_rest_of_the_request(databases):
+    databases.pool.check()
+    with databases.sessions() as db:
+        assert db.execute(select(Cluster.name)).scalars().first() == "replica"
+        db.add(Cluster(name="written"))
+        db.flush()
+        names = db.execute(select(Cluster.name)).scalars().all()
+        db.rollback()
+    assert names == ["primary", "written"]
+    # Later sessions in the same request read their writes too
+    assert databases.read() == "primary"
+
+
+def test_pinning_does_not_outlive_the_request(databases):
+    databases.pool.check()
+    _primary_pinned.set(True)
+    assert databases.read() == "primary"
+    _primary_pinned.set(False)
+    assert databases.read() == "replica"
+
+
+def test_session_without_a_picker_uses_the_primary(databases):
+    databases.pool.check()
+    with sessionmaker(bind=databases.primary, class_=RoutingSession)() as db:
+        assert db.execute(select(Cluster.name)).scalars().first() == "primary"
+
+
+def test_lagging_replica_is_skipped_until_it_catches_up(databases, monkeypatch):
+    databases.pool.check()
+    monkeypatch.setattr(settings, "db_replica_max_lag", -1.0)
+    databases.pool.check()
+    assert not databases.replica.healthy
+    assert databases.read() == "primary"
+
+    monkeypatch.setattr(settings, "db_replica_max_lag", 5.0)
+    databases.pool.check()
+    assert databases.replica.healthy
+    assert databases.read() == "replica"
+
+
+def test_unreachable_replica_fails_over_on_check(databases):
+    databases.pool.check()
+    databases.drop_replica()
+    databases.pool.check()
+    assert not databases.replica.healthy
+    assert databases.replica.lag is None
+    assert databases.read() == "primary"
+
+
+def test_connect_error_during_a_query_takes_the_replica_out(databases):
+    databases.pool.check()
+    databases.drop_replica()
+    with pytest.raises(OperationalError):
+        databases.read()
+    assert not databases.replica.healthy
+    assert databases.read() == "primary"
+
+
+def test_async_sessions_route_and_pin_the_same_way(databases):
+    databases.pool.check()
+
+    async def request():
+        async with AsyncSession(
+            databases.async_primary, sync_session_class=RoutingSession, replicas=databases.pool.pick_async
+        ) as db:
+            before = (await db.execute(select(Cluster.name))).scalars().first()
+            db.add(Cluster(name="written"))
+            await db.flush()
+            after = (await db.execute(select(Cluster.name))).scalars().all()
+            await db.rollback()
+        return before, after
+
+    assert asyncio.run(request()) == ("replica", ["primary", "written"])
+    # asyncio.run gave the request its own context, so the pin stayed there
+    assert databases.read() == "replica"
+
+
+def standby(standby=True, streaming=True, replayed=False, lag=None):
+    return SimpleNamespace(standby=standby, streaming=streaming, replayed=replayed, lag=lag)
+
+
+def test_standby_lag_counts_a_caught_up_stream_as_current():
+    assert standby_lag(standby(standby=False, streaming=False)) == 0.0
+    assert standby_lag(standby(replayed=True, lag=3600)) == 0.0
+    assert standby_lag(standby(lag=2.5)) == 2.5
+
+
+def test_standby_without_a_wal_receiver_is_unhealthy():
+    # Replay has caught up with what was received, but nothing more is arriving
+    with pytest.raises(RuntimeError):
+        standby_lag(standby(streaming=False, replayed=True, lag=0))
+    with pytest.raises(RuntimeError):
+        standby_lag(standby(lag=None))
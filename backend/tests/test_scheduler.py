@@ -0,0 +1,32 @@
+# backend/tests/test_scheduler.py
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.scheduler import QUEUE_KEY, STATE_KEY, ProbeScheduler
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def scheduler(redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "probe_jitter", 0.0)
+    monkeypatch.setattr(settings, "probe_stable_after", 1)
+    return ProbeScheduler(redis_client)
+
+
+def test_requeue_keeps_the_interval_and_streak(scheduler, redis_client):
+    scheduler.reschedule([(1, True)], now=NOW)
+    scheduler.reschedule([(1, True)], now=NOW)
+    state = redis_client.hget(STATE_KEY, "1")
+    interval = json.loads(state)["interval"]
+    assert interval > settings.probe_min_interval
+
+    scheduler.requeue([1, 2], now=NOW + 10)
+
+    assert redis_client.hget(STATE_KEY, "1") == state
+    assert redis_client.zscore(QUEUE_KEY, "1") == NOW + 10 + interval
+    # Never probed: the minimum interval, and still no recorded state
+    assert redis_client.zscore(QUEUE_KEY, "2") == NOW + 10 + settings.probe_min_interval
+    assert redis_client.hget(STATE_KEY, "2") is None
@@ -0,0 +1,29 @@
+# backend/tests/test_sharding.py
+from app.models.host import Cluster, Node
+from app.services.sharding import HashRing, owned_targets
+
+
+def add_cluster(db, name: str, zone: str, nodes: int) -> Cluster:
+    cluster = Cluster(name=name, probe_zone=zone)
+    db.add(cluster)
+    db.flush()
+    db.add_all(Node(name=f"{name}-{i}", ip_address=f"10.{cluster.id}.0.{i}", cluster_id=cluster.id) for i in range(nodes))
+    db.commit()
+    return cluster
+
+
+def test_each_zone_probes_only_its_own_clusters(db):
+    add_cluster(db, "east", "default", 6)
+    add_cluster(db, "west", "west", 4)
+    default_ring, west_ring = HashRing(["a1", "a2"]), HashRing(["b1"])
+
+    default = [target for agent in ("a1", "a2") for target in owned_targets(db, default_ring, agent, "default")]
+    west = owned_targets(db, west_ring, "b1", "west")
+
+    assert sorted(name for name, in db.query(Node.name).filter(Node.id.in_([t[0] for t in default]))) == [
+        f"east-{i}" for i in range(6)
+    ]
+    assert len(west) == 4
+    assert not {t[0] for t in default} & {t[0] for t in west}
+    # A zone without clusters has nothing to probe
+    assert owned_targets(db, HashRing(["c1"]), "c1", "north") == []
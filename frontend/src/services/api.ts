@@ -1,8 +1,24 @@
 // frontend/src/services/api.ts
-import type { Cluster, ClusterCreate, Node, NodeCreate, NodeUpdate } from '../types/host';
+import type {
+  Alert, AlertRule, AlertRuleCreate, AlertState, CheckDefinition, CheckDefinitionCreate, CheckResult, Cluster, ClusterCreate, ClusterHealthSummary,
+  DiscoveryTarget, DiscoveryTargetCreate, Node, NodeCreate, NodeDependency, NodeDependencyCreate, NodeHealthDelta, NodeListParams, NodePage,
+  NodeSearchParams, NodeTestSummary, NodeUpdate,
+} from '../types/host';
 
 const API_BASE = 'http://localhost:8080/api';
 
+// Fetch one page of a cursor-paginated node listing
+const fetchNodePage = async (path: string, params: object): Promise<NodePage> => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value === undefined || value === null) return;
+    (Array.isArray(value) ? value : [value]).forEach((item) => query.append(key, String(item)));
+  });
+  const response = await fetch(`${API_BASE}${path}?${query}`);
+  if (!response.ok) throw new Error('Failed to fetch nodes');
+  return { nodes: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+};
+
 // Cluster API functions
 export const clustersApi = {
   list: async (): Promise<Cluster[]> => {
@@ -11,6 +27,15 @@ export const clustersApi = {
     return response.json();
   },
 
+  summary: async (): Promise<ClusterHealthSummary[]> => {
+    const response = await fetch(`${API_BASE}/clusters/summary`);
+    if (!response.ok) throw new Error('Failed to fetch cluster summary');
+    return response.json();
+  },
+
+  nodes: (clusterId: number, params: NodeListParams = {}): Promise<NodePage> =>
+    fetchNodePage(`/clusters/${clusterId}/nodes`, params),
+
   create: async (cluster: ClusterCreate): Promise<Cluster> => {
     const response = await fetch(`${API_BASE}/clusters`, {
       method: 'POST',
@@ -34,12 +59,31 @@ export const nodesApi = {
     return response.json();
   },
 
+  search: (params: NodeSearchParams = {}): Promise<NodePage> => fetchNodePage('/nodes', params),
+
+  stale: (
+    params: { max_age_seconds?: number; include_unchecked?: boolean; cluster_id?: number; cursor?: string; limit?: number } = {},
+  ): Promise<NodePage> => fetchNodePage('/nodes/stale', params),
+
   get: async (id: number): Promise<Node> => {
     const response = await fetch(`${API_BASE}/nodes/${id}`);
     if (!response.ok) throw new Error('Failed to fetch node');
     return response.json();
   },
 
+  testSummary: async (id: number): Promise<NodeTestSummary | null> => {
+    const response = await fetch(`${API_BASE}/nodes/${id}/test-summary`);
+    if (response.status === 404) return null;
+    if (!response.ok) throw new Error('Failed to fetch test summary');
+    return response.json();
+  },
+
+  checks: async (id: number): Promise<CheckResult[]> => {
+    const response = await fetch(`${API_BASE}/nodes/${id}/checks`);
+    if (!response.ok) throw new Error('Failed to fetch check results');
+    return response.json();
+  },
+
   update: async (id: number, node: NodeUpdate): Promise<Node> => {
     const response = await fetch(`${API_BASE}/nodes/${id}`, {
       method: 'PUT',
@@ -57,3 +101,179 @@ export const nodesApi = {
     if (!response.ok) throw new Error('Failed to delete node');
   },
 };
+
+// Alert rules and the alerts they raise
+export const alertsApi = {
+  list: async (params: { state?: AlertState[]; cluster_id?: number; rule_id?: number } = {}): Promise<Alert[]> => {
+    const query = new URLSearchParams();
+    params.state?.forEach((state) => query.append('state', state));
+    if (params.cluster_id !== undefined) query.append('cluster_id', String(params.cluster_id));
+    if (params.rule_id !== undefined) query.append('rule_id', String(params.rule_id));
+    const response = await fetch(`${API_BASE}/alerts?${query}`);
+    if (!response.ok) throw new Error('Failed to fetch alerts');
+    return response.json();
+  },
+
+  rules: async (): Promise<AlertRule[]> => {
+    const response = await fetch(`${API_BASE}/alert-rules`);
+    if (!response.ok) throw new Error('Failed to fetch alert rules');
+    return response.json();
+  },
+
+  createRule: async (rule: AlertRuleCreate): Promise<AlertRule> => {
+    const response = await fetch(`${API_BASE}/alert-rules`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(rule),
+    });
+    if (!response.ok) throw new Error('Failed to create alert rule');
+    return response.json();
+  },
+
+  updateRule: async (id: number, rule: Partial<AlertRuleCreate>): Promise<AlertRule> => {
+    const response = await fetch(`${API_BASE}/alert-rules/${id}`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(rule),
+    });
+    if (!response.ok) throw new Error('Failed to update alert rule');
+    return response.json();
+  },
+
+  deleteRule: async (id: number): Promise<void> => {
+    const response = await fetch(`${API_BASE}/alert-rules/${id}`, { method: 'DELETE' });
+    if (!response.ok) throw new Error('Failed to delete alert rule');
+  },
+};
+
+// Live node health stream (Server-Sent Events). The browser resends the last
+// event id on reconnect, so only missed deltas are delivered. `onReset` fires
+// when the server no longer has that history and a full re-fetch is needed.
+export const streamApi = {
+  subscribe: (
+    onDelta: (delta: NodeHealthDelta) => void,
+    options: { clusterIds?: number[]; onReset?: () => void } = {},
+  ): (() => void) => {
+    const params = new URLSearchParams();
+    options.clusterIds?.forEach((id) => params.append('cluster_id', String(id)));
+    const source = new EventSource(`${API_BASE}/stream/nodes?${params}`);
+    source.addEventListener('node', (event) => onDelta(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('reset', () => options.onReset?.());
+    return () => source.close();
+  },
+};
+
+// Service check definitions (HTTP, TLS, TCP ports, SSH banner) and their results
+export const checksApi = {
+  list: async (params: { cluster_id?: number; node_id?: number } = {}): Promise<CheckDefinition[]> => {
+    const query = new URLSearchParams();
+    if (params.cluster_id !== undefined) query.append('cluster_id', String(params.cluster_id));
+    if (params.node_id !== undefined) query.append('node_id', String(params.node_id));
+    const response = await fetch(`${API_BASE}/checks?${query}`);
+    if (!response.ok) throw new Error('Failed to fetch checks');
+    return response.json();
+  },
+
+  create: async (check: CheckDefinitionCreate): Promise<CheckDefinition> => {
+    const response = await fetch(`${API_BASE}/checks`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(check),
+    });
+    if (!response.ok) throw new Error('Failed to create check');
+    return response.json();
+  },
+
+  update: async (id: number, check: Partial<CheckDefinitionCreate>): Promise<CheckDefinition> => {
+    const response = await fetch(`${API_BASE}/checks/${id}`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(check),
+    });
+    if (!response.ok) throw new Error('Failed to update check');
+    return response.json();
+  },
+
+  delete: async (id: number): Promise<void> => {
+    const response = await fetch(`${API_BASE}/checks/${id}`, { method: 'DELETE' });
+    if (!response.ok) throw new Error('Failed to delete check');
+  },
+
+  results: async (id: number, params: { ok?: boolean; after_node_id?: number; limit?: number } = {}): Promise<CheckResult[]> => {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) query.append(key, String(value));
+    });
+    const response = await fetch(`${API_BASE}/checks/${id}/results?${query}`);
+    if (!response.ok) throw new Error('Failed to fetch check results');
+    return response.json();
+  },
+};
+
+// CIDR ranges swept for hosts that are registered as nodes
+export const discoveryApi = {
+  list: async (clusterId?: number): Promise<DiscoveryTarget[]> => {
+    const query = clusterId !== undefined ? `?cluster_id=${clusterId}` : '';
+    const response = await fetch(`${API_BASE}/discovery-targets${query}`);
+    if (!response.ok) throw new Error('Failed to fetch discovery targets');
+    return response.json();
+  },
+
+  create: async (target: DiscoveryTargetCreate): Promise<DiscoveryTarget> => {
+    const response = await fetch(`${API_BASE}/discovery-targets`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(target),
+    });
+    if (!response.ok) throw new Error('Failed to create discovery target');
+    return response.json();
+  },
+
+  update: async (id: number, target: Partial<Omit<DiscoveryTargetCreate, 'cluster_id' | 'cidr'>>): Promise<DiscoveryTarget> => {
+    const response = await fetch(`${API_BASE}/discovery-targets/${id}`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(target),
+    });
+    if (!response.ok) throw new Error('Failed to update discovery target');
+    return response.json();
+  },
+
+  delete: async (id: number): Promise<void> => {
+    const response = await fetch(`${API_BASE}/discovery-targets/${id}`, { method: 'DELETE' });
+    if (!response.ok) throw new Error('Failed to delete discovery target');
+  },
+
+  run: async (id: number): Promise<void> => {
+    const response = await fetch(`${API_BASE}/discovery-targets/${id}/run`, { method: 'POST' });
+    if (!response.ok) throw new Error('Failed to queue discovery');
+  },
+};
+
+// Dependency edges used to probe parents first and skip what sits behind a down one
+export const dependenciesApi = {
+  list: async (params: { node_id?: number; cluster_id?: number; parent_node_id?: number } = {}): Promise<NodeDependency[]> => {
+    const query = new URLSearchParams();
+    if (params.node_id !== undefined) query.append('node_id', String(params.node_id));
+    if (params.cluster_id !== undefined) query.append('cluster_id', String(params.cluster_id));
+    if (params.parent_node_id !== undefined) query.append('parent_node_id', String(params.parent_node_id));
+    const response = await fetch(`${API_BASE}/dependencies?${query}`);
+    if (!response.ok) throw new Error('Failed to fetch dependencies');
+    return response.json();
+  },
+
+  create: async (dependency: NodeDependencyCreate): Promise<NodeDependency> => {
+    const response = await fetch(`${API_BASE}/dependencies`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(dependency),
+    });
+    if (!response.ok) throw new Error('Failed to create dependency');
+    return response.json();
+  },
+
+  delete: async (id: number): Promise<void> => {
+    const response = await fetch(`${API_BASE}/dependencies/${id}`, { method: 'DELETE' });
+    if (!response.ok) throw new Error('Failed to delete dependency');
+  },
+};
@@ -18,6 +18,8 @@ export interface Node {
   ssh_reachable: boolean;
   is_alive: boolean;
   passing_unit_tests: boolean;
+  checks_passing?: boolean | null;   // null when the node has no service checks
+  upstream_down?: boolean;           // not probed while a node it depends on is down
   last_health_check?: string;
   created_at: string;
   updated_at: string;
@@ -33,6 +35,55 @@ export interface Cluster {
   nodes: Node[];
 }
 
+// Per-cluster health rollup from /clusters/summary
+export interface ClusterHealthSummary {
+  cluster_id: number;
+  name: string;
+  total_nodes: number;
+  alive_nodes: number;
+  ssh_reachable_nodes: number;
+  passing_unit_tests_nodes: number;
+  oldest_health_check?: string;
+}
+
+// Live health change pushed by /stream/nodes
+export interface NodeHealthDelta {
+  node_id: number;
+  cluster_id: number;
+  changes: Partial<Pick<Node, 'is_alive' | 'ssh_reachable'>>;
+  ts: string;
+}
+
+// Server-side node listings: filters and one cursor-paginated page
+export type NodeStatus = 'healthy' | 'unhealthy' | 'down' | 'unreachable' | 'failing_tests' | 'upstream_down';
+
+export interface NodeListParams {
+  status?: NodeStatus;
+  is_alive?: boolean;
+  sort?: 'id' | 'name' | 'last_health_check';
+  order?: 'asc' | 'desc';
+  cursor?: string;
+  limit?: number;
+}
+
+export interface NodeSearchParams extends NodeListParams {
+  cluster_id?: number[];
+  ssh_reachable?: boolean;
+  passing_unit_tests?: boolean;
+  os?: string;
+  name_prefix?: string;
+  hostname_prefix?: string;
+  ip_prefix?: string;
+  q?: string;
+  stale_since?: string;
+  fields?: string;
+}
+
+export interface NodePage {
+  nodes: Node[];
+  nextCursor: string | null;
+}
+
 // Create/Update interfaces
 export interface NodeCreate {
   name: string;
@@ -69,3 +120,128 @@ export interface ClusterCreate {
 }
 
 
+
+// Latest unit-test report summary of a node
+export interface NodeTestSummary {
+  node_id: number;
+  reported_at: string;
+  tests: number;
+  failures: number;
+  errors: number;
+  skipped: number;
+  duration_seconds: number;
+  passed: boolean;
+  failed_tests: string[] | null;
+}
+
+// Alerting
+export type AlertMetric = 'down' | 'unreachable' | 'failing_tests';
+export type AlertState = 'pending' | 'firing' | 'resolved';
+
+export interface AlertRuleCreate {
+  name: string;
+  metric: AlertMetric;
+  cluster_id?: number | null;   // null applies the rule to every cluster
+  threshold: number;
+  ratio?: boolean;
+  clear_threshold?: number | null;
+  for_seconds?: number;
+  clear_for_seconds?: number;
+  severity?: string;
+  enabled?: boolean;
+}
+
+export interface AlertRule extends Required<AlertRuleCreate> {
+  id: number;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface Alert {
+  id: number;
+  rule_id: number;
+  cluster_id: number;
+  state: AlertState;
+  value: number;
+  peak_value: number;
+  pending_since: string;
+  fired_at: string | null;
+  resolved_at: string | null;
+  flaps: number;
+  flapping: boolean;
+}
+
+// Service checks
+export type CheckKind = 'tcp' | 'http' | 'tls' | 'ssh_banner';
+
+export interface CheckDefinitionCreate {
+  name: string;
+  kind: CheckKind;
+  cluster_id?: number | null;   // exactly one of cluster_id and node_id
+  node_id?: number | null;
+  params?: Record<string, unknown>;
+  timeout?: number;
+  interval_seconds?: number;
+  enabled?: boolean;
+}
+
+export interface CheckDefinition extends Required<CheckDefinitionCreate> {
+  id: number;
+  last_run_at: string | null;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface CheckResult {
+  check_id: number;
+  node_id: number;
+  name: string;
+  kind: CheckKind;
+  ok: boolean;
+  latency_ms: number | null;
+  status_code: number | null;
+  error: string | null;
+  detail: string | null;
+  checked_at: string;
+  changed_at: string;
+}
+
+// Subnet discovery
+export interface DiscoveryTargetCreate {
+  cluster_id: number;
+  cidr: string;                 // e.g. 10.20.0.0/16
+  ports?: number[];             // a host is discovered when any of these accepts
+  interval_seconds?: number;
+  enabled?: boolean;
+}
+
+export interface DiscoveryStats {
+  found: number;
+  created: number;
+  updated: number;
+  unchanged: number;
+  elsewhere: number;
+  skipped: number;
+  seconds: number;
+  error?: string;
+}
+
+export interface DiscoveryTarget extends Required<DiscoveryTargetCreate> {
+  id: number;
+  last_run_at: string | null;
+  last_stats: DiscoveryStats | null;
+  created_at: string;
+  updated_at: string;
+}
+
+// Dependency edges: a node, or every node of a cluster, behind a parent node
+export interface NodeDependencyCreate {
+  parent_node_id: number;
+  node_id?: number | null;      // exactly one of node_id and cluster_id
+  cluster_id?: number | null;
+}
+
+export interface NodeDependency extends NodeDependencyCreate {
+  id: number;
+  created_at: string;
+}